@@ -0,0 +1,112 @@
+"""
+End-to-end confirmation benchmark on a local tester chain.
+
+Deploys FactHound once (see ``chain_fixture.py``), generates N questions with
+an answer and a selection each, then reports throughput and latency of
+- ``confirm_question``, ``confirm_answer`` and ``confirm_selection``, one call
+  per row
+- ``aconfirm_question`` with every call in flight on one event loop
+- the batch paths: ``reverify_confirmations`` and ``verify_question_hashes``
+
+Everything runs in-process against a throwaway test database, so numbers
+track the chain layer and ORM rather than network latency.
+
+Usage:
+    python benchmarks/bench_confirm.py [n]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import statistics
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django
+
+django.setup()
+
+import logging
+
+from django.db import connection
+
+from questions import confirm_onchain
+from questions.models import Question
+from questions.verify_hashes import verify_question_hashes
+from chain_fixture import FactHoundFixture
+
+logging.disable(logging.CRITICAL)
+
+
+def report(label, latencies, elapsed=None):
+    """Print throughput and latency percentiles in ms."""
+    elapsed = sum(latencies) if elapsed is None else elapsed
+    ms = sorted(t * 1000 for t in latencies)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    print(
+        f"{label:>22}: {len(ms) / elapsed:8.1f} ops/s"
+        f"  p50 {statistics.median(ms):7.2f} ms  p95 {p95:7.2f} ms  max {ms[-1]:7.2f} ms"
+    )
+
+
+def per_call(label, fn, pairs):
+    latencies = []
+    for questionHash, answerHash in pairs:
+        t = time.perf_counter()
+        success, message = fn(questionHash, answerHash)
+        latencies.append(time.perf_counter() - t)
+        assert success, message
+    report(label, latencies)
+
+
+async def concurrent_confirm(pairs):
+    async def one(questionHash):
+        t = time.perf_counter()
+        success, message = await confirm_onchain.aconfirm_question(questionHash)
+        assert success, message
+        return time.perf_counter() - t
+
+    t = time.perf_counter()
+    latencies = await asyncio.gather(*(one(q) for q, _ in pairs))
+    return latencies, time.perf_counter() - t
+
+
+def run(n):
+    connection.creation.create_test_db(verbosity=0)
+    fixture = FactHoundFixture()
+    t = time.perf_counter()
+    pairs = fixture.generate(n)
+    print(f"generated {n} questions/answers/selections in {time.perf_counter() - t:.2f} s")
+
+    per_call("confirm_question", lambda q, a: confirm_onchain.confirm_question(q), pairs)
+    per_call("confirm_answer", confirm_onchain.confirm_answer, pairs)
+    per_call("confirm_selection", confirm_onchain.confirm_selection, pairs)
+
+    Question.objects.update(confirmed_onchain=None)
+    latencies, elapsed = asyncio.run(concurrent_confirm(pairs))
+    report("aconfirm_question", latencies, elapsed)
+
+    t = time.perf_counter()
+    counts = confirm_onchain.reverify_confirmations()
+    elapsed = time.perf_counter() - t
+    print(
+        f"{'reverify_confirmations':>22}: {elapsed * 1000:8.1f} ms"
+        f"  ({counts['checked']} rows checked)"
+    )
+    t = time.perf_counter()
+    mismatched = verify_question_hashes(workers=1)
+    elapsed = time.perf_counter() - t
+    print(
+        f"{'verify_question_hashes':>22}: {elapsed * 1000:8.1f} ms"
+        f"  ({len(mismatched)} mismatched)"
+    )
+    fixture.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,96 @@
+"""
+Hash verification benchmark: per-row vs batch.
+
+Builds N questions in a throwaway test database, then times
+- the per-row path ``confirm_question`` uses: load each Question with its
+  asker and post, and compare ``Web3.solidity_keccak`` against the stored hash
+- ``verify_question_hashes`` in-process (workers=1)
+- ``verify_question_hashes`` with a process pool (workers=CPU count)
+
+Usage:
+    python benchmarks/bench_hash_verify.py [rows]
+"""
+
+import os
+import sys
+import time
+import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django
+
+django.setup()
+
+from django.db import connection
+from web3 import Web3
+
+from siweauth.models import User
+from questions.models import Thread, Post, Question
+from questions.verify_hashes import verify_question_hashes
+
+WALLET = "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+
+
+def populate(rows):
+    user = User.objects.create_user_address(WALLET)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    thread = Thread.objects.create(topic="bench", dt=now)
+    posts = Post.objects.bulk_create(
+        Post(thread=thread, text=f"question {i} " * 20, dt=now, poster=user)
+        for i in range(rows)
+    )
+    Question.objects.bulk_create(
+        Question(
+            post=post,
+            asker=user,
+            status="OP",
+            questionHash=Web3.solidity_keccak(["address", "string"], [WALLET, post.text]),
+        )
+        for post in posts
+    )
+
+
+def per_row():
+    mismatched = []
+    for question in Question.objects.select_related("asker", "post").filter(
+        questionHash__isnull=False
+    ):
+        expected = Web3.solidity_keccak(
+            ["address", "string"], [question.asker.wallet, question.post.text]
+        )
+        if question.questionHash != expected:
+            mismatched.append(question.pk)
+    return mismatched
+
+
+def timed(label, fn, rows):
+    t = time.perf_counter()
+    mismatched = fn()
+    elapsed = time.perf_counter() - t
+    print(
+        f"{label:>22}: {elapsed * 1000:8.1f} ms  {rows / elapsed:9.0f} rows/s"
+        f"  ({len(mismatched)} mismatched)"
+    )
+
+
+def run(rows):
+    connection.creation.create_test_db(verbosity=0)
+    populate(rows)
+    workers = os.cpu_count()
+    print(f"{rows} questions, {workers} CPUs")
+    timed("per-row", per_row, rows)
+    timed("batch, workers=1", lambda: verify_question_hashes(workers=1), rows)
+    timed(
+        f"batch, workers={workers}",
+        lambda: verify_question_hashes(workers=workers),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
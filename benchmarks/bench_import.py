@@ -0,0 +1,63 @@
+"""
+Import-time benchmark for the questions app.
+
+Each sample runs in a fresh interpreter: Django and the heavy third-party
+packages are imported first so the timing isolates the cost of importing
+``questions.views`` (and with it ``questions.confirm_onchain``). The deferred
+cost of loading the contract ABI and building the Web3 client on first use is
+reported separately.
+
+Usage:
+    python benchmarks/bench_import.py [samples]
+"""
+
+import os
+import sys
+import json
+import statistics
+import subprocess
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SAMPLE = """
+import json, time, django
+django.setup()
+import web3, numpy, hexbytes, rest_framework.decorators, siweauth.auth
+t = time.perf_counter()
+import questions.views
+t_import = time.perf_counter() - t
+from facthound import chain
+t = time.perf_counter()
+chain.get_facthound_abi()
+chain.get_web3()
+t_first_use = time.perf_counter() - t
+print(json.dumps({"import": t_import, "first_use": t_first_use}))
+"""
+
+
+def run(samples):
+    env = dict(os.environ)
+    env.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+    env.setdefault("DJANGO_SECRET_KEY", "benchmark")
+    results = []
+    for _ in range(samples):
+        out = subprocess.run(
+            [sys.executable, "-c", SAMPLE],
+            cwd=BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    for key in ["import", "first_use"]:
+        values = [r[key] * 1000 for r in results]
+        print(
+            f"{key:>10}: median {statistics.median(values):7.2f} ms"
+            f"  min {min(values):7.2f} ms  (n={samples})"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,109 @@
+"""
+Password hashing benchmark.
+
+Times one hash per hasher profile, then runs a burst of concurrent password
+logins next to a stream of cheap reads and reports the read latency with the
+hashing done
+- inline on the request threads
+- in a thread pool of ``PASSWORD_HASH_WORKERS``
+- in a process pool of ``PASSWORD_HASH_WORKERS``
+
+Usage:
+    python benchmarks/bench_password_hashing.py [logins] [request threads]
+"""
+
+import os
+import sys
+import time
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django
+
+django.setup()
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+from django.db import connection
+
+from siweauth import passwords
+from siweauth.hashers import FastPBKDF2PasswordHasher
+from siweauth.models import User
+from siweauth.passwords import check_user_password
+from siweauth.settings import PASSWORD_HASH_WORKERS
+
+# the preferred hasher of each PASSWORD_HASHER_PROFILE
+HASHERS = {
+    "default": PBKDF2PasswordHasher,
+    "scrypt": ScryptPasswordHasher,
+    "fast": FastPBKDF2PasswordHasher,
+}
+
+
+def profiles():
+    for profile, hasher in HASHERS.items():
+        hasher = hasher()
+        t = time.perf_counter()
+        for _ in range(5):
+            hasher.encode("correct horse", hasher.salt())
+        print(f"{profile:>24}: {(time.perf_counter() - t) / 5 * 1000:8.1f} ms/hash")
+
+
+def reads(stop, latencies):
+    # a stand-in for cheap requests served while logins hash
+    while not stop.is_set():
+        t = time.perf_counter()
+        sum(range(2000))
+        latencies.append(time.perf_counter() - t)
+        time.sleep(0.001)
+
+
+def logins(label, user, count, threads):
+    stop = threading.Event()
+    latencies = []
+    reader = threading.Thread(target=reads, args=(stop, latencies))
+    reader.start()
+    t = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ok = sum(pool.map(lambda _: check_user_password(user, "correct horse"), range(count)))
+    elapsed = time.perf_counter() - t
+    stop.set()
+    reader.join()
+    latencies.sort()
+    print(
+        f"{label:>24}: {count / elapsed:6.1f} logins/s ({ok}/{count} ok), read latency"
+        f" median {statistics.median(latencies) * 1e6:7.0f} us"
+        f" p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.0f} us"
+    )
+
+
+def run(count, threads):
+    connection.creation.create_test_db(verbosity=0)
+    print(f"{os.cpu_count()} CPUs, {threads} request threads, {PASSWORD_HASH_WORKERS} hash workers")
+    profiles()
+    user = User.objects.create_user_username_email_password(
+        "bench", "bench@example.com", "correct horse"
+    )
+    logins("inline", user, count, threads)
+    for pool in ["thread", "process"]:
+        with mock.patch.object(passwords, "PASSWORD_HASH_POOL", pool):
+            passwords._pool = None
+            # start the workers outside the timing
+            check_user_password(user, "correct horse")
+            logins(f"{pool} pool", user, count, threads)
+            passwords._pool.shutdown()
+            passwords._pool = None
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
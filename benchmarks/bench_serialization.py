@@ -0,0 +1,173 @@
+"""
+Serialization benchmark for a large thread.
+
+Builds one thread of N posts (half questions, half answers) in a throwaway
+test database, then times
+- building the thread's rows from model instances (the previous
+  ``threadPosts`` loop) vs from ``values()``
+- encoding the rows with the stdlib encoder vs orjson
+- the ``threadPosts`` view end to end with FAST_JSON off and on
+- one full page of the posts viewset, serializer and stdlib renderer vs
+  ``values()`` rows and orjson
+
+Usage:
+    python benchmarks/bench_serialization.py [posts]
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+from pathlib import Path
+from unittest import mock
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django
+
+django.setup()
+
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from facthound import renderers
+from siweauth.models import User
+from questions import views
+from questions.models import Thread, Post, Question, Answer
+from questions.settings import API_MAX_PAGE_SIZE
+
+WALLET = "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+
+COLUMNS = [
+    "id",
+    "text",
+    "dt",
+    "thread_id",
+    "poster_name",
+    "poster_id",
+    "poster_wallet",
+    "asker_address",
+    "asker_username",
+    "answer_status",
+    "question_status",
+    "question_id",
+    "question_hash",
+    "contract_address",
+    "bounty",
+    "answer_id",
+    "answer_hash",
+]
+
+
+def populate(posts):
+    user = User.objects.create_user_address(WALLET)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    thread = Thread.objects.create(topic="bench", dt=now)
+    created = Post.objects.bulk_create(
+        Post(
+            thread=thread,
+            text=f"post {i} " * 20,
+            dt=now + datetime.timedelta(seconds=i),
+            poster=user,
+        )
+        for i in range(posts)
+    )
+    questions = Question.objects.bulk_create(
+        Question(
+            post=post,
+            asker=user,
+            status="OP",
+            bounty=10**18 * (i + 1),
+            questionHash=i.to_bytes(32, "big"),
+        )
+        for i, post in enumerate(created[::2])
+    )
+    Answer.objects.bulk_create(
+        Answer(
+            post=post,
+            question=question,
+            answerer=user,
+            status="NO",
+            answerHash=(i + 1).to_bytes(32, "big"),
+        )
+        for i, (post, question) in enumerate(zip(created[1::2], questions))
+    )
+    return thread
+
+
+def instance_rows(thread):
+    rows = []
+    for post in views._thread_posts_queryset(thread.pk):
+        row = {column: getattr(post, column) for column in COLUMNS}
+        row["question_hash"] = post.question_hash.hex() if post.question_hash else None
+        row["answer_hash"] = post.answer_hash.hex() if post.answer_hash else None
+        rows.append(row)
+    return rows
+
+
+def values_rows(thread):
+    rows = list(views._thread_posts_queryset(thread.pk).values(*COLUMNS))
+    for row in rows:
+        if row["question_hash"]:
+            row["question_hash"] = bytes(row["question_hash"]).hex()
+        if row["answer_hash"]:
+            row["answer_hash"] = bytes(row["answer_hash"]).hex()
+    return rows
+
+
+def timed(label, fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:>34}: {best * 1000:8.1f} ms")
+
+
+def run(posts):
+    logging.disable(logging.CRITICAL)
+    connection.creation.create_test_db(verbosity=0)
+    thread = populate(posts)
+    factory = APIRequestFactory()
+    print(f"{posts} posts in one thread, orjson {'on' if renderers.orjson else 'missing'}")
+
+    timed("rows from model instances", lambda: instance_rows(thread))
+    timed("rows from values()", lambda: values_rows(thread))
+
+    payload = {"threadTopic": thread.topic, "posts": values_rows(thread)}
+    timed("encode, stdlib", lambda: json.dumps(payload, cls=DjangoJSONEncoder))
+    timed("encode, orjson", lambda: renderers.dumps(payload))
+
+    request = factory.get("/api/thread/", {"threadId": thread.pk})
+    with mock.patch.object(renderers, "FAST_JSON", False):
+        timed("threadPosts, stdlib", lambda: views.threadPosts(request))
+    timed("threadPosts, orjson", lambda: views.threadPosts(request))
+
+    request = factory.get("/api/posts/", {"limit": API_MAX_PAGE_SIZE})
+    view = views.PostViewSet(request=Request(request), format_kwarg=None)
+    timed(
+        f"posts page of {API_MAX_PAGE_SIZE}, serializer",
+        lambda: JSONRenderer().render(
+            view.get_serializer(
+                view.get_queryset().order_by("-dt")[:API_MAX_PAGE_SIZE], many=True
+            ).data
+        ),
+    )
+    timed(
+        f"posts page of {API_MAX_PAGE_SIZE}, values()",
+        lambda: views.PostViewSet.as_view({"get": "list"})(request).render(),
+    )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,90 @@
+"""
+SIWE message rejection benchmark.
+
+Times ``check_for_siwe`` per call, in microseconds, for
+- malformed messages and messages for another domain, chain or time, which
+  are rejected from the message alone
+- replayed messages, whose nonce is already used up (one database query)
+- valid logins, which also recover the signature
+
+Usage:
+    python benchmarks/bench_siwe_parse.py [calls]
+"""
+
+import os
+import sys
+import time
+import datetime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django
+
+django.setup()
+
+from django.db import connection
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from siweauth.auth import check_for_siwe
+from siweauth.message import parse_siwe_message
+from siweauth.nonces import get_nonce_store
+from siweauth.settings import SIWE_DOMAIN, SIWE_URI, SIWE_CHAIN_IDS
+
+
+def message(
+    address, nonce, domain=SIWE_DOMAIN, chain_id=SIWE_CHAIN_IDS[0], issued_at=None
+):
+    issued_at = issued_at or datetime.datetime.now(datetime.timezone.utc).isoformat()
+    return (
+        f"{domain} wants you to sign in with your Ethereum account:\n"
+        f"{address}\n\nTo make posts.\n\n"
+        f"URI: {SIWE_URI}\nVersion: 1\nChain ID: {chain_id}\n"
+        f"Nonce: {nonce}\nIssued At: {issued_at}"
+    )
+
+
+def timed(label, fn, calls):
+    t = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    elapsed = time.perf_counter() - t
+    print(f"{label:>24}: {elapsed / calls * 1e6:9.1f} us/call")
+
+
+def run(calls):
+    connection.creation.create_test_db(verbosity=0)
+    account = Account.create()
+    store = get_nonce_store()
+    nonce = store.issue()
+    valid = message(account.address, nonce)
+    print(f"{calls} calls each")
+
+    timed("parse", lambda i: parse_siwe_message(valid), calls)
+    timed("garbage", lambda i: check_for_siwe("x" * 200, "0x00"), calls)
+    truncated = valid[: len(valid) // 2]
+    timed("truncated", lambda i: check_for_siwe(truncated, "0x00"), calls)
+    wrong_domain = message(account.address, nonce, domain="evil.example")
+    timed("wrong domain", lambda i: check_for_siwe(wrong_domain, "0x00"), calls)
+    wrong_chain = message(account.address, nonce, chain_id=1)
+    timed("wrong chain", lambda i: check_for_siwe(wrong_chain, "0x00"), calls)
+    stale = message(account.address, nonce, issued_at="2000-01-01T00:00:00Z")
+    timed("stale", lambda i: check_for_siwe(stale, "0x00"), calls)
+
+    signature = account.sign_message(encode_defunct(text=valid)).signature
+    check_for_siwe(valid, signature)
+    timed("replayed nonce", lambda i: check_for_siwe(valid, signature), calls)
+
+    logins = []
+    for _ in range(min(calls, 500)):
+        body = message(account.address, store.issue())
+        logins.append((body, account.sign_message(encode_defunct(text=body)).signature))
+    timed("valid login", lambda i: check_for_siwe(*logins[i]), len(logins))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,101 @@
+"""
+SIWE signature verification benchmark: inline vs process pool.
+
+Signs N SIWE messages with fresh accounts, then times recovering all of them
+- inline, one after another on a single thread
+- inline, from a pool of request threads (GIL bound)
+- through ``PoolVerifier`` from the same request threads
+
+and reports logins/sec and the pooled verifier's counters.
+
+Usage:
+    python benchmarks/bench_siwe_verify.py [logins] [request threads]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "facthound.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django
+
+django.setup()
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+
+from siweauth.verify import InlineVerifier, PoolVerifier
+
+MESSAGE = """localhost:3000 wants you to sign in with your Ethereum account:
+{address}
+
+To make posts.
+
+URI: http://localhost:3000
+Version: 1
+Chain ID: 8453
+Nonce: {nonce}
+Issued At: 2024-01-01T00:00:00Z"""
+
+
+def signed_messages(logins):
+    messages = []
+    for i in range(logins):
+        account = Account.create()
+        body = MESSAGE.format(address=account.address, nonce=f"{i:024x}")
+        signature = account.sign_message(encode_defunct(text=body)).signature
+        messages.append((account.address, body, bytes(signature)))
+    return messages
+
+
+def timed(label, fn, messages):
+    t = time.perf_counter()
+    recovered = fn()
+    elapsed = time.perf_counter() - t
+    ok = sum(r == address for r, (address, _, _) in zip(recovered, messages))
+    print(
+        f"{label:>28}: {elapsed * 1000:8.1f} ms  {len(messages) / elapsed:7.0f} logins/s"
+        f"  ({ok}/{len(messages)} ok)"
+    )
+
+
+def threaded(verifier, messages, threads):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(lambda m: verifier.recover(m[1], m[2]), messages))
+
+
+def run(logins, threads):
+    messages = signed_messages(logins)
+    print(f"{logins} logins, {threads} request threads, {os.cpu_count()} CPUs")
+    inline = InlineVerifier()
+    timed(
+        "inline, single thread",
+        lambda: [inline.recover(body, sig) for _, body, sig in messages],
+        messages,
+    )
+    timed(f"inline, {threads} threads", lambda: threaded(inline, messages, threads), messages)
+    pooled = PoolVerifier(max_pending=max(threads, 1), timeout=60)
+    # start the workers outside the timing
+    pooled.recover(messages[0][1], messages[0][2])
+    try:
+        timed(
+            f"pool of {pooled.workers}, {threads} threads",
+            lambda: threaded(pooled, messages, threads),
+            messages,
+        )
+        print(pooled.metrics())
+    finally:
+        pooled.shutdown()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 16,
+    )
@@ -0,0 +1,125 @@
+"""
+Deterministic on-chain fixture for benchmarks.
+
+Deploys FactHound once on an in-process ``EthereumTesterProvider`` and points
+the shared chain clients (``facthound.chain``) at it, then generates
+questions, answers and selections both on-chain and in the database. Accounts
+and post texts are fixed, so the same ``n`` always yields the same hashes.
+
+Must be imported after ``django.setup()`` with a test database in place.
+"""
+
+import datetime
+
+from web3 import AsyncWeb3, EthereumTesterProvider, Web3
+from web3.providers.eth_tester import AsyncEthereumTesterProvider
+
+from facthound import chain
+from siweauth.models import User
+from questions import confirm_onchain
+from questions.models import Thread, Post, Question, Answer
+
+
+class FactHoundFixture:
+    """
+    One tester chain with a deployed FactHound contract.
+
+    Attributes:
+        w3: Web3 client on the tester chain
+        contract: The deployed contract
+        owner: The contract owner account
+        askers: Accounts asking questions
+        answerer: The account answering every question
+    """
+
+    BOUNTY = 1000000
+
+    def __init__(self):
+        provider = EthereumTesterProvider()
+        self.w3 = Web3(provider)
+        async_provider = AsyncEthereumTesterProvider()
+        async_provider.ethereum_tester = provider.ethereum_tester
+        chain.set_web3(self.w3)
+        chain.set_async_web3(AsyncWeb3(async_provider))
+        accounts = self.w3.eth.accounts
+        self.owner, self.answerer, self.askers = accounts[0], accounts[1], accounts[2:]
+        if self.owner not in confirm_onchain.allowed_owners:
+            confirm_onchain.allowed_owners.append(self.owner)
+        artifact = chain.get_facthound_contract()
+        Contract = self.w3.eth.contract(
+            abi=artifact["abi"], bytecode=artifact["bytecode"]["object"]
+        )
+        tx_hash = Contract.constructor(100).transact({"from": self.owner})
+        address = self.w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+        self.contract = self.w3.eth.contract(address=address, abi=artifact["abi"])
+        self.users = {
+            account: User.objects.get_or_create(wallet=account)[0]
+            for account in [self.answerer, *self.askers]
+        }
+        self.thread = Thread.objects.create(
+            topic="benchmark", dt=datetime.datetime.now(datetime.timezone.utc)
+        )
+
+    def _post(self, account, text):
+        return Post.objects.create(
+            thread=self.thread,
+            text=text,
+            dt=datetime.datetime.now(datetime.timezone.utc),
+            poster=self.users[account],
+        )
+
+    def generate(self, n, answers=True, selections=True):
+        """
+        Create n questions, each with one answer that is then selected.
+
+        Args:
+            n: Number of questions
+            answers: Also create an answer per question
+            selections: Also select each answer (requires answers)
+
+        Returns:
+            list: (questionHash, answerHash or None) pairs
+        """
+        start = Question.objects.count()
+        pairs = []
+        for i in range(start, start + n):
+            asker = self.askers[i % len(self.askers)]
+            text = f"benchmark question {i}"
+            questionHash = Web3.solidity_keccak(["address", "string"], [asker, text])
+            self.contract.functions.createQuestion(questionHash).transact(
+                {"from": asker, "value": self.BOUNTY}
+            )
+            question = Question.objects.create(
+                post=self._post(asker, text),
+                asker=self.users[asker],
+                status="OP",
+                questionHash=questionHash,
+                contractAddress=self.contract.address,
+            )
+            answerHash = None
+            if answers:
+                text = f"benchmark answer {i}"
+                answerHash = Web3.solidity_keccak(
+                    ["address", "string"], [self.answerer, text]
+                )
+                self.contract.functions.createAnswer(
+                    questionHash, answerHash
+                ).transact({"from": self.answerer})
+                Answer.objects.create(
+                    question=question,
+                    post=self._post(self.answerer, text),
+                    answerer=self.users[self.answerer],
+                    status="OP",
+                    answerHash=answerHash,
+                )
+                if selections:
+                    self.contract.functions.selectAnswer(
+                        questionHash, answerHash
+                    ).transact({"from": asker})
+            pairs.append((questionHash, answerHash))
+        return pairs
+
+    def close(self):
+        """Reset the shared chain clients."""
+        chain.set_web3(None)
+        chain.set_async_web3(None)
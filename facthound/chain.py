@@ -0,0 +1,562 @@
+"""
+Shared Web3 client for the Facthound backend.
+
+This module owns the HTTP transport used for every JSON-RPC call made by the
+backend. Each chain gets one keep-alive ``requests`` session with a sized
+connection pool, timeouts and retry/backoff, shared by all modules and threads,
+so TLS handshakes to the RPC provider are paid once per pooled connection
+instead of once per call, and a slow chain cannot exhaust another chain's
+connections. The async client used by ASGI views gets the same treatment with
+one keep-alive ``aiohttp`` session per chain and event loop.
+
+Nothing here touches the network or the filesystem at import time: the client
+and the contract ABI are built on first use and then reused for the life of
+the process.
+"""
+
+import os
+import json
+import time
+import asyncio
+import weakref
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from web3 import Web3, AsyncWeb3
+from web3.providers.rpc.utils import ExceptionRetryConfiguration
+from django.conf import settings
+
+# Number of per-host connection pools to keep (one RPC host in practice)
+RPC_POOL_CONNECTIONS = getattr(settings, "RPC_POOL_CONNECTIONS", 4)
+
+# Keep-alive connections per host; should cover the worker's thread count
+RPC_POOL_MAXSIZE = getattr(settings, "RPC_POOL_MAXSIZE", 32)
+
+# (connect, read) timeout in seconds for each RPC request
+RPC_TIMEOUT = getattr(settings, "RPC_TIMEOUT", (3.05, 10))
+
+# Transport-level retries for connection errors and throttled/5xx responses
+RPC_RETRIES = getattr(settings, "RPC_RETRIES", 3)
+
+# Exponential backoff factor between retries, in seconds
+RPC_BACKOFF_FACTOR = getattr(settings, "RPC_BACKOFF_FACTOR", 0.25)
+
+# Compiled FactHound contract artifact (ABI and bytecode)
+FACTHOUND_CONTRACT_PATH = getattr(
+    settings,
+    "FACTHOUND_CONTRACT_PATH",
+    settings.BASE_DIR / "contracts" / "FactHound.json",
+)
+
+# Seconds to reuse view-call results read at a moving tag such as "latest"
+CHAIN_CACHE_TTL = getattr(settings, "CHAIN_CACHE_TTL", 2)
+
+# Maximum number of view-call results kept in memory
+CHAIN_CACHE_SIZE = getattr(settings, "CHAIN_CACHE_SIZE", 4096)
+
+_lock = threading.RLock()
+# the keys of these registries are chain ids; None is the default chain
+# configured through ALCHEMY_API_ENDPOINT
+_sessions = {}
+_clients = {}
+_async_clients = {}
+_view_caches = {}
+_MISSING = object()
+
+
+def rpc_endpoint():
+    """
+    Return the configured JSON-RPC endpoint URI.
+
+    Returns:
+        str: The Alchemy endpoint joined with the API key
+    """
+    return f"{os.getenv('ALCHEMY_API_ENDPOINT')}/{os.getenv('ALCHEMY_API_KEY')}"
+
+
+def build_session(
+    pool_connections=RPC_POOL_CONNECTIONS,
+    pool_maxsize=RPC_POOL_MAXSIZE,
+    retries=RPC_RETRIES,
+    backoff_factor=RPC_BACKOFF_FACTOR,
+):
+    """
+    Build a keep-alive ``requests`` session tuned for JSON-RPC traffic.
+
+    JSON-RPC reads are sent as POSTs, so POST is explicitly allowed to be
+    retried. Throttling (429) and gateway errors are retried with backoff,
+    honouring any ``Retry-After`` header sent by the provider.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum keep-alive connections per host
+        retries: Total retries per request
+        backoff_factor: Exponential backoff factor between retries
+
+    Returns:
+        requests.Session: The configured session
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(chain_id=None):
+    """
+    Return the RPC session for a chain, creating it on first use.
+
+    Each chain gets its own session and connection pool, so a slow or
+    saturated RPC provider for one chain cannot hold connections needed by
+    another. A session is shared across threads; its urllib3 connection pool
+    is thread-safe and bounded by ``RPC_POOL_MAXSIZE``.
+
+    Args:
+        chain_id: Optional chain id, defaults to the configured default chain
+
+    Returns:
+        requests.Session: The chain's session
+    """
+    session = _sessions.get(chain_id)
+    if session is None:
+        with _lock:
+            session = _sessions.get(chain_id)
+            if session is None:
+                session = _sessions[chain_id] = build_session()
+    return session
+
+
+def make_web3(endpoint_uri=None, session=None):
+    """
+    Create a Web3 client that sends requests through a pooled session.
+
+    Retries are handled by the session's transport adapter, so Web3's own
+    exception retry loop is disabled to avoid multiplying attempts.
+
+    Args:
+        endpoint_uri: Optional JSON-RPC endpoint, defaults to ``rpc_endpoint()``
+        session: Optional session, defaults to the shared session
+
+    Returns:
+        Web3: The configured client
+    """
+    provider = Web3.HTTPProvider(
+        endpoint_uri or rpc_endpoint(),
+        request_kwargs={"timeout": RPC_TIMEOUT},
+        session=session or get_session(),
+        exception_retry_configuration=None,
+    )
+    return Web3(provider)
+
+
+def get_web3(chain_id=None, endpoint_uri=None):
+    """
+    Return the Web3 client for a chain, creating it on first use.
+
+    Clients are pooled per chain id. The endpoint is only used when the
+    chain's client is first built; call ``set_web3(None, chain_id)`` to pick up
+    a changed endpoint.
+
+    Args:
+        chain_id: Optional chain id, defaults to the configured default chain
+        endpoint_uri: JSON-RPC endpoint for the chain, defaults to ``rpc_endpoint()``
+
+    Returns:
+        Web3: The chain's client
+    """
+    w3 = _clients.get(chain_id)
+    if w3 is None:
+        with _lock:
+            w3 = _clients.get(chain_id)
+            if w3 is None:
+                w3 = _clients[chain_id] = make_web3(
+                    endpoint_uri, session=get_session(chain_id)
+                )
+    return w3
+
+
+def set_web3(w3, chain_id=None):
+    """
+    Replace a chain's Web3 client and drop its cached view-call results.
+
+    Used to point the backend at another provider, e.g. an
+    ``EthereumTesterProvider`` in tests. Passing None resets the client so the
+    next ``get_web3()`` call builds a fresh one.
+
+    Args:
+        w3: The Web3 client to install, or None
+        chain_id: Optional chain id, defaults to the configured default chain
+    """
+    with _lock:
+        if w3 is None:
+            _clients.pop(chain_id, None)
+        else:
+            _clients[chain_id] = w3
+        # cached reads belong to the previous provider's chain
+        get_view_cache(chain_id).clear()
+
+
+def _async_timeout():
+    """Translate ``RPC_TIMEOUT`` into an aiohttp timeout."""
+    if isinstance(RPC_TIMEOUT, (tuple, list)):
+        return ClientTimeout(sock_connect=RPC_TIMEOUT[0], sock_read=RPC_TIMEOUT[1])
+    return ClientTimeout(total=RPC_TIMEOUT)
+
+
+def build_async_session(pool_maxsize=RPC_POOL_MAXSIZE):
+    """
+    Build a keep-alive ``aiohttp`` session for async JSON-RPC traffic.
+
+    Web3's default async session closes the connection after every request;
+    this one keeps up to ``pool_maxsize`` connections open for reuse.
+
+    Args:
+        pool_maxsize: Maximum simultaneous connections
+
+    Returns:
+        aiohttp.ClientSession: The configured session
+    """
+    return ClientSession(
+        raise_for_status=True,
+        timeout=_async_timeout(),
+        connector=TCPConnector(limit=pool_maxsize),
+    )
+
+
+def make_async_web3(endpoint_uri=None):
+    """
+    Create an AsyncWeb3 client for the JSON-RPC endpoint.
+
+    aiohttp has no transport-level retry, so Web3's exception retry loop is
+    configured with the same retry count and backoff as the sync session.
+
+    Args:
+        endpoint_uri: Optional JSON-RPC endpoint, defaults to ``rpc_endpoint()``
+
+    Returns:
+        AsyncWeb3: The configured client
+    """
+    provider = AsyncWeb3.AsyncHTTPProvider(
+        endpoint_uri or rpc_endpoint(),
+        request_kwargs={"timeout": _async_timeout()},
+        exception_retry_configuration=ExceptionRetryConfiguration(
+            errors=(ClientError, TimeoutError),
+            retries=RPC_RETRIES,
+            backoff_factor=RPC_BACKOFF_FACTOR,
+        ),
+    )
+    return AsyncWeb3(provider)
+
+
+async def get_async_web3(chain_id=None, endpoint_uri=None):
+    """
+    Return the AsyncWeb3 client for a chain, creating it on first use.
+
+    aiohttp sessions are bound to an event loop, so the first call on each
+    loop installs a pooled session for that loop on the chain's provider.
+
+    Args:
+        chain_id: Optional chain id, defaults to the configured default chain
+        endpoint_uri: JSON-RPC endpoint for the chain, defaults to ``rpc_endpoint()``
+
+    Returns:
+        AsyncWeb3: The chain's async client
+    """
+    entry = _async_clients.get(chain_id)
+    if entry is None:
+        with _lock:
+            entry = _async_clients.get(chain_id)
+            if entry is None:
+                entry = _async_clients[chain_id] = (
+                    make_async_web3(endpoint_uri),
+                    weakref.WeakSet(),
+                )
+    w3, loops = entry
+    loop = asyncio.get_running_loop()
+    if isinstance(w3.provider, AsyncWeb3.AsyncHTTPProvider) and loop not in loops:
+        # mark the loop before awaiting so concurrent first calls on this
+        # loop don't each build a session
+        loops.add(loop)
+        await w3.provider.cache_async_session(build_async_session())
+    return w3
+
+
+def set_async_web3(w3, chain_id=None):
+    """
+    Replace a chain's AsyncWeb3 client and drop its cached view-call results.
+
+    Args:
+        w3: The AsyncWeb3 client to install, or None to reset
+        chain_id: Optional chain id, defaults to the configured default chain
+    """
+    with _lock:
+        if w3 is None:
+            _async_clients.pop(chain_id, None)
+        else:
+            _async_clients[chain_id] = (w3, weakref.WeakSet())
+        get_view_cache(chain_id).clear()
+
+
+@lru_cache(maxsize=None)
+def get_facthound_contract():
+    """
+    Load the compiled FactHound contract artifact, once per process.
+
+    Returns:
+        dict: The parsed artifact, including ``abi`` and ``bytecode``
+    """
+    with open(FACTHOUND_CONTRACT_PATH, "rb") as f:
+        return json.load(f)
+
+
+def get_facthound_abi():
+    """
+    Return the FactHound contract ABI.
+
+    Returns:
+        list: The contract ABI
+    """
+    return get_facthound_contract()["abi"]
+
+
+class ViewCallCache:
+    """
+    Bounded, thread-safe LRU cache for contract view-call results.
+
+    Entries are stored either with the default TTL, for state read at a moving
+    block tag, or permanently, for state read at a finalized block. The least
+    recently used entry is evicted once ``maxsize`` is reached.
+    """
+
+    def __init__(self, maxsize=CHAIN_CACHE_SIZE, ttl=CHAIN_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a cached value.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached value, or ``_MISSING`` if absent or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, permanent=False):
+        """
+        Store a value.
+
+        Args:
+            key: The cache key
+            value: The value to store
+            permanent: If True the entry never expires (it can still be evicted)
+        """
+        expires = None if permanent else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_view_cache(chain_id=None):
+    """
+    Return the view-call cache for a chain.
+
+    Args:
+        chain_id: Optional chain id, defaults to the configured default chain
+
+    Returns:
+        ViewCallCache: The chain's cache
+    """
+    cache = _view_caches.get(chain_id)
+    if cache is None:
+        with _lock:
+            cache = _view_caches.get(chain_id)
+            if cache is None:
+                cache = _view_caches[chain_id] = ViewCallCache()
+    return cache
+
+
+def _freeze(value):
+    """Convert call arguments into a hashable, provider-independent form."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class ContractReader:
+    """
+    Read-through cache over a contract's view functions.
+
+    Results are keyed by (contract address, function, args, block). Reads at a
+    moving tag ("latest", "safe", "pending") are reused for ``CHAIN_CACHE_TTL``
+    seconds. Reads at "finalized", at a block number no newer than the
+    finalized head, or at a block hash cannot change and are cached
+    permanently. Any other identifier (e.g. "earliest" or a hex string) is
+    read through without caching.
+    """
+
+    MOVING_TAGS = ("latest", "pending", "safe")
+
+    def __init__(self, contract, cache=None):
+        self.contract = contract
+        self.cache = cache if cache is not None else get_view_cache()
+
+    def _key(self, fn_name, args, block_identifier):
+        return (self.contract.address, fn_name, _freeze(args), block_identifier)
+
+    def finalized_block_number(self):
+        """
+        Return the chain's finalized block number, cached with the default TTL.
+
+        Returns:
+            int: The finalized block number
+        """
+        key = ("finalized",)
+        number = self.cache.get(key)
+        if number is _MISSING:
+            number = self.contract.w3.eth.get_block("finalized").number
+            self.cache.set(key, number)
+        return number
+
+    def head_block(self, refresh=False):
+        """
+        Return the chain head, cached with the default TTL.
+
+        Args:
+            refresh: If True skip the cached value and fetch the head
+
+        Returns:
+            tuple: (block number, block hash)
+        """
+        key = ("head",)
+        head = _MISSING if refresh else self.cache.get(key)
+        if head is _MISSING:
+            block = self.contract.w3.eth.get_block("latest")
+            head = (block.number, bytes(block.hash))
+            self.cache.set(key, head)
+        return head
+
+    def call(self, fn_name, *args, block_identifier="latest", refresh=False):
+        """
+        Call a view function, serving the result from cache when possible.
+
+        Args:
+            fn_name: The contract function name
+            *args: Positional arguments for the function
+            block_identifier: Block tag, number or hash to read state at
+            refresh: If True skip the cached value and store a fresh read
+
+        Returns:
+            The decoded function result
+        """
+        permanent, cacheable = False, True
+        if block_identifier == "finalized":
+            block_identifier = self.finalized_block_number()
+            permanent = True
+        elif isinstance(block_identifier, bytes):
+            permanent = True
+        elif isinstance(block_identifier, int):
+            permanent = block_identifier <= self.finalized_block_number()
+        elif block_identifier not in self.MOVING_TAGS:
+            cacheable = False
+        key = self._key(fn_name, args, block_identifier)
+        if cacheable and not refresh:
+            value = self.cache.get(key)
+            if value is not _MISSING:
+                return value
+        caller = self.contract.caller(block_identifier=block_identifier)
+        value = getattr(caller, fn_name)(*args)
+        if cacheable:
+            self.cache.set(key, value, permanent=permanent)
+        return value
+
+
+class AsyncContractReader(ContractReader):
+    """
+    ``ContractReader`` for contracts bound to an AsyncWeb3 client.
+
+    Shares the same cache and caching rules; ``call``, ``head_block`` and
+    ``finalized_block_number`` are coroutines.
+    """
+
+    async def head_block(self, refresh=False):
+        key = ("head",)
+        head = _MISSING if refresh else self.cache.get(key)
+        if head is _MISSING:
+            block = await self.contract.w3.eth.get_block("latest")
+            head = (block.number, bytes(block.hash))
+            self.cache.set(key, head)
+        return head
+
+    async def finalized_block_number(self):
+        key = ("finalized",)
+        number = self.cache.get(key)
+        if number is _MISSING:
+            number = (await self.contract.w3.eth.get_block("finalized")).number
+            self.cache.set(key, number)
+        return number
+
+    async def call(self, fn_name, *args, block_identifier="latest", refresh=False):
+        permanent, cacheable = False, True
+        if block_identifier == "finalized":
+            block_identifier = await self.finalized_block_number()
+            permanent = True
+        elif isinstance(block_identifier, bytes):
+            permanent = True
+        elif isinstance(block_identifier, int):
+            permanent = block_identifier <= await self.finalized_block_number()
+        elif block_identifier not in self.MOVING_TAGS:
+            cacheable = False
+        key = self._key(fn_name, args, block_identifier)
+        if cacheable and not refresh:
+            value = self.cache.get(key)
+            if value is not _MISSING:
+                return value
+        caller = self.contract.caller(block_identifier=block_identifier)
+        value = await getattr(caller, fn_name)(*args)
+        if cacheable:
+            self.cache.set(key, value, permanent=permanent)
+        return value
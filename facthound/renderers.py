@@ -0,0 +1,99 @@
+"""
+Fast JSON responses.
+
+Uses orjson when it is installed and ``FAST_JSON`` is enabled, and falls back
+to Django's stdlib-based encoder otherwise, or for values orjson can't encode
+(such as integers wider than 64 bits). Dates and times are encoded by
+Django's encoder on both paths, so datetimes keep millisecond precision
+whichever encoder runs. ``FastJsonResponse`` is a drop-in for
+``JsonResponse`` in function views; ``FastJSONRenderer`` does the same for DRF
+views.
+"""
+
+import datetime
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+# Set to False to always use the stdlib encoder
+FAST_JSON = getattr(settings, "FAST_JSON", True)
+
+
+_encoder = DjangoJSONEncoder()
+
+# types orjson leaves to _default: ones it doesn't handle, and dates and times,
+# which it would write with microseconds where DjangoJSONEncoder uses millis
+_DJANGO_TYPES = (Decimal, Promise, datetime.datetime, datetime.date, datetime.time)
+
+
+def _default(obj):
+    if isinstance(obj, _DJANGO_TYPES):
+        return _encoder.default(obj)
+    raise TypeError
+
+
+def _orjson_dumps(data):
+    return orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def dumps(data):
+    """
+    Serialize data to JSON bytes.
+
+    Args:
+        data: The data to encode
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    if orjson is not None and FAST_JSON:
+        try:
+            return _orjson_dumps(data)
+        except TypeError:
+            pass
+    return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    ``JsonResponse`` encoded with ``dumps``.
+
+    Args:
+        data: The dict to encode
+        **kwargs: Passed to HttpResponse, e.g. status
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    DRF JSON renderer using orjson when available.
+
+    Indented (browsable API or ``indent=`` accept parameter) responses use the
+    stock renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or not FAST_JSON or self.get_indent(
+            accepted_media_type or "", renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            return _orjson_dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -93,6 +95,31 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+#
+# "shared" holds state every worker process must agree on (rate limit buckets,
+# cached users). It is Redis when REDIS_URL is set, otherwise a database table
+# created with `python manage.py createcachetable`.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+        if os.getenv("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "facthound_cache",
+        }
+    ),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -138,14 +165,58 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'siweauth.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'questions.pagination.CursorPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'facthound.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
 }
 
 # SIWE
 
 AUTH_USER_MODEL = "siweauth.User"
-AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend', "siweauth.backend.SiweBackend"]
+
+# Rate limit buckets and cached users have to be shared by every worker process
+RATE_LIMIT_CACHE = "shared"
+USER_CACHE_ALIAS = "shared"
+# Turns rate limiting off and hashes passwords cheaply in the test suite, see
+# facthound/test_runner.py
+TEST_RUNNER = "facthound.test_runner.TestRunner"
+
+AUTHENTICATION_BACKENDS = ['siweauth.backend.PasswordBackend', "siweauth.backend.SiweBackend"]
+
+# Password hasher profiles. "default" is Django's PBKDF2, "scrypt" prefers the
+# memory-hard scrypt hasher, and "fast" uses few PBKDF2 iterations and is only
+# allowed with DEBUG on (the test runner switches to it too). Existing hashes
+# keep working across the default and scrypt profiles and are upgraded to the
+# preferred hasher at the next login.
+PASSWORD_HASHER_PROFILES = {
+    "default": [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ],
+    "scrypt": [
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ],
+    "fast": [
+        "siweauth.hashers.FastPBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.ScryptPasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    ],
+}
+PASSWORD_HASHER_PROFILE = os.getenv("PASSWORD_HASHER_PROFILE", "default")
+if PASSWORD_HASHER_PROFILE == "fast" and not DEBUG:
+    raise ImproperlyConfigured('PASSWORD_HASHER_PROFILE "fast" needs DEBUG.')
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+# Hash passwords in a pool (None, "thread" or "process"), see siweauth.passwords
+PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL") or None
 
 # CORS
 CORS_ALLOW_CREDENTIALS = True
@@ -0,0 +1,34 @@
+"""
+Test runner for the facthound project.
+
+The test suite sends every request from one client, so rate limiting is
+switched off here rather than in settings; tests of the limits turn it back on
+with ``mock.patch("siweauth.ratelimit.RATE_LIMIT_ENABLED", True)``. Passwords
+are hashed with the "fast" hasher profile.
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    DiscoverRunner with test-only settings applied.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._rate_limits = mock.patch("siweauth.ratelimit.RATE_LIMIT_ENABLED", False)
+        self._rate_limits.start()
+        self._hashers = override_settings(
+            PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES["fast"]
+        )
+        self._hashers.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._hashers.disable()
+        self._rate_limits.stop()
+        super().teardown_test_environment(**kwargs)
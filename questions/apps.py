@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class QuestionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'questions'
+
+    def ready(self):
+        # connect the bounty, tag total and autocomplete signal handlers
+        from questions import bounties, tags, autocomplete  # noqa: F401
@@ -0,0 +1,345 @@
+"""
+In-memory prefix autocomplete over tag names and thread topics.
+
+Each process keeps sorted prefix indexes of tag names and of every word start
+in thread topics, with each key cut to ``KEY_LENGTH`` characters so memory
+stays linear in the topic length. Every prefix that is looked up keeps its
+top ``AUTOCOMPLETE_MAX_LIMIT`` ids, kept current as entries are added and
+removed, so a repeated keystroke is a dict lookup; one- and two-character
+prefixes, whose matches span most of the index, are computed when the index
+is built. No database query runs per lookup. Saves and deletes in this
+process update the indexes immediately through signals. Changes made by other
+processes are picked up by an incremental refresh every
+``AUTOCOMPLETE_REFRESH`` seconds, which reloads the small tag table and only
+the threads created since the last refresh, and by a full rebuild every
+``AUTOCOMPLETE_REBUILD`` seconds, which catches edited and deleted topics.
+Refreshes read the database outside the lookup lock and swap the new indexes
+in, so suggestions keep being served while one runs.
+"""
+
+from bisect import bisect_left, insort
+import heapq
+import re
+import threading
+import time
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from questions.models import Thread, Tag
+from questions.settings import (
+    AUTOCOMPLETE_REFRESH,
+    AUTOCOMPLETE_REBUILD,
+    AUTOCOMPLETE_MAX_LIMIT,
+)
+
+# sorts after any character a prefix can continue with
+_PREFIX_END = "\U0010ffff"
+
+_WORD_START = re.compile(r"\b\w", re.UNICODE)
+
+# characters of each word start that are indexed; longer prefixes are
+# checked against the label
+KEY_LENGTH = 32
+
+# prefixes whose top ids are computed up front
+_WARM_LENGTH = 2
+
+# prefixes whose top ids are kept, oldest dropped first
+_MAX_CACHED_PREFIXES = 50000
+
+
+def _best_first(entry):
+    weight, pk = entry
+    return (-weight, -pk)
+
+
+class PrefixIndex:
+    """
+    Sorted (key, id) pairs for prefix lookup, ranked by a per-id weight.
+    """
+
+    def __init__(self, word_starts=False, top_k=AUTOCOMPLETE_MAX_LIMIT):
+        self.word_starts = word_starts
+        self.top_k = top_k
+        self._entries = []
+        self._keys = {}
+        # prefix -> up to top_k (weight, id) pairs, best first
+        self._top = {}
+        self.labels = {}
+        self.weights = {}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _keys_for(self, label):
+        label = label.lower()
+        if not self.word_starts:
+            return [label[:KEY_LENGTH]]
+        return sorted(
+            {label[m.start():m.start() + KEY_LENGTH] for m in _WORD_START.finditer(label)}
+            | {label[:KEY_LENGTH]}
+        )
+
+    @staticmethod
+    def _prefixes(keys):
+        return {key[:n] for key in keys for n in range(1, len(key) + 1)}
+
+    def add(self, pk, label, weight=0):
+        """
+        Index a label, replacing any previous label for the id.
+
+        Args:
+            pk: The id suggestions refer to
+            label: The text to match prefixes against
+            weight: Rank among matches, higher first
+        """
+        if self.labels.get(pk) == label and self.weights.get(pk) == weight:
+            return
+        self.remove(pk)
+        keys = self._keys_for(label)
+        for key in keys:
+            insort(self._entries, (key, pk))
+        self._keys[pk] = keys
+        self.labels[pk] = label
+        self.weights[pk] = weight
+        entry = (weight, pk)
+        for prefix in self._prefixes(keys):
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            if len(top) < self.top_k or entry > top[-1]:
+                insort(top, entry, key=_best_first)
+                del top[self.top_k:]
+
+    def remove(self, pk):
+        """
+        Drop an id from the index, if present.
+        """
+        keys = self._keys.pop(pk, ())
+        for key in keys:
+            i = bisect_left(self._entries, (key, pk))
+            if i < len(self._entries) and self._entries[i] == (key, pk):
+                del self._entries[i]
+        entry = (self.weights.get(pk), pk)
+        for prefix in self._prefixes(keys):
+            top = self._top.get(prefix)
+            if top is None or entry not in top:
+                continue
+            if len(top) < self.top_k:
+                # the list held every match, so it still does
+                top.remove(entry)
+            else:
+                # an id past the list may move up; recompute on next lookup
+                del self._top[prefix]
+        self.labels.pop(pk, None)
+        self.weights.pop(pk, None)
+
+    def _scan(self, prefix, k):
+        # top k of every entry under the prefix
+        lo = bisect_left(self._entries, (prefix[:KEY_LENGTH],))
+        hi = bisect_left(self._entries, (prefix[:KEY_LENGTH] + _PREFIX_END,))
+        matches = {pk for _, pk in self._entries[lo:hi]}
+        if len(prefix) > KEY_LENGTH:
+            matches = {pk for pk in matches if self._matches_label(pk, prefix)}
+        return heapq.nlargest(k, ((self.weights[pk], pk) for pk in matches))
+
+    def _matches_label(self, pk, prefix):
+        label = self.labels[pk].lower()
+        if not self.word_starts:
+            return label.startswith(prefix)
+        return any(label.startswith(prefix, m.start()) for m in _WORD_START.finditer(label))
+
+    def load(self, rows):
+        """
+        Fill an empty index in one sort, then warm it.
+
+        Args:
+            rows: Iterable of (id, label, weight)
+        """
+        for pk, label, weight in rows:
+            keys = self._keys_for(label)
+            self._entries.extend((key, pk) for key in keys)
+            self._keys[pk] = keys
+            self.labels[pk] = label
+            self.weights[pk] = weight
+        self._entries.sort()
+        self.warm()
+
+    def warm(self):
+        """
+        Compute the top ids of every prefix up to ``_WARM_LENGTH`` characters
+        in one pass over the index.
+        """
+        heaps = {}
+        for key, pk in self._entries:
+            for n in range(1, min(len(key), _WARM_LENGTH) + 1):
+                heaps.setdefault(key[:n], {})[pk] = (self.weights[pk], pk)
+        for prefix, entries in heaps.items():
+            self._top[prefix] = heapq.nlargest(self.top_k, entries.values())
+
+    def search(self, prefix, k):
+        """
+        Return the k highest weighted ids with a key starting with prefix.
+
+        Args:
+            prefix: The typed text
+            k: Number of suggestions
+
+        Returns:
+            list: Ids, highest weight first
+        """
+        prefix = prefix.lower()
+        if k > self.top_k or len(prefix) > KEY_LENGTH:
+            return [pk for _, pk in self._scan(prefix, k)]
+        top = self._top.get(prefix)
+        if top is None:
+            top = self._scan(prefix, self.top_k)
+            if len(self._top) >= _MAX_CACHED_PREFIXES:
+                del self._top[next(iter(self._top))]
+            self._top[prefix] = top
+        return [pk for _, pk in top[:k]]
+
+
+class Autocomplete:
+    """
+    Tag and topic prefix indexes with periodic incremental refresh.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.tags = PrefixIndex()
+        self.topics = PrefixIndex(word_starts=True)
+        self._max_thread_pk = 0
+        self._refreshed = None
+        self._rebuilt = None
+
+    def _tag_index(self):
+        tags = PrefixIndex()
+        tags.load(Tag.objects.values_list("pk", "name", "thread_count"))
+        return tags
+
+    def _topic_rows(self, since_pk=0):
+        # topics rank newest first, so the weight is the thread id
+        return [
+            (pk, topic, pk)
+            for pk, topic in Thread.objects.filter(pk__gt=since_pk)
+            .order_by("pk")
+            .values_list("pk", "topic")
+            .iterator(chunk_size=2000)
+        ]
+
+    def _due(self, now, force):
+        if force or self._rebuilt is None or now - self._rebuilt > AUTOCOMPLETE_REBUILD:
+            return "rebuild"
+        if now - self._refreshed > AUTOCOMPLETE_REFRESH:
+            return "refresh"
+        return None
+
+    def refresh(self, force=False):
+        """
+        Bring the indexes up to date if they are stale.
+
+        The database is read and new indexes are built without holding the
+        lookup lock. While one caller refreshes, others keep being served from
+        the current indexes, unless nothing has been built yet.
+
+        Args:
+            force: Rebuild everything regardless of age
+        """
+        if self._due(time.monotonic(), force) is None:
+            return
+        if not self._refresh_lock.acquire(blocking=force or self._rebuilt is None):
+            return
+        try:
+            now = time.monotonic()
+            due = self._due(now, force)
+            if due == "rebuild":
+                rows = self._topic_rows()
+                topics = PrefixIndex(word_starts=True)
+                topics.load(rows)
+                tags = self._tag_index()
+                # threads saved while this ran are newer than rows and come
+                # in with the next incremental refresh
+                with self._lock:
+                    self.topics, self.tags = topics, tags
+                    self._max_thread_pk = max((pk for pk, _, _ in rows), default=0)
+                    self._rebuilt = self._refreshed = now
+            elif due == "refresh":
+                rows = self._topic_rows(self._max_thread_pk)
+                tags = self._tag_index()
+                with self._lock:
+                    for row in rows:
+                        self.topics.add(*row)
+                        self._max_thread_pk = max(self._max_thread_pk, row[0])
+                    self.tags = tags
+                    self._refreshed = now
+        finally:
+            self._refresh_lock.release()
+
+    def suggest(self, prefix, k):
+        """
+        Return the top-k tag and topic suggestions for a prefix.
+
+        Args:
+            prefix: The typed text
+            k: Number of suggestions of each kind
+
+        Returns:
+            dict: "tags" and "topics" suggestion lists
+        """
+        self.refresh()
+        with self._lock:
+            tags = [
+                {"name": self.tags.labels[pk], "thread_count": self.tags.weights[pk]}
+                for pk in self.tags.search(prefix, k)
+            ]
+            topics = [
+                {"id": pk, "topic": self.topics.labels[pk]}
+                for pk in self.topics.search(prefix, k)
+            ]
+        return {"tags": tags, "topics": topics}
+
+    def update(self, index_name, pk, label=None, weight=0):
+        # signal path: keep a built index current, leave an unbuilt one alone
+        with self._lock:
+            if self._rebuilt is None:
+                return
+            index = getattr(self, index_name)
+            if label is None:
+                index.remove(pk)
+            else:
+                index.add(pk, label, weight)
+                if index_name == "topics":
+                    self._max_thread_pk = max(self._max_thread_pk, pk)
+
+
+_autocomplete = Autocomplete()
+
+
+def get_autocomplete():
+    """
+    Return this process's shared Autocomplete.
+    """
+    return _autocomplete
+
+
+@receiver(post_save, sender=Thread)
+def _thread_saved(sender, instance, **kwargs):
+    _autocomplete.update("topics", instance.pk, instance.topic, instance.pk)
+
+
+@receiver(post_delete, sender=Thread)
+def _thread_deleted(sender, instance, **kwargs):
+    _autocomplete.update("topics", instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+def _tag_saved(sender, instance, **kwargs):
+    _autocomplete.update("tags", instance.pk, instance.name, instance.thread_count)
+
+
+@receiver(post_delete, sender=Tag)
+def _tag_deleted(sender, instance, **kwargs):
+    _autocomplete.update("tags", instance.pk)
@@ -0,0 +1,139 @@
+"""
+Precomputed bounty totals.
+
+Each Thread carries the sum of its open and claimed question bounties and the
+single BountyTotals row carries the site-wide sums, so listing threads never
+sums bounties on the fly. Saving or deleting a Question refreshes its thread
+with one aggregate query and moves the global totals, and the open bounty of
+the thread's tags (see questions.tags), by the thread's change.
+Bulk ``QuerySet.update`` calls bypass this; run ``rebuild_bounty_totals``
+after them.
+"""
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from questions.fields import WeiSum
+from questions.models import Thread, Post, Question, BountyTotals
+from questions.tags import TagThread, adjust_tags, rebuild_tag_totals
+
+# Question statuses whose bounty is still up for grabs, and already awarded
+AVAILABLE_STATUSES = ["OP"]
+CLAIMED_STATUSES = ["AS", "RS"]
+
+# Fields whose change can move a thread's totals
+_BOUNTY_FIELDS = {"bounty", "status", "post"}
+
+
+def bounty_sums(prefix=""):
+    """
+    Build the available and claimed bounty aggregates.
+
+    Args:
+        prefix: Lookup path from the queried model to Question, e.g.
+            "post__question__"
+
+    Returns:
+        dict: Aggregate expressions keyed "available" and "claimed"
+    """
+    return {
+        "available": WeiSum(
+            f"{prefix}bounty", filter=Q(**{f"{prefix}status__in": AVAILABLE_STATUSES})
+        ),
+        "claimed": WeiSum(
+            f"{prefix}bounty", filter=Q(**{f"{prefix}status__in": CLAIMED_STATUSES})
+        ),
+    }
+
+
+def refresh_thread_bounty(thread_id):
+    """
+    Recompute one thread's totals and apply the change to the global totals.
+
+    Args:
+        thread_id: The thread's primary key
+    """
+    with transaction.atomic():
+        thread = Thread.objects.select_for_update().filter(pk=thread_id).first()
+        if thread is None:
+            return
+        sums = Question.objects.filter(post__thread_id=thread_id).aggregate(
+            **bounty_sums()
+        )
+        # Decimal arithmetic rounds to 28 digits, so do the math on ints
+        available = int(sums["available"] or 0)
+        claimed = int(sums["claimed"] or 0)
+        availableDelta = available - int(thread.total_bounty_available)
+        claimedDelta = claimed - int(thread.total_bounty_claimed)
+        if not (availableDelta or claimedDelta):
+            return
+        Thread.objects.filter(pk=thread_id).update(
+            total_bounty_available=available, total_bounty_claimed=claimed
+        )
+        adjust_tags(
+            TagThread.objects.filter(thread_id=thread_id).values_list(
+                "tag_id", flat=True
+            ),
+            bounty=availableDelta,
+        )
+        totals, _ = BountyTotals.objects.select_for_update().get_or_create(pk=1)
+        totals.available = int(totals.available) + availableDelta
+        totals.claimed = int(totals.claimed) + claimedDelta
+        totals.save()
+
+
+def rebuild_bounty_totals():
+    """
+    Recompute every thread's totals, the global totals and the tag totals
+    from scratch.
+
+    Returns:
+        BountyTotals: The refreshed global totals
+    """
+    with transaction.atomic():
+        sums = {
+            row["post__thread"]: row
+            for row in Question.objects.values("post__thread").annotate(
+                **bounty_sums()
+            )
+        }
+        threads = list(Thread.objects.select_for_update())
+        for thread in threads:
+            row = sums.get(thread.pk, {})
+            thread.total_bounty_available = row.get("available") or 0
+            thread.total_bounty_claimed = row.get("claimed") or 0
+        Thread.objects.bulk_update(
+            threads, ["total_bounty_available", "total_bounty_claimed"], batch_size=1000
+        )
+        overall = Question.objects.aggregate(**bounty_sums())
+        totals, _ = BountyTotals.objects.select_for_update().get_or_create(pk=1)
+        totals.available = overall["available"] or 0
+        totals.claimed = overall["claimed"] or 0
+        totals.save()
+        rebuild_tag_totals()
+    return totals
+
+
+def _thread_of(question):
+    try:
+        return question.post.thread_id
+    except Post.DoesNotExist:
+        return None
+
+
+@receiver(post_save, sender=Question)
+def _question_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not _BOUNTY_FIELDS.intersection(update_fields):
+        return
+    thread_id = _thread_of(instance)
+    if thread_id is not None:
+        refresh_thread_bounty(thread_id)
+
+
+@receiver(post_delete, sender=Question)
+def _question_deleted(sender, instance, **kwargs):
+    thread_id = _thread_of(instance)
+    if thread_id is not None:
+        refresh_thread_bounty(thread_id)
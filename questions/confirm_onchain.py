@@ -4,17 +4,31 @@ Blockchain verification utilities for the questions app.
 This module provides functions to verify and synchronize on-chain data with the database.
 It handles confirmation of questions, answers, and answer selections by checking the 
 FactHound contract's state on-chain and updating the corresponding database objects accordingly.
+Confirmations read state at a single block and record its number and hash, so
+``reverify_confirmations`` can re-check rows still within ``CONFIRMATION_DEPTH`` of the
+head after a chain reorganization. Each confirmation has an async variant (``aconfirm_*``) for use from async views, so one
+worker can keep many RPC round trips in flight.
 """
 
-import os
 from web3 import Web3
-import json
+from web3.exceptions import BlockNotFound
+from django.db.models import Q
 import hexbytes
+import datetime
+import pytz
 import logging
 
+from facthound.chain import (
+    get_web3,
+    get_async_web3,
+    get_view_cache,
+    get_facthound_abi,
+    ContractReader,
+    AsyncContractReader,
+)
 from siweauth.models import User
-from questions.models import Question, Answer
-from questions.settings import allowed_owners
+from questions.models import Question, Answer, Deployment
+from questions.settings import allowed_owners, CONFIRMATION_DEPTH
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
@@ -25,15 +39,137 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-w3 = Web3(
-    Web3.HTTPProvider(
-        f"{os.getenv('ALCHEMY_API_ENDPOINT')}/{os.getenv('ALCHEMY_API_KEY')}"
+
+def _resolve_chain(deployment):
+    """
+    Pick the chain client settings and owner allowlist for a contract.
+
+    Contracts registered as a Deployment use that deployment's chain, RPC
+    endpoint and owners. Unregistered contracts fall back to the default chain
+    and ``questions.settings.allowed_owners``.
+
+    Args:
+        deployment: The registered Deployment, or None
+
+    Returns:
+        tuple: (chain_id, endpoint_uri, owners)
+    """
+    if deployment is None:
+        return None, None, allowed_owners
+    return deployment.chainId, deployment.rpcUrl, deployment.allowedOwners
+
+
+def _get_reader(question):
+    """
+    Build a cached reader over a question's FactHound contract.
+
+    Args:
+        question: The Question whose contract to read
+
+    Returns:
+        tuple: (ContractReader, allowed owners for the contract)
+    """
+    chain_id, endpoint_uri, owners = _resolve_chain(
+        Deployment.objects.resolve(question.contractAddress, question.chainId)
     )
-)
-with open("contracts/FactHound.json", "rb") as f:
-    facthound_contract = json.load(f)
-facthound_abi = facthound_contract["abi"]
-facthound_bytecode = facthound_contract["bytecode"]["object"]
+    contract = get_web3(chain_id, endpoint_uri).eth.contract(
+        address=question.contractAddress, abi=get_facthound_abi(), decode_tuples=True
+    )
+    return ContractReader(contract, get_view_cache(chain_id)), owners
+
+
+async def _aget_reader(question):
+    """
+    Async variant of ``_get_reader``, on the chain's AsyncWeb3 client.
+
+    Args:
+        question: The Question whose contract to read
+
+    Returns:
+        tuple: (AsyncContractReader, allowed owners for the contract)
+    """
+    chain_id, endpoint_uri, owners = _resolve_chain(
+        await Deployment.objects.aresolve(question.contractAddress, question.chainId)
+    )
+    w3 = await get_async_web3(chain_id, endpoint_uri)
+    contract = w3.eth.contract(
+        address=question.contractAddress, abi=get_facthound_abi(), decode_tuples=True
+    )
+    return AsyncContractReader(contract, get_view_cache(chain_id)), owners
+
+
+def _question_status(questionStruct):
+    """
+    Map the contract's question status onto a Question.status choice.
+
+    Args:
+        questionStruct: The decoded getQuestion result
+
+    Returns:
+        str: The Question.status value
+    """
+    return (
+        "CA"
+        if questionStruct.status == 4
+        else (
+            "RS"
+            if questionStruct.status == 3
+            else ("AS" if (questionStruct.status == 1) else "OP")
+        )
+    )
+
+
+def _answer_status(answerHash, questionStruct):
+    """
+    Map the contract's selected answer onto an Answer.status choice.
+
+    Args:
+        answerHash: The answer's hash
+        questionStruct: The decoded getQuestion result
+
+    Returns:
+        str: The Answer.status value
+    """
+    return (
+        "SE" if answerHash == questionStruct.selectedAnswer.hex() else "UN"
+    )  # TODO get other states in here
+
+
+def _read_at_head(contract, read, visible):
+    """
+    Read contract state at the TTL-cached head, reading again at a fresh head
+    if what we're confirming isn't visible there yet.
+
+    Confirmations usually follow the transaction they check, which may have
+    been mined after the cached head. Reads by block hash are cached for good,
+    so a repeated confirmation within the TTL costs no RPC round trips.
+
+    Args:
+        contract: The ContractReader
+        read: Callable taking a block hash and returning the state
+        visible: Callable taking the state, False if it may just be too new
+
+    Returns:
+        tuple: (block number, block hash, state)
+    """
+    blockNumber, blockHash = contract.head_block()
+    state = read(blockHash)
+    if not visible(state):
+        blockNumber, blockHash = contract.head_block(refresh=True)
+        state = read(blockHash)
+    return blockNumber, blockHash, state
+
+
+async def _aread_at_head(contract, read, visible):
+    """
+    Async variant of ``_read_at_head``; ``read`` returns an awaitable.
+    """
+    blockNumber, blockHash = await contract.head_block()
+    state = await read(blockHash)
+    if not visible(state):
+        blockNumber, blockHash = await contract.head_block(refresh=True)
+        state = await read(blockHash)
+    return blockNumber, blockHash, state
 
 
 def confirm_question(questionHash):
@@ -60,38 +196,41 @@ def confirm_question(questionHash):
     except Question.DoesNotExist:
         return False, "Question not found."
     try:
-        contract = w3.eth.contract(
-            address=question.contractAddress, abi=facthound_abi, decode_tuples=True
-        )
-        owner = contract.caller.owner()
+        contract, owners = _get_reader(question)
+        owner = contract.call("owner")
     except:
         return False, "Failed to load contract."
     # verify that we own this contract
-    if not owner in allowed_owners:
+    if not owner in owners:
         return False, "Invalid owner."
     expectedQuestionHash = Web3.solidity_keccak(
         ["address", "string"], [question.asker.wallet, question.post.text]
     )
-    questionStruct = contract.caller.getQuestion(question.questionHash)
+    # pin the read to the current head so a reorg can be detected later. the
+    # bounty and status are written from this read and it usually follows the
+    # createQuestion or bounty transaction, so a cached head would record
+    # stale values
+    blockNumber, blockHash = contract.head_block(refresh=True)
+    questionStruct = contract.call(
+        "getQuestion", question.questionHash, block_identifier=blockHash
+    )
     asker = questionStruct.asker
     if question.questionHash != expectedQuestionHash:
         return False, "Unexpected questionHash."
+    if asker == ("0x" + 40 * "0"):
+        return False, "Question not found onchain."
     asker, _ = User.objects.get_or_create(wallet=asker)
     bounty = questionStruct.bounty
-    status = (
-        "CA"
-        if questionStruct.status == 4
-        else (
-            "RS"
-            if questionStruct.status == 3
-            else ("AS" if (questionStruct.status == 1) else "OP")
-        )
-    )
+    status = _question_status(questionStruct)
     # passed. update
     question.asker = asker
     question.bounty = bounty
     question.status = status
+    if status in ("AS", "RS") and question.selected_dt is None:
+        question.selected_dt = datetime.datetime.now(pytz.UTC)
     question.confirmed_onchain = True
+    question.confirmed_block_number = blockNumber
+    question.confirmed_block_hash = blockHash
     question.save()
     return True, {"message": "Success", "thread": question.post.thread.pk}
 
@@ -123,14 +262,12 @@ def confirm_answer(questionHash, answerHash):
     except Answer.DoesNotExist:
         return False, "Answer not found."
     try:
-        contract = w3.eth.contract(
-            address=question.contractAddress, abi=facthound_abi, decode_tuples=True
-        )
-        owner = contract.caller.owner()
+        contract, owners = _get_reader(question)
+        owner = contract.call("owner")
     except:
         return False, "Failed to load contract."
     # verify that we own this contract
-    if not owner in allowed_owners:
+    if not owner in owners:
         return False, "Invalid owner."
     expectedAnswerHash = Web3.solidity_keccak(
         ["address", "string"], [answer.answerer.wallet, answer.post.text]
@@ -139,23 +276,34 @@ def confirm_answer(questionHash, answerHash):
     if answerHash != expectedAnswerHash:
         return False, "Unexpected answerHash"
     # verify that answerHash is an answer for this contract and was posted by this answerer
-    questionStruct = contract.caller.getQuestion(answer.question.questionHash)
-    answerer = contract.caller.getAnswererAddress(
-        answer.question.questionHash, answerHash
+    blockNumber, blockHash, (questionStruct, answerer) = _read_at_head(
+        contract,
+        lambda blockHash: (
+            contract.call(
+                "getQuestion", answer.question.questionHash, block_identifier=blockHash
+            ),
+            contract.call(
+                "getAnswererAddress",
+                answer.question.questionHash,
+                answerHash,
+                block_identifier=blockHash,
+            ),
+        ),
+        lambda state: state[1] != ("0x" + 40 * "0"),
     )
     if answerer == ("0x" + 40 * "0"):
         return False, "Invalid answerHash"
     answerer, _ = User.objects.get_or_create(
         wallet=answerer
     )
-    status = (
-        "SE" if answerHash == questionStruct.selectedAnswer.hex() else "UN"
-    )  # TODO get other states in here
+    status = _answer_status(answerHash, questionStruct)
     confirmed_onchain = True
     # passed. update
     answer.answerer = answerer
     answer.status = status
     answer.confirmed_onchain = confirmed_onchain
+    answer.confirmed_block_number = blockNumber
+    answer.confirmed_block_hash = blockHash
     answer.save()
     return True, {"message": "Success", "thread": question.post.thread.pk}
 
@@ -186,15 +334,20 @@ def confirm_selection(questionHash, answerHash):
     except Answer.DoesNotExist:
         return False, "Answer not found."
     try:
-        contract = w3.eth.contract(
-            address=question.contractAddress, abi=facthound_abi, decode_tuples=True
-        )
-        owner = contract.caller.owner()
+        contract, owners = _get_reader(question)
+        owner = contract.call("owner")
     except:
         return False, "Failed to load contract."
 
-    # make sure this answer was selected in the contract
-    questionStruct = contract.caller.getQuestion(question.questionHash)
+    # make sure this answer was selected in the contract. the selection was
+    # likely just made, so look at a fresh head if the cached one predates it
+    blockNumber, blockHash, questionStruct = _read_at_head(
+        contract,
+        lambda blockHash: contract.call(
+            "getQuestion", question.questionHash, block_identifier=blockHash
+        ),
+        lambda questionStruct: questionStruct.selectedAnswer == answer.answerHash,
+    )
     selectedAnswer = questionStruct.selectedAnswer
     if selectedAnswer != answer.answerHash:
         answer.status = "UN"
@@ -204,5 +357,356 @@ def confirm_selection(questionHash, answerHash):
     selection_confirmed_onchain = True
     # passed. update
     answer.selection_confirmed_onchain = selection_confirmed_onchain
+    answer.selection_block_number = blockNumber
+    answer.selection_block_hash = blockHash
     answer.save()
     return True, {"message": "Success", "thread": question.post.thread.pk}
+
+
+# async variants for ASGI views. these mirror the sync functions above but use
+# AsyncWeb3 and Django's async ORM, so related rows are fetched up front.
+
+
+async def aconfirm_question(questionHash):
+    """
+    Async variant of ``confirm_question``.
+
+    Args:
+        questionHash (hexbytes.HexBytes): The hash of the question to confirm
+
+    Returns:
+        tuple: (success_bool, response_message_or_dict)
+    """
+    try:
+        question = await Question.objects.select_related("asker", "post").aget(
+            questionHash=questionHash
+        )
+    except Question.DoesNotExist:
+        return False, "Question not found."
+    try:
+        contract, owners = await _aget_reader(question)
+        owner = await contract.call("owner")
+    except Exception:
+        return False, "Failed to load contract."
+    # verify that we own this contract
+    if not owner in owners:
+        return False, "Invalid owner."
+    expectedQuestionHash = Web3.solidity_keccak(
+        ["address", "string"], [question.asker.wallet, question.post.text]
+    )
+    # pin the read to the current head so a reorg can be detected later. the
+    # bounty and status are written from this read and it usually follows the
+    # createQuestion or bounty transaction, so a cached head would record
+    # stale values
+    blockNumber, blockHash = await contract.head_block(refresh=True)
+    questionStruct = await contract.call(
+        "getQuestion", question.questionHash, block_identifier=blockHash
+    )
+    if question.questionHash != expectedQuestionHash:
+        return False, "Unexpected questionHash."
+    if questionStruct.asker == ("0x" + 40 * "0"):
+        return False, "Question not found onchain."
+    asker, _ = await User.objects.aget_or_create(wallet=questionStruct.asker)
+    # passed. update
+    question.asker = asker
+    question.bounty = questionStruct.bounty
+    question.status = _question_status(questionStruct)
+    if question.status in ("AS", "RS") and question.selected_dt is None:
+        question.selected_dt = datetime.datetime.now(pytz.UTC)
+    question.confirmed_onchain = True
+    question.confirmed_block_number = blockNumber
+    question.confirmed_block_hash = blockHash
+    await question.asave()
+    return True, {"message": "Success", "thread": question.post.thread_id}
+
+
+async def aconfirm_answer(questionHash, answerHash):
+    """
+    Async variant of ``confirm_answer``.
+
+    Args:
+        questionHash (hexbytes.HexBytes): The hash of the question being answered
+        answerHash (hexbytes.HexBytes): The hash of the answer to confirm
+
+    Returns:
+        tuple: (success_bool, response_message_or_dict)
+    """
+    try:
+        answer = await Answer.objects.select_related(
+            "answerer", "post", "question__post"
+        ).aget(answerHash=answerHash)
+        question = answer.question
+    except Answer.DoesNotExist:
+        return False, "Answer not found."
+    try:
+        contract, owners = await _aget_reader(question)
+        owner = await contract.call("owner")
+    except Exception:
+        return False, "Failed to load contract."
+    # verify that we own this contract
+    if not owner in owners:
+        return False, "Invalid owner."
+    expectedAnswerHash = Web3.solidity_keccak(
+        ["address", "string"], [answer.answerer.wallet, answer.post.text]
+    )
+    answerHash = hexbytes.HexBytes(answer.answerHash)
+    if answerHash != expectedAnswerHash:
+        return False, "Unexpected answerHash"
+    # verify that answerHash is an answer for this contract and was posted by this answerer
+    async def read(blockHash):
+        return (
+            await contract.call(
+                "getQuestion", question.questionHash, block_identifier=blockHash
+            ),
+            await contract.call(
+                "getAnswererAddress",
+                question.questionHash,
+                answerHash,
+                block_identifier=blockHash,
+            ),
+        )
+
+    blockNumber, blockHash, (questionStruct, answerer) = await _aread_at_head(
+        contract, read, lambda state: state[1] != ("0x" + 40 * "0")
+    )
+    if answerer == ("0x" + 40 * "0"):
+        return False, "Invalid answerHash"
+    answerer, _ = await User.objects.aget_or_create(wallet=answerer)
+    # passed. update
+    answer.answerer = answerer
+    answer.status = _answer_status(answerHash, questionStruct)
+    answer.confirmed_onchain = True
+    answer.confirmed_block_number = blockNumber
+    answer.confirmed_block_hash = blockHash
+    await answer.asave()
+    return True, {"message": "Success", "thread": question.post.thread_id}
+
+
+async def aconfirm_selection(questionHash, answerHash):
+    """
+    Async variant of ``confirm_selection``.
+
+    Args:
+        questionHash (hexbytes.HexBytes): The hash of the question
+        answerHash (hexbytes.HexBytes): The hash of the answer to confirm selection
+
+    Returns:
+        tuple: (success_bool, response_message_or_dict)
+    """
+    try:
+        answer = await Answer.objects.select_related("question__post").aget(
+            answerHash=answerHash
+        )
+        question = answer.question
+    except Answer.DoesNotExist:
+        return False, "Answer not found."
+    try:
+        contract, _ = await _aget_reader(question)
+        await contract.call("owner")
+    except Exception:
+        return False, "Failed to load contract."
+
+    # make sure this answer was selected in the contract. the selection was
+    # likely just made, so look at a fresh head if the cached one predates it
+    blockNumber, blockHash, questionStruct = await _aread_at_head(
+        contract,
+        lambda blockHash: contract.call(
+            "getQuestion", question.questionHash, block_identifier=blockHash
+        ),
+        lambda questionStruct: questionStruct.selectedAnswer == answer.answerHash,
+    )
+    if questionStruct.selectedAnswer != answer.answerHash:
+        answer.status = "UN"
+        answer.selection_confirmed_onchain = False
+        await answer.asave()
+        return False, f"This answer must be selected in the contract at address {question.contractAddress}."
+    # passed. update
+    answer.selection_confirmed_onchain = True
+    answer.selection_block_number = blockNumber
+    answer.selection_block_hash = blockHash
+    await answer.asave()
+    return True, {"message": "Success", "thread": question.post.thread_id}
+
+
+# reorg handling. confirmations store the block they were read at; rows whose
+# block is still within CONFIRMATION_DEPTH of the head are re-checked against
+# the canonical chain and re-confirmed if that block was reorganized away.
+
+
+def _canonical_hash(w3, blockNumber, hashes):
+    """
+    Look up the canonical hash of a block, memoized per pass.
+
+    Args:
+        w3: The chain's Web3 client
+        blockNumber: The block number
+        hashes: Dict of already fetched hashes for this chain
+
+    Returns:
+        bytes: The block hash, or None if the block no longer exists
+    """
+    if blockNumber not in hashes:
+        try:
+            hashes[blockNumber] = bytes(w3.eth.get_block(blockNumber).hash)
+        except BlockNotFound:
+            hashes[blockNumber] = None
+    return hashes[blockNumber]
+
+
+def _deployed_rows(deployments, prefix, chain_id=None):
+    """
+    Build a filter for the rows ``Deployment.objects.resolve`` would place on
+    a registered deployment.
+
+    Args:
+        deployments: (chainId, contractAddress) pairs of active deployments
+        prefix: Lookup prefix from the row to its Question, e.g. "question__"
+        chain_id: Only match deployments on this chain; None matches any
+
+    Returns:
+        Q: The filter, or None if no deployment matches
+    """
+    condition = None
+    for deploymentChain, contractAddress in deployments:
+        if chain_id is not None and deploymentChain != chain_id:
+            continue
+        term = Q(**{f"{prefix}contractAddress": contractAddress}) & (
+            Q(**{f"{prefix}chainId__isnull": True})
+            | Q(**{f"{prefix}chainId": deploymentChain})
+        )
+        condition = term if condition is None else condition | term
+    return condition
+
+
+def _chain_rows(deployments, prefix, chain_id):
+    # rows on the default chain are the ones no deployment claims
+    if chain_id is not None:
+        return _deployed_rows(deployments, prefix, chain_id)
+    deployed = _deployed_rows(deployments, prefix)
+    return Q() if deployed is None else ~deployed
+
+
+def reverify_confirmations(depth=None):
+    """
+    Re-check recent confirmations against the canonical chain.
+
+    Only rows whose recorded block is within ``depth`` blocks of their chain's
+    head are visited; older confirmations are treated as final. A row whose
+    recorded block hash is no longer canonical has its confirmation cleared and
+    is confirmed again against the current chain. A chain whose head can't be
+    read is logged and skipped without holding up the others.
+
+    Args:
+        depth (int): Reorg window in blocks. Defaults to ``CONFIRMATION_DEPTH``
+
+    Returns:
+        dict: Counts of rows "checked", "reorged" and "reconfirmed"
+    """
+    depth = CONFIRMATION_DEPTH if depth is None else depth
+    endpoints = {}
+    deployments = []
+    for chain_id, endpoint_uri, contractAddress in Deployment.objects.filter(
+        active=True
+    ).order_by("pk").values_list("chainId", "rpcUrl", "contractAddress"):
+        endpoints.setdefault(chain_id, endpoint_uri)
+        deployments.append((chain_id, contractAddress))
+    # (model, lookup prefix to the question, block number field)
+    tables = [
+        (Question, "", "confirmed_block_number"),
+        (Answer, "question__", "confirmed_block_number"),
+        (Answer, "question__", "selection_block_number"),
+    ]
+    # the default chain only matters if confirmed rows live on it
+    if any(
+        model.objects.filter(
+            _chain_rows(deployments, prefix, None), **{f"{numberField}__isnull": False}
+        ).exists()
+        for model, prefix, numberField in tables
+    ):
+        endpoints = {None: None, **endpoints}
+    # one head lookup per chain, up front, so the row queries can use the
+    # block number indexes with each chain's own window
+    chains = {}
+    for chain_id, endpoint_uri in endpoints.items():
+        try:
+            w3 = get_web3(chain_id, endpoint_uri)
+            chains[chain_id] = (w3, w3.eth.block_number, {})
+        except Exception as e:
+            logger.warning(f"reorg: skipping chain {chain_id}, head lookup failed: {e}")
+    resolved = {}
+
+    def chain_for(question):
+        key = (question.contractAddress, question.chainId)
+        if key not in resolved:
+            chain_id, _, _ = _resolve_chain(Deployment.objects.resolve(*key))
+            resolved[key] = chains.get(chain_id)
+        return resolved[key]
+
+    def in_window(prefix, numberField):
+        window = Q(pk__in=[])
+        for chain_id, (_, head, _) in chains.items():
+            window |= _chain_rows(deployments, prefix, chain_id) & Q(
+                **{f"{numberField}__gt": head - depth}
+            )
+        return window
+
+    passes = [
+        (
+            Question.objects.filter(in_window("", "confirmed_block_number")),
+            lambda q: q,
+            ("confirmed_onchain", "confirmed_block_number", "confirmed_block_hash"),
+            lambda q: confirm_question(q.questionHash),
+        ),
+        (
+            Answer.objects.filter(
+                in_window("question__", "confirmed_block_number")
+            ).select_related("question"),
+            lambda a: a.question,
+            ("confirmed_onchain", "confirmed_block_number", "confirmed_block_hash"),
+            lambda a: confirm_answer(a.question.questionHash, a.answerHash),
+        ),
+        (
+            Answer.objects.filter(
+                in_window("question__", "selection_block_number")
+            ).select_related("question"),
+            lambda a: a.question,
+            (
+                "selection_confirmed_onchain",
+                "selection_block_number",
+                "selection_block_hash",
+            ),
+            lambda a: confirm_selection(a.question.questionHash, a.answerHash),
+        ),
+    ]
+    counts = {"checked": 0, "reorged": 0, "reconfirmed": 0}
+    for queryset, question_of, fields, reconfirm in passes:
+        flagField, numberField, hashField = fields
+        for row in queryset:
+            chain = chain_for(question_of(row))
+            if chain is None:
+                continue
+            w3, head, hashes = chain
+            blockNumber = getattr(row, numberField)
+            # a row with several candidate deployments may match another
+            # chain's window
+            if blockNumber <= head - depth:
+                continue
+            counts["checked"] += 1
+            try:
+                canonical = _canonical_hash(w3, blockNumber, hashes)
+            except Exception as e:
+                logger.warning(f"reorg: block {blockNumber} lookup failed: {e}")
+                continue
+            if canonical == bytes(getattr(row, hashField)):
+                continue
+            counts["reorged"] += 1
+            logger.info(
+                f"reorg: {row._meta.model_name} {row.pk} block {blockNumber} no longer canonical"
+            )
+            setattr(row, flagField, False)
+            setattr(row, numberField, None)
+            setattr(row, hashField, None)
+            row.save(update_fields=[flagField, numberField, hashField])
+            success, _ = reconfirm(row)
+            counts["reconfirmed"] += success
+    return counts
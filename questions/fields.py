@@ -0,0 +1,98 @@
+"""
+Model fields and aggregates for wei amounts.
+
+Bounties are uint256 values in wei. ``WeiField`` stores them exactly: as
+``numeric(78, 0)`` on backends with arbitrary precision decimals, and as
+zero-padded text on SQLite, whose numeric columns fall back to 8 byte floats
+above 2**63. Padding keeps text comparisons and ordering numeric. ``WeiSum``
+sums wei columns exactly on every backend.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+from django.db.backends.signals import connection_created
+from django.db.models import Sum
+
+# decimal digits in 2**256 - 1
+WEI_DIGITS = 78
+
+
+class WeiField(models.DecimalField):
+    """
+    A non-negative integer amount of wei, up to 256 bits.
+
+    Values are returned as ``Decimal`` with no fractional digits. Decimal
+    arithmetic rounds to 28 significant digits by default, so convert to
+    ``int`` before doing math on them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_digits", WEI_DIGITS)
+        kwargs.setdefault("decimal_places", 0)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get("max_digits") == WEI_DIGITS:
+            del kwargs["max_digits"]
+        if kwargs.get("decimal_places") == 0:
+            del kwargs["decimal_places"]
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        # keep the backend's lossy DecimalField converters away from the value
+        return "WeiField"
+
+    def db_type(self, connection):
+        if connection.vendor == "sqlite":
+            return "text"
+        return connection.data_types["DecimalField"] % self.db_type_parameters(
+            connection
+        )
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return None
+        if connection.vendor == "sqlite":
+            return f"{int(value):0{WEI_DIGITS}d}"
+        return value
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return Decimal(value)
+
+
+class WeiSum(Sum):
+    """
+    ``Sum`` over a WeiField that stays exact on SQLite.
+    """
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler, connection, function="WEI_SUM", **extra_context
+        )
+
+
+class _WeiSumAggregate:
+    # sqlite3 aggregate summing padded wei text with Python integers
+    def __init__(self):
+        self.total = None
+
+    def step(self, value):
+        if value is not None:
+            self.total = (self.total or 0) + int(value)
+
+    def finalize(self):
+        return None if self.total is None else str(self.total)
+
+
+def _register_wei_sum(sender, connection, **kwargs):
+    if connection.vendor == "sqlite":
+        connection.connection.create_aggregate("WEI_SUM", 1, _WeiSumAggregate)
+
+
+connection_created.connect(_register_wei_sum)
@@ -0,0 +1,33 @@
+"""
+Recompute the bounty market statistics served by /api/market/.
+
+Meant to run periodically (e.g. from cron).
+"""
+
+from django.core.management.base import BaseCommand
+
+from questions.market import refresh_market_stats
+
+
+class Command(BaseCommand):
+    help = "Refresh the precomputed bounty market statistics."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--period",
+            default=None,
+            help="pandas offset alias for series buckets (defaults to MARKET_STATS_PERIOD).",
+        )
+        parser.add_argument(
+            "--buckets",
+            type=int,
+            default=None,
+            help="Number of buckets kept (defaults to MARKET_STATS_BUCKETS).",
+        )
+
+    def handle(self, *args, **options):
+        snapshot = refresh_market_stats(options["period"], options["buckets"])
+        self.stdout.write(
+            f"{snapshot.questions} questions, {snapshot.answers} answers, "
+            f"{len(snapshot.series)} buckets"
+        )
@@ -0,0 +1,29 @@
+"""
+Re-check recent on-chain confirmations for chain reorganizations.
+
+Meant to run periodically (e.g. from cron) so confirmations recorded within the
+reorg window are re-confirmed against the canonical chain.
+"""
+
+from django.core.management.base import BaseCommand
+
+from questions.confirm_onchain import reverify_confirmations
+
+
+class Command(BaseCommand):
+    help = "Re-verify confirmations whose block is within the reorg window."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=None,
+            help="Reorg window in blocks (defaults to CONFIRMATION_DEPTH).",
+        )
+
+    def handle(self, *args, **options):
+        counts = reverify_confirmations(depth=options["depth"])
+        self.stdout.write(
+            f"checked {counts['checked']}, reorged {counts['reorged']}, "
+            f"reconfirmed {counts['reconfirmed']}"
+        )
@@ -0,0 +1,38 @@
+"""
+Audit stored question and answer hashes against their posts.
+"""
+
+from django.core.management.base import BaseCommand
+
+from questions.models import Question, Answer
+from questions.verify_hashes import (
+    verify_question_hashes,
+    verify_answer_hashes,
+    VERIFY_CHUNK_SIZE,
+)
+
+
+class Command(BaseCommand):
+    help = "Recompute question and answer hashes and report mismatches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=VERIFY_CHUNK_SIZE)
+        parser.add_argument(
+            "--flag",
+            action="store_true",
+            help="Mark mismatched rows as not confirmed onchain.",
+        )
+
+    def handle(self, *args, **options):
+        kwargs = {"chunk_size": options["chunk_size"], "workers": options["workers"]}
+        for model, verify in (
+            (Question, verify_question_hashes),
+            (Answer, verify_answer_hashes),
+        ):
+            mismatched = verify(**kwargs)
+            self.stdout.write(
+                f"{len(mismatched)} mismatched {model._meta.verbose_name_plural}: {mismatched}"
+            )
+            if options["flag"] and mismatched:
+                model.objects.filter(pk__in=mismatched).update(confirmed_onchain=False)
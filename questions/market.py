@@ -0,0 +1,142 @@
+"""
+Bounty market statistics.
+
+``refresh_market_stats`` scans every question and answer once, rolls them up
+with pandas into overall figures and a time-bucketed series, and stores the
+result in the single MarketSnapshot row. ``market_stats`` serves that row
+together with the live BountyTotals, so the endpoint costs two primary key
+lookups however large the market gets. Run the refresh periodically with
+``python manage.py refresh_market_stats``.
+"""
+
+import datetime
+
+import pytz
+
+from questions.models import Question, Answer, BountyTotals, MarketSnapshot
+from questions.settings import MARKET_STATS_PERIOD, MARKET_STATS_BUCKETS
+
+
+def _bucketed(values, period):
+    # timezone-aware datetimes -> start of their period, as naive UTC
+    import pandas as pd
+
+    values = pd.to_datetime(values, utc=True).dt.tz_localize(None)
+    return values.dt.to_period(period).dt.start_time
+
+
+def refresh_market_stats(period=None, buckets=None):
+    """
+    Recompute the market rollups and store them in the MarketSnapshot row.
+
+    Args:
+        period: pandas offset alias for the series buckets. Defaults to
+            ``MARKET_STATS_PERIOD``
+        buckets: Number of most recent buckets to keep. Defaults to
+            ``MARKET_STATS_BUCKETS``
+
+    Returns:
+        MarketSnapshot: The refreshed snapshot
+    """
+    # pandas is only needed here, so keep it off the request path's imports
+    import pandas as pd
+
+    period = period or MARKET_STATS_PERIOD
+    buckets = buckets or MARKET_STATS_BUCKETS
+    now = datetime.datetime.now(pytz.UTC)
+
+    questions = pd.DataFrame.from_records(
+        (
+            (dt, int(bounty or 0), selected_dt)
+            for dt, bounty, selected_dt in Question.objects.values_list(
+                "post__dt", "bounty", "selected_dt"
+            ).iterator(chunk_size=2000)
+        ),
+        columns=["dt", "bounty", "selected_dt"],
+    )
+    answers = pd.DataFrame.from_records(
+        Answer.objects.values_list("post__dt").iterator(chunk_size=2000),
+        columns=["dt"],
+    )
+    # keep wei sums as exact Python ints
+    questions["bounty"] = questions["bounty"].astype(object)
+
+    selected = questions.dropna(subset=["selected_dt"]).copy()
+    selected["wait"] = (
+        pd.to_datetime(selected["selected_dt"], utc=True)
+        - pd.to_datetime(selected["dt"], utc=True)
+    ).dt.total_seconds()
+
+    index = pd.period_range(
+        end=pd.Timestamp(now).tz_localize(None).to_period(period), periods=buckets
+    ).start_time
+    asked = questions.groupby(_bucketed(questions["dt"], period))
+    series = pd.DataFrame(
+        {
+            "questions": asked.size(),
+            "bounty_posted": asked["bounty"].sum(),
+            "answers": answers.groupby(_bucketed(answers["dt"], period)).size(),
+            "selections": selected.groupby(
+                _bucketed(selected["selected_dt"], period)
+            ).size(),
+            "median_time_to_selection": selected.groupby(
+                _bucketed(selected["selected_dt"], period)
+            )["wait"].median(),
+        }
+    ).reindex(index)
+
+    snapshot = MarketSnapshot(
+        pk=1,
+        generated=now,
+        questions=len(questions),
+        answers=len(answers),
+        answers_per_question=(len(answers) / len(questions)) if len(questions) else None,
+        median_time_to_selection=(
+            float(selected["wait"].median()) if len(selected) else None
+        ),
+        period=period,
+        series=[
+            {
+                "start": start.isoformat(),
+                "questions": 0 if pd.isna(row.questions) else int(row.questions),
+                "answers": 0 if pd.isna(row.answers) else int(row.answers),
+                "selections": 0 if pd.isna(row.selections) else int(row.selections),
+                "bounty_posted": str(
+                    0 if pd.isna(row.bounty_posted) else row.bounty_posted
+                ),
+                "median_time_to_selection": (
+                    None
+                    if pd.isna(row.median_time_to_selection)
+                    else float(row.median_time_to_selection)
+                ),
+            }
+            for start, row in zip(series.index, series.itertuples())
+        ],
+    )
+    snapshot.save()
+    return snapshot
+
+
+def market_stats():
+    """
+    Return the market dashboard payload.
+
+    Bounty totals are the live BountyTotals; everything else comes from the
+    last MarketSnapshot, which is computed here if it doesn't exist yet.
+
+    Returns:
+        dict: The dashboard statistics
+    """
+    snapshot = MarketSnapshot.objects.filter(pk=1).first() or refresh_market_stats()
+    totals = BountyTotals.load()
+    return {
+        "open_bounty": str(totals.available),
+        "claimed_bounty": str(totals.claimed),
+        "questions": snapshot.questions,
+        "answers": snapshot.answers,
+        "answers_per_question": snapshot.answers_per_question,
+        "median_time_to_selection": snapshot.median_time_to_selection,
+        "generated": snapshot.generated,
+        "period": snapshot.period,
+        "series": snapshot.series,
+    }
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:39
+
+import django.core.validators
+import siweauth.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0008_answer_selection_confirmed_onchain'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='question',
+            name='chainId',
+            field=models.PositiveBigIntegerField(null=True),
+        ),
+        migrations.CreateModel(
+            name='Deployment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chainId', models.PositiveBigIntegerField()),
+                ('rpcUrl', models.CharField(max_length=500, verbose_name='RPC URL')),
+                ('contractAddress', models.CharField(max_length=42, validators=[django.core.validators.RegexValidator(regex='^0x[a-fA-F0-9]{40}$'), siweauth.models.validate_ethereum_address], verbose_name='Facthound Contract Address')),
+                ('allowedOwners', models.JSONField(default=list)),
+                ('active', models.BooleanField(default=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('chainId', 'contractAddress'), name='unique_deployment')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0009_deployment_question_chainid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='answer',
+            name='confirmed_block_hash',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='confirmed_block_number',
+            field=models.PositiveBigIntegerField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='selection_block_hash',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='answer',
+            name='selection_block_number',
+            field=models.PositiveBigIntegerField(db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='confirmed_block_hash',
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='confirmed_block_number',
+            field=models.PositiveBigIntegerField(db_index=True, null=True),
+        ),
+    ]
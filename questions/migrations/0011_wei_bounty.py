@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:49
+
+import questions.fields
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def backfill_bounties(apps, schema_editor):
+    # rewrite existing bounties in the new storage format, then fill in the
+    # precomputed totals
+    Thread = apps.get_model("questions", "Thread")
+    Question = apps.get_model("questions", "Question")
+    BountyTotals = apps.get_model("questions", "BountyTotals")
+    for pk, bounty in Question.objects.filter(bounty__isnull=False).values_list(
+        "pk", "bounty"
+    ):
+        Question.objects.filter(pk=pk).update(bounty=bounty)
+    sums = {
+        "available": questions.fields.WeiSum("bounty", filter=Q(status="OP")),
+        "claimed": questions.fields.WeiSum(
+            "bounty", filter=Q(status__in=["AS", "RS"])
+        ),
+    }
+    for row in Question.objects.values("post__thread").annotate(**sums):
+        Thread.objects.filter(pk=row["post__thread"]).update(
+            total_bounty_available=row["available"] or 0,
+            total_bounty_claimed=row["claimed"] or 0,
+        )
+    overall = Question.objects.aggregate(**sums)
+    BountyTotals.objects.update_or_create(
+        pk=1,
+        defaults={
+            "available": overall["available"] or 0,
+            "claimed": overall["claimed"] or 0,
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0010_confirmation_blocks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BountyTotals',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('available', questions.fields.WeiField(default=0)),
+                ('claimed', questions.fields.WeiField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'bounty totals',
+            },
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='total_bounty_available',
+            field=questions.fields.WeiField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='total_bounty_claimed',
+            field=questions.fields.WeiField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='bounty',
+            field=questions.fields.WeiField(null=True),
+        ),
+        migrations.RunPython(backfill_bounties, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0011_wei_bounty'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('generated', models.DateTimeField()),
+                ('questions', models.PositiveIntegerField(default=0)),
+                ('answers', models.PositiveIntegerField(default=0)),
+                ('answers_per_question', models.FloatField(null=True)),
+                ('median_time_to_selection', models.FloatField(null=True)),
+                ('period', models.CharField(max_length=10)),
+                ('series', models.JSONField(default=list)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='selected_dt',
+            field=models.DateTimeField(null=True),
+        ),
+    ]
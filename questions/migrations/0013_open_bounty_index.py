@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0012_market_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(condition=models.Q(('bounty__isnull', False), ('status', 'OP')), fields=['-bounty', '-id'], name='open_bounty_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:56
+
+import questions.fields
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_tag_totals(apps, schema_editor):
+    Tag = apps.get_model("questions", "Tag")
+    for row in Tag.objects.values("pk").annotate(
+        count=Count("thread"),
+        bounty=questions.fields.WeiSum("thread__total_bounty_available"),
+    ):
+        Tag.objects.filter(pk=row["pk"]).update(
+            thread_count=row["count"], open_bounty=row["bounty"] or 0
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0013_open_bounty_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='open_bounty',
+            field=questions.fields.WeiField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='thread_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-thread_count', 'name'], name='tag_directory_idx'),
+        ),
+        migrations.RunPython(backfill_tag_totals, migrations.RunPython.noop),
+    ]
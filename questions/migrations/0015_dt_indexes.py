@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('questions', '0014_tag_directory'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='dt',
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='thread',
+            name='dt',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
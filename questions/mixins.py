@@ -0,0 +1,173 @@
+"""
+Query parameter handling and list serialization shared by the questions
+app's CRUD viewsets.
+"""
+
+import base64
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+
+class FilterFieldsMixin:
+    """
+    Filter a viewset's queryset by whitelisted query parameters.
+
+    ``filter_fields`` maps a query parameter to the ORM lookup it filters on,
+    e.g. ``{"thread": "post__thread"}``. The lookups are applied through a
+    ``pk__in`` subquery so a lookup across a many-to-many relation cannot
+    return a row twice and break cursor paging.
+    """
+
+    filter_fields = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        lookups = {
+            lookup: params[param]
+            for param, lookup in self.filter_fields.items()
+            if param in params
+        }
+        if not lookups:
+            return queryset
+        try:
+            matches = queryset.model._default_manager.filter(**lookups)
+            return queryset.filter(pk__in=matches.values("pk"))
+        except (ValueError, DjangoValidationError):
+            raise ValidationError({"message": "Invalid filter value."})
+
+
+class SparseFieldsMixin:
+    """
+    Honor a ``fields=a,b,c`` query parameter on reads.
+
+    Only the requested concrete columns (plus the primary key and the cursor
+    ordering fields) are loaded with ``.only()``, and the list is passed to the
+    serializer in its context so it drops the other fields from its output
+    (see questions.serializers.SparseFieldsSerializerMixin). Writes ignore the
+    parameter.
+    """
+
+    def requested_fields(self):
+        """
+        Return the requested field names, or None if all fields are wanted.
+        """
+        if self.request.method not in SAFE_METHODS:
+            return None
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return None
+        return [f.strip() for f in fields.split(",") if f.strip()]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        requested = self.requested_fields()
+        if requested is None:
+            return queryset
+        model_fields = {
+            f.name: f for f in queryset.model._meta.get_fields() if f.concrete
+        }
+        unknown = [f for f in requested if f not in model_fields]
+        if unknown:
+            raise ValidationError({"message": f"Unknown fields: {', '.join(unknown)}."})
+        ordering = getattr(self, "cursor_ordering", "-pk")
+        ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+        columns = {
+            name
+            for name in requested
+            if not model_fields[name].many_to_many
+        } | {o.lstrip("-") for o in ordering if o.lstrip("-") != "pk"}
+        # only prefetch the many-to-many fields that were asked for
+        many = [name for name in requested if model_fields[name].many_to_many]
+        return queryset.prefetch_related(None).prefetch_related(*many).only(
+            "pk", *columns
+        )
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.requested_fields()
+        return context
+
+
+def _base64(value):
+    # what DRF's ModelField renders for a BinaryField
+    return None if value is None else base64.b64encode(bytes(value)).decode("ascii")
+
+
+class ValuesListMixin:
+    """
+    Serve list responses from ``.values()`` rows instead of model instances.
+
+    Fields that render their raw column value (ids, strings, numbers,
+    booleans, foreign key ids) are copied as is; dates and decimals go through
+    their serializer field's ``to_representation`` and binary fields are
+    base64 encoded, so the output matches the serializer's. Serializers with
+    any other kind of field, such as many-to-many relations, fall back to the
+    regular list.
+    """
+
+    _PASSTHROUGH = (
+        serializers.IntegerField,
+        serializers.CharField,
+        serializers.BooleanField,
+        serializers.FloatField,
+        serializers.ChoiceField,
+        serializers.ReadOnlyField,
+        serializers.PrimaryKeyRelatedField,
+    )
+    _CONVERTED = (
+        serializers.DateTimeField,
+        serializers.DateField,
+        serializers.DecimalField,
+    )
+
+    def _values_plan(self, serializer):
+        # [(key, column, converter or None)], or None if unsupported
+        plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, self._PASSTHROUGH):
+                plan.append((name, field.source, None))
+            elif isinstance(field, self._CONVERTED):
+                plan.append((name, field.source, field.to_representation))
+            elif isinstance(field, serializers.ModelField) and isinstance(
+                field.model_field, models.BinaryField
+            ):
+                plan.append((name, field.source, _base64))
+            else:
+                return None
+        return plan
+
+    def list(self, request, *args, **kwargs):
+        plan = self._values_plan(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        ordering = getattr(self, "cursor_ordering", "-pk")
+        ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+        columns = {column for _, column, _ in plan} | {o.lstrip("-") for o in ordering}
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .prefetch_related(None)
+            .values(*columns)
+        )
+        page = self.paginate_queryset(rows)
+        data = [
+            {
+                key: (
+                    row[column]
+                    if convert is None or row[column] is None
+                    else convert(row[column])
+                )
+                for key, column, convert in plan
+            }
+            for row in (page if page is not None else rows)
+        ]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
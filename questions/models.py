@@ -15,6 +15,7 @@ from django.contrib.auth.models import BaseUserManager, AbstractBaseUser
 from web3 import Web3
 
 from siweauth.models import validate_ethereum_address, User
+from questions.fields import WeiField
 
 
 class Thread(models.Model):
@@ -25,7 +26,10 @@ class Thread(models.Model):
     Threads have a topic and can be tagged for categorization.
     """
     topic = models.CharField(max_length=1000)
-    dt = models.DateTimeField()
+    dt = models.DateTimeField(db_index=True)
+    # bounty totals over the thread's questions, kept current by questions.bounties
+    total_bounty_available = WeiField(default=0, editable=False)
+    total_bounty_claimed = WeiField(default=0, editable=False)
 
     def __str__(self):
         return self.topic
@@ -39,7 +43,7 @@ class Post(models.Model):
     """
     thread = models.ForeignKey(Thread, on_delete=models.CASCADE)
     text = models.TextField()
-    dt = models.DateTimeField()
+    dt = models.DateTimeField(db_index=True)
     poster = models.ForeignKey(User, on_delete=models.CASCADE)
 
     def __str__(self):
@@ -64,8 +68,9 @@ class Question(models.Model):
             validate_ethereum_address,
         ],
     )
+    chainId = models.PositiveBigIntegerField(null=True)
     asker = models.ForeignKey(User, on_delete=models.CASCADE)
-    bounty = models.IntegerField(null=True)  # units of wei
+    bounty = WeiField(null=True)  # units of wei
     status = models.CharField(
         choices=[
             ("OP", "Open"),
@@ -76,11 +81,137 @@ class Question(models.Model):
         max_length=100,
     )
     confirmed_onchain = models.BooleanField(null=True)
+    # block the confirmation was read at, for reorg re-verification
+    confirmed_block_number = models.PositiveBigIntegerField(null=True, db_index=True)
+    confirmed_block_hash = models.BinaryField(null=True)
+    # when an answer was first selected, for time-to-selection stats
+    selected_dt = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # the open bounty feed, ordered by bounty. only open questions
+            # are indexed, so resolved questions don't grow it
+            models.Index(
+                fields=["-bounty", "-id"],
+                name="open_bounty_idx",
+                condition=models.Q(status="OP", bounty__isnull=False),
+            )
+        ]
 
     def __str__(self):
         return f"{self.post.thread.topic}: {self.asker}'s question {self.id}"
 
 
+class BountyTotals(models.Model):
+    """
+    Site-wide bounty totals, a single row kept current by questions.bounties.
+
+    Use ``BountyTotals.load()`` to read it.
+    """
+    available = WeiField(default=0)
+    claimed = WeiField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "bounty totals"
+
+    @classmethod
+    def load(cls):
+        """
+        Return the totals row, creating it if needed.
+        """
+        totals, _ = cls.objects.get_or_create(pk=1)
+        return totals
+
+    def __str__(self):
+        return f"{self.available} wei available, {self.claimed} wei claimed"
+
+
+class MarketSnapshot(models.Model):
+    """
+    Precomputed bounty market statistics, a single row refreshed by
+    questions.market.
+
+    Holds the rollups that need a scan of every question and answer, so the
+    market endpoint serves them without touching those tables.
+    """
+    generated = models.DateTimeField()
+    questions = models.PositiveIntegerField(default=0)
+    answers = models.PositiveIntegerField(default=0)
+    answers_per_question = models.FloatField(null=True)
+    median_time_to_selection = models.FloatField(null=True)  # seconds
+    period = models.CharField(max_length=10)
+    series = models.JSONField(default=list)
+
+    def __str__(self):
+        return f"market snapshot {self.generated}"
+
+
+class DeploymentManager(models.Manager):
+    """
+    Manager for the Deployment registry.
+    """
+
+    def resolve(self, contractAddress, chainId=None):
+        """
+        Find the active registered deployment for a contract address.
+
+        Args:
+            contractAddress: The FactHound contract address
+            chainId: Optional chain id, needed only if the address is
+                deployed on several chains
+
+        Returns:
+            Deployment: The matching deployment, or None if unregistered
+        """
+        return self._candidates(contractAddress, chainId).first()
+
+    async def aresolve(self, contractAddress, chainId=None):
+        """
+        Async variant of ``resolve``.
+        """
+        return await self._candidates(contractAddress, chainId).afirst()
+
+    def _candidates(self, contractAddress, chainId):
+        deployments = self.filter(contractAddress=contractAddress, active=True)
+        if chainId is not None:
+            deployments = deployments.filter(chainId=chainId)
+        return deployments.order_by("pk")
+
+
+class Deployment(models.Model):
+    """
+    A FactHound contract deployment on a specific chain.
+
+    The registry tells the backend which RPC endpoint to use for a contract and
+    which owners it trusts, so bounties can run on several chains at once. Each
+    chain gets its own pooled client (see facthound.chain).
+    """
+    chainId = models.PositiveBigIntegerField()
+    rpcUrl = models.CharField(verbose_name="RPC URL", max_length=500)
+    contractAddress = models.CharField(
+        verbose_name="Facthound Contract Address",
+        max_length=42,
+        validators=[
+            RegexValidator(regex=r"^0x[a-fA-F0-9]{40}$"),
+            validate_ethereum_address,
+        ],
+    )
+    allowedOwners = models.JSONField(default=list)
+    active = models.BooleanField(default=True)
+    objects = DeploymentManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chainId", "contractAddress"], name="unique_deployment"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.contractAddress} on chain {self.chainId}"
+
+
 class Answer(models.Model):
     """
     An answer is a response to a question.
@@ -103,6 +234,11 @@ class Answer(models.Model):
     )
     confirmed_onchain = models.BooleanField(null=True)
     selection_confirmed_onchain = models.BooleanField(null=True)
+    # blocks the confirmations were read at, for reorg re-verification
+    confirmed_block_number = models.PositiveBigIntegerField(null=True, db_index=True)
+    confirmed_block_hash = models.BinaryField(null=True)
+    selection_block_number = models.PositiveBigIntegerField(null=True, db_index=True)
+    selection_block_hash = models.BinaryField(null=True)
 
     def __str__(self):
         return f"{self.post.thread.topic}: {self.answerer}'s answer {self.id}"
@@ -116,6 +252,12 @@ class Tag(models.Model):
     """
     name = models.CharField(max_length=100)
     thread = models.ManyToManyField(Thread)
+    # directory stats over the tagged threads, kept current by questions.tags
+    thread_count = models.PositiveIntegerField(default=0, editable=False)
+    open_bounty = WeiField(default=0, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["-thread_count", "name"], name="tag_directory_idx")]
 
     def __str__(self):
         return self.name
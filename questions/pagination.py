@@ -0,0 +1,26 @@
+"""
+Pagination for the questions app's CRUD viewsets.
+"""
+
+from rest_framework import pagination
+
+from questions.settings import API_PAGE_SIZE, API_MAX_PAGE_SIZE
+
+
+class CursorPagination(pagination.CursorPagination):
+    """
+    Cursor pagination with a client-selectable page size.
+
+    Viewsets choose the ordering with a ``cursor_ordering`` attribute; it
+    should lead with an indexed, rarely changing field so page boundaries
+    stay stable and cheap.
+    """
+
+    page_size = API_PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = API_MAX_PAGE_SIZE
+    ordering = "-pk"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", self.ordering)
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
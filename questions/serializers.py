@@ -1,7 +1,26 @@
 from rest_framework import serializers
 from questions.models import Thread, Post, Question, Answer, Tag
 
-class ThreadSerializer(serializers.ModelSerializer):
+
+class SparseFieldsSerializerMixin:
+    """
+    Drop fields not listed in the serializer context's ``fields``.
+
+    The viewsets put the ``fields=a,b,c`` query parameter there for reads only
+    (see questions.mixins.SparseFieldsMixin), so writes always validate and
+    save every field.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        if fields:
+            keep = set(fields) | {"id"}
+            for name in set(self.fields) - keep:
+                self.fields.pop(name)
+
+
+class ThreadSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Thread
         fields = '__all__'
@@ -10,7 +29,7 @@ class ThreadSerializer(serializers.ModelSerializer):
         # Add custom logic here, e.g., setting default values
         return Thread.objects.create(**validated_data)
     
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = '__all__'
@@ -19,7 +38,7 @@ class PostSerializer(serializers.ModelSerializer):
         # Add custom logic here, e.g., setting default values
         return Post.objects.create(**validated_data)
     
-class QuestionSerializer(serializers.ModelSerializer):
+class QuestionSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Question
         fields = '__all__'
@@ -28,7 +47,7 @@ class QuestionSerializer(serializers.ModelSerializer):
         # Add custom logic here, e.g., setting default values
         return Question.objects.create(**validated_data)
     
-class AnswerSerializer(serializers.ModelSerializer):
+class AnswerSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Answer
         fields = '__all__'
@@ -37,7 +56,7 @@ class AnswerSerializer(serializers.ModelSerializer):
         # Add custom logic here, e.g., setting default values
         return Answer.objects.create(**validated_data)
     
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = '__all__'
@@ -1,4 +1,36 @@
 from django.conf import settings
 
-# SIWE message validity window in minutes
+# Trusted FactHound contract owners for contracts not registered as a Deployment
 allowed_owners = ["0x27a3E9624B31C0b2D6841761A0e8f285B32977bb"]
+
+# Blocks behind the chain head after which a confirmation is considered final.
+# Confirmations recorded within this window are re-checked for reorgs.
+CONFIRMATION_DEPTH = getattr(settings, "CONFIRMATION_DEPTH", 64)
+
+# Bucket size of the market stats series, as a pandas offset alias (e.g. "D", "W")
+MARKET_STATS_PERIOD = getattr(settings, "MARKET_STATS_PERIOD", "D")
+
+# Number of most recent buckets kept in the market stats series
+MARKET_STATS_BUCKETS = getattr(settings, "MARKET_STATS_BUCKETS", 90)
+
+# Default and maximum page sizes of the open bounty feed
+OPEN_BOUNTIES_PAGE_SIZE = getattr(settings, "OPEN_BOUNTIES_PAGE_SIZE", 20)
+OPEN_BOUNTIES_MAX_PAGE_SIZE = getattr(settings, "OPEN_BOUNTIES_MAX_PAGE_SIZE", 100)
+
+# Default and maximum page sizes of the threads-by-tag listing
+THREADS_BY_TAG_PAGE_SIZE = getattr(settings, "THREADS_BY_TAG_PAGE_SIZE", 20)
+THREADS_BY_TAG_MAX_PAGE_SIZE = getattr(settings, "THREADS_BY_TAG_MAX_PAGE_SIZE", 100)
+
+# Seconds between incremental refreshes of the in-memory autocomplete index
+AUTOCOMPLETE_REFRESH = getattr(settings, "AUTOCOMPLETE_REFRESH", 30)
+
+# Seconds between full rebuilds of the autocomplete index
+AUTOCOMPLETE_REBUILD = getattr(settings, "AUTOCOMPLETE_REBUILD", 3600)
+
+# Default and maximum number of autocomplete suggestions of each kind
+AUTOCOMPLETE_LIMIT = getattr(settings, "AUTOCOMPLETE_LIMIT", 10)
+AUTOCOMPLETE_MAX_LIMIT = getattr(settings, "AUTOCOMPLETE_MAX_LIMIT", 50)
+
+# Default and maximum page sizes of the CRUD viewsets
+API_PAGE_SIZE = getattr(settings, "API_PAGE_SIZE", 50)
+API_MAX_PAGE_SIZE = getattr(settings, "API_MAX_PAGE_SIZE", 500)
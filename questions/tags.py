@@ -0,0 +1,104 @@
+"""
+Precomputed tag directory stats.
+
+Each Tag carries the number of threads it's on and the open bounty total of
+those threads. Both are adjusted incrementally: when a tag is added to or
+removed from a thread, when a tagged thread's open bounty changes (see
+questions.bounties) and when a tagged thread is deleted. Run
+``rebuild_tag_totals`` after bulk changes that bypass model signals.
+"""
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, pre_delete
+from django.dispatch import receiver
+
+from questions.fields import WeiSum
+from questions.models import Thread, Tag
+
+TagThread = Tag.thread.through
+
+
+def adjust_tags(tag_ids, threads=0, bounty=0):
+    """
+    Move the stats of the given tags by a delta.
+
+    Args:
+        tag_ids: Primary keys of the tags to adjust
+        threads: Change in thread count
+        bounty: Change in open bounty, in wei
+    """
+    tag_ids = list(tag_ids)
+    if not tag_ids or not (threads or bounty):
+        return
+    with transaction.atomic():
+        # the bounty is adjusted in Python, since WeiField isn't numeric on
+        # every backend
+        for tag in Tag.objects.select_for_update().filter(pk__in=tag_ids):
+            tag.thread_count += threads
+            tag.open_bounty = int(tag.open_bounty) + bounty
+            tag.save(update_fields=["thread_count", "open_bounty"])
+
+
+def rebuild_tag_totals():
+    """
+    Recompute every tag's stats from the tagged threads.
+    """
+    with transaction.atomic():
+        stats = {
+            row["pk"]: row
+            for row in Tag.objects.values("pk").annotate(
+                count=Count("thread"), bounty=WeiSum("thread__total_bounty_available")
+            )
+        }
+        tags = list(Tag.objects.select_for_update())
+        for tag in tags:
+            tag.thread_count = stats[tag.pk]["count"]
+            tag.open_bounty = stats[tag.pk]["bounty"] or 0
+        Tag.objects.bulk_update(tags, ["thread_count", "open_bounty"], batch_size=1000)
+
+
+def _open_bounty(thread_id):
+    bounty = (
+        Thread.objects.filter(pk=thread_id)
+        .values_list("total_bounty_available", flat=True)
+        .first()
+    )
+    return int(bounty or 0)
+
+
+@receiver(m2m_changed, sender=TagThread)
+def _tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # forward: tag.thread.add(threads); reverse: thread.tag_set.add(tags)
+    if action == "pre_clear":
+        # pk_set isn't given for clears, so remember what is about to go
+        if reverse:
+            instance._cleared_pks = set(instance.tag_set.values_list("pk", flat=True))
+        else:
+            instance._cleared_pks = set(instance.thread.values_list("pk", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = getattr(instance, "_cleared_pks", set())
+        action = "post_remove"
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+    sign = 1 if action == "post_add" else -1
+    # read bounties from the database, the instances may predate them
+    if reverse:
+        adjust_tags(pk_set, threads=sign, bounty=sign * _open_bounty(instance.pk))
+    else:
+        for thread_id, bounty in Thread.objects.filter(pk__in=pk_set).values_list(
+            "pk", "total_bounty_available"
+        ):
+            adjust_tags([instance.pk], threads=sign, bounty=sign * int(bounty))
+
+
+@receiver(pre_delete, sender=Thread)
+def _thread_deleted(sender, instance, **kwargs):
+    # the tag links are removed without m2m signals, so take the thread out
+    # of its tags' stats now
+    adjust_tags(
+        TagThread.objects.filter(thread_id=instance.pk).values_list("tag_id", flat=True),
+        threads=-1,
+        bounty=-_open_bounty(instance.pk),
+    )
@@ -0,0 +1,38 @@
+from django.test import TestCase
+from django.test import RequestFactory
+
+import datetime, pytz
+
+from siweauth.models import User
+
+from questions.models import Thread, Post, Question
+
+
+class BountyTestCase(TestCase):
+    """
+    Shared fixture for the bounty tests: one user, ``thread_count`` threads
+    and an ``ask`` factory for questions with a bounty.
+    """
+
+    thread_count = 2
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user_address(
+            "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+        )
+        self.threads = [
+            Thread.objects.create(topic=f"topic {i}", dt=datetime.datetime.now(pytz.UTC))
+            for i in range(self.thread_count)
+        ]
+
+    def ask(self, thread, bounty, status="OP"):
+        post = Post.objects.create(
+            thread=thread,
+            text="question",
+            dt=datetime.datetime.now(pytz.UTC),
+            poster=self.user,
+        )
+        return Question.objects.create(
+            post=post, asker=self.user, bounty=bounty, status=status
+        )
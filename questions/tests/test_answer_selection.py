@@ -9,6 +9,7 @@ from web3 import (
 )
 import json, datetime, pytz, logging
 
+from facthound import chain
 from siweauth.models import User
 
 from questions import views
@@ -27,14 +28,13 @@ logging.disable(logging.CRITICAL)
 
 class TestSelectionSansContracts(TestCase):
     def setUp(self):
-        # change views's w3 provider to this test provider
+        # point the shared chain client at this test provider
         provider = EthereumTesterProvider()
         self.w3 = Web3(provider)
-        views.w3 = self.w3
-        confirm_onchain.w3 = self.w3
+        chain.set_web3(self.w3)
+        self.addCleanup(chain.set_web3, None)
 
-        with open("contracts/FactHound.json", "rb") as f:
-            facthound_contract = json.load(f)
+        facthound_contract = chain.get_facthound_contract()
         #
         self.factory = RequestFactory()
         #
@@ -87,6 +87,7 @@ class TestSelectionSansContracts(TestCase):
         question = Question.objects.get(pk=content["question"])
         answer = Answer.objects.get(pk=content["answer"])
         self.assertEqual(question.status, "AS")
+        self.assertIsNotNone(question.selected_dt)
         self.assertEqual(answer.status, "SE")
         self.assertEqual(question.answer_set.filter(status="SE").first(), answer)
 
@@ -154,14 +155,13 @@ class TestSelectionSansContracts(TestCase):
 
 class TestSelectionWithContracts(TestCase):
     def setUp(self):
-        # change views's w3 provider to this test provider
+        # point the shared chain client at this test provider
         provider = EthereumTesterProvider()
         self.w3 = Web3(provider)
-        views.w3 = self.w3
-        confirm_onchain.w3 = self.w3
+        chain.set_web3(self.w3)
+        self.addCleanup(chain.set_web3, None)
 
-        with open("contracts/FactHound.json", "rb") as f:
-            facthound_contract = json.load(f)
+        facthound_contract = chain.get_facthound_contract()
         self.factory = RequestFactory()
 
         # Setup accounts
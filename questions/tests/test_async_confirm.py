@@ -0,0 +1,184 @@
+from django.test import TestCase
+from django.test import AsyncRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from web3 import (
+    AsyncWeb3,
+    EthereumTesterProvider,
+    Web3,
+)
+from web3.providers.eth_tester import AsyncEthereumTesterProvider
+import json, datetime, pytz, logging
+
+from facthound import chain
+from siweauth.models import User
+
+from questions import views
+from questions import confirm_onchain
+from questions.models import Thread, Post, Question, Answer
+
+logging.disable(logging.CRITICAL)
+
+
+class TestAsyncConfirm(TestCase):
+    def setUp(self):
+        # point the shared sync and async chain clients at one test chain
+        provider = EthereumTesterProvider()
+        self.w3 = Web3(provider)
+        async_provider = AsyncEthereumTesterProvider()
+        async_provider.ethereum_tester = provider.ethereum_tester
+        chain.set_web3(self.w3)
+        chain.set_async_web3(AsyncWeb3(async_provider))
+        self.addCleanup(chain.set_web3, None)
+        self.addCleanup(chain.set_async_web3, None)
+
+        facthound_contract = chain.get_facthound_contract()
+        self.factory = AsyncRequestFactory()
+
+        # Setup accounts
+        self.eth_tester = provider.ethereum_tester
+        self.owner = self.eth_tester.get_accounts()[0]
+        self.asker = self.eth_tester.get_accounts()[2]
+        self.answerer = self.eth_tester.get_accounts()[3]
+        self.asker_user = User.objects.create_user_address(self.asker)
+        self.answerer_user = User.objects.create_user_address(self.answerer)
+        self.token = str(RefreshToken.for_user(self.asker_user).access_token)
+        confirm_onchain.allowed_owners.append(self.owner)
+        self.addCleanup(confirm_onchain.allowed_owners.remove, self.owner)
+
+        # Deploy contract
+        abi = facthound_contract["abi"]
+        bytecode = facthound_contract["bytecode"]["object"]
+        Contract = self.w3.eth.contract(abi=abi, bytecode=bytecode)
+        tx_hash = Contract.constructor(100).transact({"from": self.owner})
+        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        self.contract_address = tx_receipt["contractAddress"]
+        self.contract = self.w3.eth.contract(
+            address=self.contract_address, abi=abi, decode_tuples=True
+        )
+
+        # Create question and answer in contract and database
+        question_text = "I am wondering what to do about this topic."
+        answer_text = "You should do everything."
+        self.question_hash = Web3.solidity_keccak(
+            ["address", "string"], [self.asker, question_text]
+        )
+        self.answer_hash = Web3.solidity_keccak(
+            ["address", "string"], [self.answerer, answer_text]
+        )
+        self.contract.functions.createQuestion(self.question_hash).transact(
+            {"from": self.asker, "value": 1000000}
+        )
+        self.contract.functions.createAnswer(
+            self.question_hash, self.answer_hash
+        ).transact({"from": self.answerer})
+
+        self.thread = Thread.objects.create(
+            topic="nothing of import", dt=datetime.datetime.now(pytz.UTC)
+        )
+        qp = Post.objects.create(
+            thread=self.thread,
+            text=question_text,
+            dt=datetime.datetime.now(tz=pytz.UTC),
+            poster=self.asker_user,
+        )
+        self.question = Question.objects.create(
+            questionHash=self.question_hash,
+            contractAddress=self.contract_address,
+            post=qp,
+            asker=self.asker_user,
+            status="OP",
+            confirmed_onchain=False,
+        )
+        ap = Post.objects.create(
+            thread=self.thread,
+            text=answer_text,
+            dt=datetime.datetime.now(tz=pytz.UTC),
+            poster=self.answerer_user,
+        )
+        self.answer = Answer.objects.create(
+            answerHash=self.answer_hash,
+            question=self.question,
+            post=ap,
+            answerer=self.answerer_user,
+            status="UN",
+            confirmed_onchain=False,
+        )
+
+    async def _confirm(self, confirm_dict, token=None):
+        request = self.factory.post(
+            "/api/aconfirm/",
+            data=confirm_dict,
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token or self.token}"},
+        )
+        response = await views.aconfirm(request)
+        return response.status_code, json.loads(response.content)
+
+    async def test_confirm_question(self):
+        status, content = await self._confirm(
+            {"questionHash": self.question_hash.hex(), "confirmType": "question"}
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(content["thread"], self.thread.pk)
+        question = await Question.objects.aget(pk=self.question.pk)
+        self.assertTrue(question.confirmed_onchain)
+        self.assertEqual(question.bounty, 990000)
+        self.assertEqual(question.status, "OP")
+
+    async def test_confirm_answer(self):
+        status, content = await self._confirm(
+            {
+                "questionHash": self.question_hash.hex(),
+                "answerHash": self.answer_hash.hex(),
+                "confirmType": "answer",
+            }
+        )
+        self.assertEqual(status, 200)
+        answer = await Answer.objects.aget(pk=self.answer.pk)
+        self.assertTrue(answer.confirmed_onchain)
+
+    async def test_confirm_selection(self):
+        confirm_dict = {
+            "questionHash": self.question_hash.hex(),
+            "answerHash": self.answer_hash.hex(),
+            "confirmType": "selection",
+        }
+        status, content = await self._confirm(confirm_dict)
+        self.assertEqual(status, 400)
+        self.assertEqual(
+            content["message"],
+            f"This answer must be selected in the contract at address {self.contract_address}.",
+        )
+        self.contract.functions.selectAnswer(
+            self.question_hash, self.answer_hash
+        ).transact({"from": self.asker})
+        status, content = await self._confirm(confirm_dict)
+        self.assertEqual(status, 200)
+        answer = await Answer.objects.aget(pk=self.answer.pk)
+        self.assertTrue(answer.selection_confirmed_onchain)
+
+    async def test_requires_authentication(self):
+        request = self.factory.post(
+            "/api/aconfirm/",
+            data={"questionHash": self.question_hash.hex(), "confirmType": "question"},
+            content_type="application/json",
+        )
+        response = await views.aconfirm(request)
+        self.assertEqual(response.status_code, 401)
+        status, content = await self._confirm(
+            {"questionHash": self.question_hash.hex(), "confirmType": "question"},
+            token="notatoken",
+        )
+        self.assertEqual(status, 401)
+
+    async def test_malformed_body(self):
+        for body in [b"{not json", b"[1, 2]"]:
+            request = self.factory.post(
+                "/api/aconfirm/",
+                data=body,
+                content_type="application/json",
+                headers={"Authorization": f"Bearer {self.token}"},
+            )
+            response = await views.aconfirm(request)
+            self.assertEqual(response.status_code, 400)
@@ -0,0 +1,128 @@
+from django.test import TestCase
+from django.test import RequestFactory
+
+import json, datetime, pytz, logging
+from unittest import mock
+
+from questions import views
+from questions import autocomplete
+from questions.autocomplete import PrefixIndex, get_autocomplete
+from questions.models import Thread, Tag
+
+logging.disable(logging.CRITICAL)
+
+
+class TestPrefixIndex(TestCase):
+    def test_prefix_and_ranking(self):
+        index = PrefixIndex()
+        for pk, (name, weight) in enumerate(
+            [("bitcoin", 3), ("bitcoin-cash", 9), ("bit", 1), ("ethereum", 5)]
+        ):
+            index.add(pk, name, weight)
+        self.assertEqual(index.search("BIT", 2), [1, 0])
+        self.assertEqual(index.search("bitcoin", 10), [1, 0])
+        self.assertEqual(index.search("x", 10), [])
+        index.remove(1)
+        self.assertEqual(index.search("bit", 10), [0, 2])
+
+    def test_word_starts(self):
+        index = PrefixIndex(word_starts=True)
+        index.add(1, "What is Bitcoin mining?", 1)
+        index.add(2, "Bitcoin fees", 2)
+        self.assertEqual(index.search("bitcoin", 10), [2, 1])
+        self.assertEqual(index.search("min", 10), [1])
+        # a new label replaces the old keys
+        index.add(1, "Ethereum staking", 1)
+        self.assertEqual(index.search("min", 10), [])
+        self.assertEqual(index.search("stak", 10), [1])
+
+
+    def test_long_labels(self):
+        index = PrefixIndex(word_starts=True)
+        topic = " ".join(f"word{i:04d}" for i in range(100))
+        index.add(1, topic, 1)
+        self.assertTrue(all(len(key) <= autocomplete.KEY_LENGTH for key in index._keys[1]))
+        # prefixes past the key length are checked against the label
+        self.assertEqual(index.search(topic[90:150], 10), [1])
+        self.assertEqual(index.search(topic[90:149] + "x", 10), [])
+
+    def test_top_lists_kept_current(self):
+        index = PrefixIndex(top_k=2)
+        index.load([(1, "bit", 1), (2, "bitcoin", 2), (3, "bitmex", 3)])
+        self.assertEqual(index._top["bi"], [(3, 3), (2, 2)])
+        self.assertEqual(index.search("bitc", 2), [2])
+        index.add(4, "bitcoin-cash", 9)
+        self.assertEqual(index.search("bi", 2), [4, 3])
+        self.assertEqual(index.search("bitc", 2), [4, 2])
+        index.remove(4)
+        self.assertEqual(index.search("bi", 2), [3, 2])
+        self.assertEqual(index.search("bitc", 2), [2])
+        # a new weight moves an id
+        index.add(1, "bit", 5)
+        self.assertEqual(index.search("b", 2), [1, 3])
+
+
+class TestAutocomplete(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        now = datetime.datetime.now(pytz.UTC)
+        self.threads = [
+            Thread.objects.create(topic=topic, dt=now)
+            for topic in ["Bitcoin halving", "Ethereum gas", "Is bitcoin money?"]
+        ]
+        Tag.objects.create(name="bitcoin").thread.add(*self.threads[::2])
+        Tag.objects.create(name="bitcoin-cash")
+        get_autocomplete().refresh(force=True)
+
+    def get(self, **params):
+        request = self.factory.get("/api/autocomplete/", params)
+        return json.loads(views.autocomplete(request).content)
+
+    def test_suggestions(self):
+        content = self.get(q="bit")
+        self.assertEqual(
+            content["tags"],
+            [
+                {"name": "bitcoin", "thread_count": 2},
+                {"name": "bitcoin-cash", "thread_count": 0},
+            ],
+        )
+        self.assertEqual(
+            [t["id"] for t in content["topics"]],
+            [self.threads[2].pk, self.threads[0].pk],
+        )
+
+    def test_updates_without_refresh(self):
+        with self.assertNumQueries(0):
+            self.get(q="eth")
+        thread = Thread.objects.create(
+            topic="Ethereum staking", dt=datetime.datetime.now(pytz.UTC)
+        )
+        self.assertEqual(self.get(q="staking")["topics"][0]["id"], thread.pk)
+        self.threads[1].delete()
+        self.assertEqual([t["id"] for t in self.get(q="eth")["topics"]], [thread.pk])
+
+    def test_incremental_refresh(self):
+        # rows written by another process arrive without signals
+        Thread.objects.bulk_create(
+            [Thread(topic="Solana outages", dt=datetime.datetime.now(pytz.UTC))]
+        )
+        self.assertEqual(self.get(q="sol")["topics"], [])
+        get_autocomplete()._refreshed -= autocomplete.AUTOCOMPLETE_REFRESH + 1
+        self.assertEqual(len(self.get(q="sol")["topics"]), 1)
+
+    def test_limit(self):
+        self.assertEqual(len(self.get(q="b", limit=1)["tags"]), 1)
+        self.assertEqual(self.get(q="")["tags"], [])
+
+    def test_refresh_reads_outside_lookup_lock(self):
+        suggestions = get_autocomplete()
+        rows = suggestions._topic_rows
+
+        def topic_rows(*args):
+            self.assertFalse(suggestions._lock.locked())
+            return rows(*args)
+
+        with mock.patch.object(suggestions, "_topic_rows", topic_rows):
+            suggestions.refresh(force=True)
+        self.assertEqual(len(self.get(q="bit")["topics"]), 2)
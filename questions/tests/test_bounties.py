@@ -0,0 +1,71 @@
+import json, logging
+
+from questions import views
+from questions.bounties import rebuild_bounty_totals
+from questions.fields import WeiSum
+from questions.models import Question, BountyTotals
+from questions.tests.base import BountyTestCase
+
+logging.disable(logging.CRITICAL)
+
+# larger than any 64 bit integer column can hold
+BIG = 2**255 + 1
+
+
+class TestWeiBounties(BountyTestCase):
+    def test_large_bounty_round_trips(self):
+        question = self.ask(self.threads[0], BIG)
+        question.refresh_from_db()
+        self.assertEqual(question.bounty, BIG)
+        self.assertTrue(Question.objects.filter(bounty__gt=2**254).exists())
+
+    def test_ordering_and_sum_exact(self):
+        for bounty in [BIG, 9, 10, None]:
+            self.ask(self.threads[0], bounty)
+        self.assertEqual(
+            list(Question.objects.order_by("-bounty").values_list("bounty", flat=True))[:3],
+            [BIG, 10, 9],
+        )
+        self.assertEqual(
+            Question.objects.aggregate(total=WeiSum("bounty"))["total"], BIG + 19
+        )
+
+    def test_totals_follow_questions(self):
+        question = self.ask(self.threads[0], BIG)
+        self.ask(self.threads[1], 7)
+        self.ask(self.threads[1], 5, status="RS")
+        self.threads[0].refresh_from_db()
+        self.assertEqual(self.threads[0].total_bounty_available, BIG)
+        totals = BountyTotals.load()
+        self.assertEqual((totals.available, totals.claimed), (BIG + 7, 5))
+        # selecting an answer moves the bounty from available to claimed
+        question.status = "AS"
+        question.save()
+        totals = BountyTotals.load()
+        self.assertEqual((totals.available, totals.claimed), (7, BIG + 5))
+        question.delete()
+        totals = BountyTotals.load()
+        self.assertEqual((totals.available, totals.claimed), (7, 5))
+        self.threads[1].delete()
+        totals = BountyTotals.load()
+        self.assertEqual((totals.available, totals.claimed), (0, 0))
+
+    def test_rebuild_after_bulk_update(self):
+        self.ask(self.threads[0], 3)
+        self.ask(self.threads[1], 4)
+        Question.objects.update(status="RS")
+        totals = rebuild_bounty_totals()
+        self.assertEqual((totals.available, totals.claimed), (0, 7))
+        self.threads[1].refresh_from_db()
+        self.assertEqual(self.threads[1].total_bounty_claimed, 4)
+
+    def test_thread_list_totals(self):
+        self.ask(self.threads[0], BIG)
+        self.ask(self.threads[0], 1, status="AS")
+        request = self.factory.get("/api/thread-list/")
+        response = views.threadList(request)
+        threads = {t["id"]: t for t in json.loads(response.content)["threads"]}
+        # wei amounts are serialized as strings so they survive JSON parsing
+        self.assertEqual(threads[self.threads[0].pk]["total_bounty_available"], str(BIG))
+        self.assertEqual(threads[self.threads[0].pk]["total_bounty_claimed"], "1")
+        self.assertEqual(threads[self.threads[1].pk]["total_bounty_available"], "0")
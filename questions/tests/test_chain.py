@@ -0,0 +1,165 @@
+from django.test import TestCase
+
+from web3 import EthereumTesterProvider, Web3
+from concurrent.futures import ThreadPoolExecutor
+import os, tempfile, asyncio
+
+from facthound import chain
+
+
+class TestSharedSession(TestCase):
+    def test_session_is_pooled(self):
+        session = chain.build_session(pool_maxsize=7, retries=2)
+        adapter = session.get_adapter("https://example.com")
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn("POST", adapter.max_retries.allowed_methods)
+        self.assertIs(adapter, session.get_adapter("http://example.com"))
+
+    def test_session_shared_across_threads(self):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            sessions = list(pool.map(lambda _: chain.get_session(), range(8)))
+        self.assertTrue(all(s is sessions[0] for s in sessions))
+
+    def test_web3_uses_shared_session(self):
+        w3 = chain.get_web3()
+        self.assertIs(w3, chain.get_web3())
+        self.assertIs(
+            w3.provider._request_session_manager.cache_and_return_session(
+                w3.provider.endpoint_uri
+            ),
+            chain.get_session(),
+        )
+        self.assertEqual(
+            w3.provider.get_request_kwargs()["timeout"], chain.RPC_TIMEOUT
+        )
+
+
+class TestLazyLoading(TestCase):
+    def test_abi_loaded_once_from_base_dir(self):
+        chain.get_facthound_contract.cache_clear()
+        cwd = os.getcwd()
+        os.chdir(tempfile.gettempdir())
+        try:
+            contract = chain.get_facthound_contract()
+        finally:
+            os.chdir(cwd)
+        self.assertIs(contract, chain.get_facthound_contract())
+        self.assertEqual(chain.get_facthound_abi(), contract["abi"])
+        self.assertEqual(chain.get_facthound_contract.cache_info().misses, 1)
+
+    def test_set_web3_resets_client(self):
+        w3 = Web3(EthereumTesterProvider())
+        chain.set_web3(w3)
+        self.addCleanup(chain.set_web3, None)
+        self.assertIs(chain.get_web3(), w3)
+        chain.set_web3(None)
+        self.assertIsNot(chain.get_web3(), w3)
+
+
+class TestContractReader(TestCase):
+    def setUp(self):
+        self.w3 = Web3(EthereumTesterProvider())
+        chain.set_web3(self.w3)
+        self.addCleanup(chain.set_web3, None)
+        accounts = self.w3.eth.accounts
+        self.owner, self.asker, self.answerer = accounts[:3]
+        artifact = chain.get_facthound_contract()
+        Contract = self.w3.eth.contract(
+            abi=artifact["abi"], bytecode=artifact["bytecode"]["object"]
+        )
+        tx_hash = Contract.constructor(100).transact({"from": self.owner})
+        address = self.w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+        self.contract = self.w3.eth.contract(
+            address=address, abi=artifact["abi"], decode_tuples=True
+        )
+        self.question_hash = Web3.solidity_keccak(
+            ["address", "string"], [self.asker, "question"]
+        )
+        self.contract.functions.createQuestion(self.question_hash).transact(
+            {"from": self.asker, "value": 1000}
+        )
+
+    def test_latest_reads_cached_until_refresh(self):
+        reader = chain.ContractReader(self.contract)
+        before = reader.call("getQuestion", self.question_hash)
+        self.assertIs(before, reader.call("getQuestion", self.question_hash))
+        answer_hash = Web3.solidity_keccak(
+            ["address", "string"], [self.answerer, "answer"]
+        )
+        self.contract.functions.createAnswer(
+            self.question_hash, answer_hash
+        ).transact({"from": self.answerer})
+        self.contract.functions.selectAnswer(
+            self.question_hash, answer_hash
+        ).transact({"from": self.asker})
+        # within the TTL the cached state is served
+        self.assertIs(before, reader.call("getQuestion", self.question_hash))
+        after = reader.call("getQuestion", self.question_hash, refresh=True)
+        self.assertEqual(after.selectedAnswer, answer_hash)
+        self.assertIs(after, reader.call("getQuestion", self.question_hash))
+
+    def test_latest_reads_expire(self):
+        reader = chain.ContractReader(self.contract, chain.ViewCallCache(ttl=0))
+        self.assertEqual(reader.call("owner"), self.owner)
+        self.contract.functions.setOwner(self.asker).transact({"from": self.owner})
+        self.assertEqual(reader.call("owner"), self.asker)
+
+    def test_finalized_reads_cached_permanently(self):
+        cache = chain.ViewCallCache(ttl=0)
+        reader = chain.ContractReader(self.contract, cache)
+        block = self.w3.eth.block_number
+        reader.call("owner", block_identifier=block)
+        key = (self.contract.address, "owner", (), block)
+        self.assertEqual(cache.get(key), self.owner)
+
+    def test_other_identifiers_skip_cache(self):
+        cache = chain.ViewCallCache()
+        reader = chain.ContractReader(self.contract, cache)
+        block_hash = self.w3.eth.get_block("latest").hash.to_0x_hex()
+        self.assertEqual(reader.call("owner", block_identifier=block_hash), self.owner)
+        key = (self.contract.address, "owner", (), block_hash)
+        self.assertIs(cache.get(key), chain._MISSING)
+
+    def test_cache_is_bounded(self):
+        cache = chain.ViewCallCache(maxsize=2)
+        for i in range(3):
+            cache.set(i, i)
+        self.assertEqual(len(cache), 2)
+        self.assertIs(cache.get(0), chain._MISSING)
+        self.assertEqual(cache.get(2), 2)
+
+
+class TestAsyncClient(TestCase):
+    def test_pooled_session_per_loop(self):
+        chain.set_async_web3(chain.make_async_web3("http://localhost:8545"))
+        self.addCleanup(chain.set_async_web3, None)
+
+        async def sessions():
+            w3 = await chain.get_async_web3()
+            await chain.get_async_web3()
+            manager = w3.provider._request_session_manager
+            cached = [
+                (s.connector.limit, s.connector.force_close)
+                for s in manager.session_cache._data.values()
+            ]
+            for session in manager.session_cache._data.values():
+                await session.close()
+            return cached
+
+        cached = asyncio.run(sessions())
+        self.assertEqual(cached, [(chain.RPC_POOL_MAXSIZE, False)])
+
+
+class TestPerChainClients(TestCase):
+    def test_chains_get_isolated_pools(self):
+        for chain_id in (8453, 10):
+            self.addCleanup(chain.set_web3, None, chain_id)
+        base = chain.get_web3(8453, "https://base.example")
+        optimism = chain.get_web3(10, "https://optimism.example")
+        self.assertIs(base, chain.get_web3(8453))
+        self.assertEqual(base.provider.endpoint_uri, "https://base.example")
+        self.assertIsNot(chain.get_session(8453), chain.get_session(10))
+        self.assertIsNot(chain.get_session(8453), chain.get_session())
+        self.assertIsNot(chain.get_view_cache(8453), chain.get_view_cache(10))
+        self.assertIsNot(base, optimism)
@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.test import RequestFactory
+
+import json, datetime, pytz, logging
+
+from siweauth.models import User
+
+from questions import views
+from questions.market import refresh_market_stats
+from questions.models import Thread, Post, Question, Answer, MarketSnapshot
+
+logging.disable(logging.CRITICAL)
+
+
+class TestMarketStats(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user_address(
+            "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+        )
+        self.now = datetime.datetime.now(pytz.UTC)
+        thread = Thread.objects.create(topic="market", dt=self.now)
+        self.questions = []
+        for days_ago, bounty in [(2, 2**200), (2, 5), (0, None)]:
+            dt = self.now - datetime.timedelta(days=days_ago)
+            self.questions.append(
+                Question.objects.create(
+                    post=Post.objects.create(
+                        thread=thread, text="q", dt=dt, poster=self.user
+                    ),
+                    asker=self.user,
+                    bounty=bounty,
+                    status="OP",
+                )
+            )
+        for question in self.questions[:2]:
+            Answer.objects.create(
+                question=question,
+                post=Post.objects.create(
+                    thread=thread, text="a", dt=self.now, poster=self.user
+                ),
+                answerer=self.user,
+                status="UN",
+            )
+        selected = self.questions[1]
+        selected.status = "AS"
+        selected.selected_dt = selected.post.dt + datetime.timedelta(hours=1)
+        selected.save()
+
+    def test_rollups(self):
+        snapshot = refresh_market_stats(period="D", buckets=3)
+        self.assertEqual((snapshot.questions, snapshot.answers), (3, 2))
+        self.assertAlmostEqual(snapshot.answers_per_question, 2 / 3)
+        self.assertEqual(snapshot.median_time_to_selection, 3600)
+        self.assertEqual(len(snapshot.series), 3)
+        oldest, middle, today = snapshot.series
+        self.assertEqual(oldest["questions"], 2)
+        self.assertEqual(oldest["bounty_posted"], str(2**200 + 5))
+        self.assertEqual(oldest["selections"], 1)
+        self.assertEqual(oldest["median_time_to_selection"], 3600)
+        self.assertEqual(middle["questions"], 0)
+        self.assertEqual(middle["bounty_posted"], "0")
+        self.assertIsNone(middle["median_time_to_selection"])
+        self.assertEqual((today["questions"], today["answers"]), (1, 2))
+
+    def test_empty_market(self):
+        Question.objects.all().delete()
+        snapshot = refresh_market_stats(buckets=2)
+        self.assertEqual(snapshot.questions, 0)
+        self.assertIsNone(snapshot.answers_per_question)
+        self.assertEqual([b["questions"] for b in snapshot.series], [0, 0])
+
+    def test_endpoint_serves_snapshot(self):
+        refresh_market_stats()
+        # new questions show up in the live totals but not the snapshot
+        self.questions[2].bounty = 7
+        self.questions[2].save()
+        request = self.factory.get("/api/market/")
+        with self.assertNumQueries(2):
+            response = views.market(request)
+        content = json.loads(response.content)
+        self.assertEqual(content["open_bounty"], str(2**200 + 7))
+        self.assertEqual(content["claimed_bounty"], "5")
+        self.assertEqual(content["questions"], 3)
+        self.assertEqual(content["median_time_to_selection"], 3600)
+
+    def test_endpoint_builds_missing_snapshot(self):
+        request = self.factory.get("/api/market/")
+        response = views.market(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(MarketSnapshot.objects.filter(pk=1).exists())
@@ -0,0 +1,68 @@
+import json, logging
+
+from questions import views
+from questions.models import Question, Tag
+from questions.tests.base import BountyTestCase
+
+logging.disable(logging.CRITICAL)
+
+
+class TestOpenBounties(BountyTestCase):
+    def setUp(self):
+        super().setUp()
+        tag = Tag.objects.create(name="eth")
+        tag.thread.add(self.threads[1])
+        # bounties 10, 9, ... with a tie at 5, plus rows the feed must skip
+        bounties = [10, 9, 2**200, 5, 5, 1]
+        self.open = []
+        for i, bounty in enumerate(bounties):
+            self.open.append(self.ask(self.threads[i % 2], bounty))
+        self.ask(self.threads[0], 100, status="RS")
+        self.ask(self.threads[0], None)
+
+    def get(self, **params):
+        request = self.factory.get("/api/openbounties/", params)
+        response = views.openBounties(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_pages_in_bounty_order(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            status, content = self.get(**params)
+            self.assertEqual(status, 200)
+            seen.extend(q["question_id"] for q in content["questions"])
+            cursor = content["next"]
+            if cursor is None:
+                break
+        expected = sorted(self.open, key=lambda q: (q.bounty, q.pk), reverse=True)
+        self.assertEqual(seen, [q.pk for q in expected])
+        status, content = self.get(limit=1)
+        self.assertEqual(content["questions"][0]["bounty"], str(2**200))
+
+    def test_tag_filter(self):
+        status, content = self.get(tag="eth")
+        self.assertEqual(
+            {q["thread_id"] for q in content["questions"]}, {self.threads[1].pk}
+        )
+        self.assertEqual(len(content["questions"]), 3)
+
+    def test_tag_filter_ignores_case(self):
+        _, lower = self.get(tag="eth")
+        _, mixed = self.get(tag="ETH")
+        self.assertEqual(mixed["questions"], lower["questions"])
+
+    def test_invalid_cursor(self):
+        status, content = self.get(cursor="not a cursor")
+        self.assertEqual(status, 400)
+        self.assertEqual(content["message"], "Invalid cursor.")
+
+    def test_uses_partial_index(self):
+        plan = (
+            Question.objects.filter(status="OP", bounty__isnull=False)
+            .order_by("-bounty", "-pk")
+            .explain()
+        )
+        self.assertIn("open_bounty_idx", plan)
@@ -9,10 +9,11 @@ from web3 import (
 )
 import json, datetime, pytz, logging
 
+from facthound import chain
 from siweauth.models import User
 
 from questions import views
-from questions.models import Thread, Post, Question, Answer, Tag
+from questions.models import Thread, Post, Question, Answer, Tag, Deployment
 from questions.serializers import (
     ThreadSerializer,
     PostSerializer,
@@ -27,14 +28,13 @@ logging.disable(logging.CRITICAL)
 
 class BaseTestCase(TestCase):
     def setUp(self):
-        # change views's w3 provider to this test provider
+        # point the shared chain client at this test provider
         self.provider = EthereumTesterProvider()
         self.w3 = Web3(self.provider)
-        views.w3 = self.w3
-        confirm_onchain.w3 = self.w3
+        chain.set_web3(self.w3)
+        self.addCleanup(chain.set_web3, None)
 
-        with open("contracts/FactHound.json", "rb") as f:
-            self.facthound_contract = json.load(f)
+        self.facthound_contract = chain.get_facthound_contract()
 
 
 # guide: https://web3py.readthedocs.io/en/v5/examples.html#contract-unit-tests-in-python
@@ -607,3 +607,97 @@ class TestAnswers(BaseTestCase):
             content["message"],
             "Invalid answerHash",
         )
+
+
+class TestDeploymentRegistry(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.factory = RequestFactory()
+        self.eth_tester = self.provider.ethereum_tester
+        self.owner = self.eth_tester.get_accounts()[0]
+        self.other_owner = self.eth_tester.get_accounts()[1]
+        self.asker = self.eth_tester.get_accounts()[2]
+        self.asker_user = User.objects.create_user_address(self.asker)
+        self.chain_id = self.w3.eth.chain_id
+        # serve this chain id from the test provider
+        chain.set_web3(self.w3, chain_id=self.chain_id)
+        self.addCleanup(chain.set_web3, None, self.chain_id)
+
+        abi = self.facthound_contract["abi"]
+        bytecode = self.facthound_contract["bytecode"]["object"]
+        Contract = self.w3.eth.contract(abi=abi, bytecode=bytecode)
+        tx_hash = Contract.constructor(100).transact({"from": self.owner})
+        tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        self.contract_address = tx_receipt["contractAddress"]
+        self.contract = self.w3.eth.contract(
+            address=self.contract_address, abi=abi, decode_tuples=True
+        )
+        self.text = "I am wondering what to do about this topic."
+        self.questionHash = Web3.solidity_keccak(
+            ["address", "string"], [self.asker, self.text]
+        )
+        self.contract.functions.createQuestion(self.questionHash).transact(
+            {"from": self.asker, "value": 1000000}
+        )
+
+    def _post_and_confirm(self):
+        question_dict = {
+            "topic": "sometopic",
+            "text": self.text,
+            "contractAddress": self.contract_address,
+            "questionHash": self.questionHash.hex(),
+            "chainId": self.chain_id,
+        }
+        request = self.factory.post(
+            "/api/question/", data=question_dict, content_type="application/json"
+        )
+        force_authenticate(request, self.asker_user)
+        response = views.question(request)
+        self.assertEqual(response.status_code, 200)
+        question = Question.objects.get(pk=json.loads(response.content)["question"])
+        self.assertEqual(question.chainId, self.chain_id)
+        request = self.factory.post(
+            "/api/confirm/",
+            data={"questionHash": self.questionHash.hex(), "confirmType": "question"},
+            content_type="application/json",
+        )
+        force_authenticate(request, self.asker_user)
+        response = views.confirm(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_registered_deployment_owners(self):
+        Deployment.objects.create(
+            chainId=self.chain_id,
+            rpcUrl="http://localhost:8545",
+            contractAddress=self.contract_address,
+            allowedOwners=[self.owner],
+        )
+        status, content = self._post_and_confirm()
+        self.assertEqual(status, 200)
+        self.assertTrue(Question.objects.get(post__text=self.text).confirmed_onchain)
+
+    def test_registered_deployment_rejects_other_owner(self):
+        # the global allowlist doesn't apply to registered deployments
+        confirm_onchain.allowed_owners.append(self.owner)
+        Deployment.objects.create(
+            chainId=self.chain_id,
+            rpcUrl="http://localhost:8545",
+            contractAddress=self.contract_address,
+            allowedOwners=[self.other_owner],
+        )
+        status, content = self._post_and_confirm()
+        self.assertEqual(status, 400)
+        self.assertEqual(content["message"], "Invalid owner.")
+
+    def test_invalid_chain_id(self):
+        request = self.factory.post(
+            "/api/question/",
+            data={"topic": "sometopic", "text": self.text, "chainId": "base"},
+            content_type="application/json",
+        )
+        force_authenticate(request, self.asker_user)
+        response = views.question(request)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            json.loads(response.content)["message"], "chainId must be an integer."
+        )
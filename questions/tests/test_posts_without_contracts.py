@@ -1,11 +1,14 @@
 from django.test import TestCase
 from django.test import RequestFactory
+from rest_framework.test import force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
 
 from web3 import Web3
 import json, datetime, pytz, logging
 
 from siweauth.views import TokenObtainPairView
 from siweauth.models import User
+from siweauth.authentication import WalletTokenUser
 
 from questions import views
 from questions.models import Thread, Post, Question, Answer, Tag
@@ -55,6 +58,17 @@ class TestPosts(TestCase):
             "tags": ["a", "b", "c"],
         }
 
+    def test_start_thread_as_token_user(self):
+        # stateless token users are resolved to their row to be stored
+        request = self.factory.post("/api/post/", self.thread_dict)
+        force_authenticate(
+            request, WalletTokenUser(AccessToken(self.token)), AccessToken(self.token)
+        )
+        response = views.post(request)
+        self.assertEqual(response.status_code, 200)
+        post = Post.objects.get(pk=json.loads(response.content)["post"])
+        self.assertEqual(post.poster, self.user)
+
     def test_start_thread(self):
         request = self.factory.post(
             "/api/post/",
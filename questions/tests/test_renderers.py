@@ -0,0 +1,108 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+
+import json, datetime, pytz, logging
+from decimal import Decimal
+from unittest import mock
+
+from siweauth.models import User
+
+from facthound import renderers
+from questions import views
+from questions.models import Thread, Post, Question, Answer
+
+logging.disable(logging.CRITICAL)
+
+
+class TestDumps(TestCase):
+    def test_matches_stdlib(self):
+        data = {
+            "a": 1,
+            "bounty": Decimal(10**30),
+            "dt": datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=pytz.UTC),
+            "nested": [None, True, "x"],
+        }
+        fast = json.loads(renderers.dumps(data))
+        with mock.patch.object(renderers, "orjson", None):
+            slow = json.loads(renderers.dumps(data))
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast["bounty"], str(10**30))
+
+    def test_dates_match_stdlib(self):
+        dt = datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=pytz.UTC)
+        data = {"dt": dt, "date": dt.date(), "time": dt.time()}
+        fast = renderers.dumps(data)
+        with mock.patch.object(renderers, "orjson", None):
+            slow = renderers.dumps(data)
+        self.assertEqual(fast, slow.replace(b", ", b",").replace(b": ", b":"))
+        self.assertEqual(json.loads(fast)["dt"], "2024-01-02T03:04:05.123Z")
+        rendered = renderers.FastJSONRenderer().render(data)
+        self.assertEqual(json.loads(rendered), json.loads(slow))
+
+    def test_wide_int_falls_back(self):
+        # orjson only encodes 64 bit integers
+        self.assertEqual(json.loads(renderers.dumps({"wei": 2**100})), {"wei": 2**100})
+
+    def test_response(self):
+        response = renderers.FastJsonResponse({"message": "x"}, status=400)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(response.content), {"message": "x"})
+
+
+class TestValuesList(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        user = User.objects.create_user_address(
+            "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+        )
+        now = datetime.datetime.now(pytz.UTC)
+        for i in range(3):
+            thread = Thread.objects.create(topic=f"topic {i}", dt=now)
+            post = Post.objects.create(thread=thread, text="q", dt=now, poster=user)
+            question = Question.objects.create(
+                post=post,
+                asker=user,
+                questionHash=bytes([i]) * 32 if i else None,
+                bounty=10**30 + i,
+                status="OP",
+            )
+            post = Post.objects.create(thread=thread, text="a", dt=now, poster=user)
+            Answer.objects.create(
+                post=post, question=question, answerer=user, answerHash=bytes([i]) * 32
+            )
+
+    def assertMatchesSerializer(self, viewset, **params):
+        request = self.factory.get("/api/", params)
+        response = viewset.as_view({"get": "list"})(request)
+        results = json.loads(response.render().content)["results"]
+        view = viewset(request=Request(request), format_kwarg=None)
+        expected = json.loads(
+            json.dumps(
+                view.get_serializer(view.get_queryset(), many=True).data,
+                cls=renderers.DjangoJSONEncoder,
+            )
+        )
+        self.assertEqual(
+            sorted(results, key=lambda r: r["id"]),
+            sorted(expected, key=lambda r: r["id"]),
+        )
+
+    def test_matches_serializer(self):
+        for viewset in [
+            views.ThreadViewSet,
+            views.PostViewSet,
+            views.QuestionViewSet,
+            views.AnswerViewSet,
+            views.TagViewSet,
+        ]:
+            self.assertMatchesSerializer(viewset)
+        self.assertMatchesSerializer(views.QuestionViewSet, fields="bounty,questionHash")
+
+    def test_no_model_instances(self):
+        with self.assertNumQueries(1):
+            response = views.QuestionViewSet.as_view({"get": "list"})(
+                self.factory.get("/api/")
+            )
+        self.assertEqual(response.status_code, 200)
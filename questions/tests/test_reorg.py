@@ -0,0 +1,214 @@
+from django.test import TestCase
+from unittest import mock
+
+from web3 import EthereumTesterProvider, Web3
+import datetime, pytz, logging
+
+from facthound import chain
+from siweauth.models import User
+
+from questions.models import Thread, Post, Question, Answer, Deployment
+from questions import confirm_onchain
+
+logging.disable(logging.CRITICAL)
+
+OTHER_ADDRESS = "0x" + "ab" * 20
+
+
+class TestReorgReverification(TestCase):
+    def setUp(self):
+        self.w3 = Web3(EthereumTesterProvider())
+        chain.set_web3(self.w3)
+        self.addCleanup(chain.set_web3, None)
+        self.owner, self.asker, self.answerer = self.w3.eth.accounts[:3]
+        confirm_onchain.allowed_owners.append(self.owner)
+        self.addCleanup(confirm_onchain.allowed_owners.remove, self.owner)
+        artifact = chain.get_facthound_contract()
+        Contract = self.w3.eth.contract(
+            abi=artifact["abi"], bytecode=artifact["bytecode"]["object"]
+        )
+        tx_hash = Contract.constructor(100).transact({"from": self.owner})
+        address = self.w3.eth.wait_for_transaction_receipt(tx_hash)["contractAddress"]
+        self.contract = self.w3.eth.contract(address=address, abi=artifact["abi"])
+        #
+        asker_user = User.objects.create_user_address(self.asker)
+        answerer_user = User.objects.create_user_address(self.answerer)
+        thread = Thread.objects.create(topic="reorgs", dt=datetime.datetime.now(pytz.UTC))
+        self.question_hash = Web3.solidity_keccak(
+            ["address", "string"], [self.asker, "Question Text"]
+        )
+        self.answer_hash = Web3.solidity_keccak(
+            ["address", "string"], [self.answerer, "Answer Text"]
+        )
+        self.question = Question.objects.create(
+            post=Post.objects.create(
+                thread=thread,
+                text="Question Text",
+                dt=datetime.datetime.now(pytz.UTC),
+                poster=asker_user,
+            ),
+            asker=asker_user,
+            status="OP",
+            questionHash=self.question_hash,
+            contractAddress=address,
+        )
+        self.answer = Answer.objects.create(
+            question=self.question,
+            post=Post.objects.create(
+                thread=thread,
+                text="Answer Text",
+                dt=datetime.datetime.now(pytz.UTC),
+                poster=answerer_user,
+            ),
+            answerer=answerer_user,
+            status="OP",
+            answerHash=self.answer_hash,
+        )
+        # everything from here on can be reorganized away
+        self.snapshot = self.w3.testing.snapshot()
+        self.contract.functions.createQuestion(self.question_hash).transact(
+            {"from": self.asker, "value": 1000000}
+        )
+        self.contract.functions.createAnswer(
+            self.question_hash, self.answer_hash
+        ).transact({"from": self.answerer})
+        self.contract.functions.selectAnswer(
+            self.question_hash, self.answer_hash
+        ).transact({"from": self.asker})
+        self.assertTrue(confirm_onchain.confirm_question(self.question_hash)[0])
+        self.assertTrue(
+            confirm_onchain.confirm_answer(self.question_hash, self.answer_hash)[0]
+        )
+        self.assertTrue(
+            confirm_onchain.confirm_selection(self.question_hash, self.answer_hash)[0]
+        )
+
+    def test_confirmation_records_block(self):
+        self.question.refresh_from_db()
+        block = self.w3.eth.get_block("latest")
+        self.assertEqual(self.question.confirmed_block_number, block.number)
+        self.assertEqual(bytes(self.question.confirmed_block_hash), bytes(block.hash))
+
+    def test_canonical_rows_untouched(self):
+        counts = confirm_onchain.reverify_confirmations(depth=64)
+        self.assertEqual(counts, {"checked": 3, "reorged": 0, "reconfirmed": 0})
+        self.question.refresh_from_db()
+        self.assertTrue(self.question.confirmed_onchain)
+
+    def test_reorged_rows_unconfirmed(self):
+        self.w3.testing.revert(self.snapshot)
+        self.w3.testing.mine(5)
+        counts = confirm_onchain.reverify_confirmations(depth=64)
+        self.assertEqual(counts, {"checked": 3, "reorged": 3, "reconfirmed": 0})
+        self.question.refresh_from_db()
+        self.answer.refresh_from_db()
+        self.assertFalse(self.question.confirmed_onchain)
+        self.assertIsNone(self.question.confirmed_block_number)
+        self.assertFalse(self.answer.confirmed_onchain)
+        self.assertFalse(self.answer.selection_confirmed_onchain)
+
+    def test_reorged_rows_reconfirmed(self):
+        self.w3.testing.revert(self.snapshot)
+        # the same transactions land in a different block
+        self.w3.testing.mine()
+        self.contract.functions.createQuestion(self.question_hash).transact(
+            {"from": self.asker, "value": 1000000}
+        )
+        counts = confirm_onchain.reverify_confirmations(depth=64)
+        self.assertEqual(counts["reorged"], 3)
+        self.question.refresh_from_db()
+        self.assertTrue(self.question.confirmed_onchain)
+        self.assertEqual(
+            bytes(self.question.confirmed_block_hash),
+            bytes(self.w3.eth.get_block("latest").hash),
+        )
+
+    def test_rows_outside_window_skipped(self):
+        self.w3.testing.mine(10)
+        counts = confirm_onchain.reverify_confirmations(depth=5)
+        self.assertEqual(counts["checked"], 0)
+
+    def test_window_per_chain(self):
+        # a second chain far ahead of the tester chain
+        other = mock.Mock()
+        other.eth.block_number = 10**9
+        chain.set_web3(other, chain_id=10)
+        self.addCleanup(chain.set_web3, None, 10)
+        Deployment.objects.create(
+            chainId=10, rpcUrl="https://optimism.example", contractAddress=OTHER_ADDRESS
+        )
+        self.question.refresh_from_db()
+        other.eth.get_block.return_value.hash = bytes(self.question.confirmed_block_hash)
+        Question.objects.filter(pk=self.question.pk).update(
+            contractAddress=OTHER_ADDRESS, chainId=10, confirmed_block_number=10**9 - 1
+        )
+        counts = confirm_onchain.reverify_confirmations(depth=64)
+        # the question is inside chain 10's window; its answers, still at
+        # tester chain block numbers, are far outside it
+        self.assertEqual(counts, {"checked": 1, "reorged": 0, "reconfirmed": 0})
+        other.eth.get_block.assert_called_once_with(10**9 - 1)
+
+    def test_failed_chain_skipped(self):
+        broken = mock.Mock()
+        type(broken.eth).block_number = mock.PropertyMock(side_effect=ConnectionError)
+        chain.set_web3(broken, chain_id=10)
+        self.addCleanup(chain.set_web3, None, 10)
+        Deployment.objects.create(
+            chainId=10, rpcUrl="https://optimism.example", contractAddress=OTHER_ADDRESS
+        )
+        counts = confirm_onchain.reverify_confirmations(depth=64)
+        self.assertEqual(counts, {"checked": 3, "reorged": 0, "reconfirmed": 0})
+
+    def test_default_chain_unused(self):
+        # every row lives on a registered deployment
+        chain.set_web3(self.w3, chain_id=10)
+        self.addCleanup(chain.set_web3, None, 10)
+        Deployment.objects.create(
+            chainId=10,
+            rpcUrl="http://localhost:8545",
+            contractAddress=self.contract.address,
+            allowedOwners=[self.owner],
+        )
+        broken = mock.Mock()
+        type(broken.eth).block_number = mock.PropertyMock(side_effect=ConnectionError)
+        chain.set_web3(broken)
+        counts = confirm_onchain.reverify_confirmations(depth=64)
+        self.assertEqual(counts["checked"], 3)
+
+    def test_repeat_confirmation_uses_cached_head(self):
+        with mock.patch.object(
+            self.w3.eth, "get_block", wraps=self.w3.eth.get_block
+        ) as get_block:
+            self.assertTrue(
+                confirm_onchain.confirm_answer(self.question_hash, self.answer_hash)[0]
+            )
+            self.assertTrue(
+                confirm_onchain.confirm_selection(self.question_hash, self.answer_hash)[0]
+            )
+        get_block.assert_not_called()
+
+    def test_answer_newer_than_cached_head(self):
+        answerer = self.w3.eth.accounts[3]
+        answer_hash = Web3.solidity_keccak(["address", "string"], [answerer, "Later"])
+        Answer.objects.create(
+            question=self.question,
+            post=Post.objects.create(
+                thread=self.question.post.thread,
+                text="Later",
+                dt=datetime.datetime.now(pytz.UTC),
+                poster=User.objects.create_user_address(answerer),
+            ),
+            answerer=User.objects.get(wallet=answerer),
+            status="OP",
+            answerHash=answer_hash,
+        )
+        # mined after the head cached by the confirmations in setUp
+        self.contract.functions.createAnswer(self.question_hash, answer_hash).transact(
+            {"from": answerer}
+        )
+        success, _ = confirm_onchain.confirm_answer(self.question_hash, answer_hash)
+        self.assertTrue(success)
+        self.assertEqual(
+            Answer.objects.get(answerHash=answer_hash).confirmed_block_number,
+            self.w3.eth.block_number,
+        )
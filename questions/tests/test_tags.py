@@ -0,0 +1,92 @@
+import json, logging
+
+from questions import views
+from questions.models import Tag
+from questions.tests.base import BountyTestCase
+from questions.tags import rebuild_tag_totals
+
+logging.disable(logging.CRITICAL)
+
+
+class TestTagDirectory(BountyTestCase):
+    thread_count = 5
+
+    def setUp(self):
+        super().setUp()
+        self.eth = Tag.objects.create(name="eth")
+        self.defi = Tag.objects.create(name="defi")
+        self.eth.thread.add(*self.threads)
+        self.defi.thread.add(*self.threads[:2])
+
+    def stats(self, tag):
+        tag.refresh_from_db()
+        return tag.thread_count, tag.open_bounty
+
+    def test_counts_follow_links(self):
+        self.assertEqual(self.stats(self.eth), (5, 0))
+        self.assertEqual(self.stats(self.defi), (2, 0))
+        self.threads[0].tag_set.remove(self.defi)
+        self.assertEqual(self.stats(self.defi), (1, 0))
+        self.eth.thread.clear()
+        self.assertEqual(self.stats(self.eth), (0, 0))
+
+    def test_bounties_follow_questions(self):
+        question = self.ask(self.threads[0], 2**200)
+        self.ask(self.threads[1], 3)
+        self.assertEqual(self.stats(self.defi), (2, 2**200 + 3))
+        question.status = "AS"
+        question.save()
+        self.assertEqual(self.stats(self.defi), (2, 3))
+        # tagging a thread brings its open bounty along
+        other = Tag.objects.create(name="other")
+        self.threads[1].tag_set.add(other)
+        self.assertEqual(self.stats(other), (1, 3))
+        self.threads[1].delete()
+        self.assertEqual(self.stats(self.defi), (1, 0))
+        self.assertEqual(self.stats(self.eth), (4, 0))
+        self.assertEqual(self.stats(other), (0, 0))
+
+    def test_rebuild(self):
+        self.ask(self.threads[0], 7)
+        Tag.objects.update(thread_count=0, open_bounty=0)
+        rebuild_tag_totals()
+        self.assertEqual(self.stats(self.defi), (2, 7))
+
+    def test_directory(self):
+        self.ask(self.threads[0], 7)
+        response = views.tagDirectory(self.factory.get("/api/tagdirectory/"))
+        tags = json.loads(response.content)["tags"]
+        self.assertEqual(
+            tags,
+            [
+                {"name": "eth", "thread_count": 5, "open_bounty": "7"},
+                {"name": "defi", "thread_count": 2, "open_bounty": "7"},
+            ],
+        )
+
+    def test_threads_by_tag_pages(self):
+        seen, cursor = [], None
+        while True:
+            params = {"tag": "ETH", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            request = self.factory.get("/api/threadsbytag/", params)
+            content = json.loads(views.threadsByTag(request).content)
+            seen.extend(t["id"] for t in content["threads"])
+            cursor = content["next"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [t.pk for t in reversed(self.threads)])
+
+    def test_threads_by_tag_duplicate_names(self):
+        Tag.objects.create(name="eth").thread.add(*self.threads)
+        request = self.factory.get("/api/threadsbytag/", {"tag": "eth", "limit": 2})
+        content = json.loads(views.threadsByTag(request).content)
+        self.assertEqual(
+            [t["id"] for t in content["threads"]],
+            [t.pk for t in reversed(self.threads)][:2],
+        )
+
+    def test_threads_by_tag_requires_tag(self):
+        response = views.threadsByTag(self.factory.get("/api/threadsbytag/"))
+        self.assertEqual(response.status_code, 400)
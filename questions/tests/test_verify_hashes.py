@@ -0,0 +1,97 @@
+from django.test import TestCase
+
+from web3 import Web3
+import datetime, pytz, logging
+
+from siweauth.models import User
+
+from questions.models import Thread, Post, Question, Answer
+from questions.verify_hashes import (
+    expected_hash,
+    verify_question_hashes,
+    verify_answer_hashes,
+    _verify,
+)
+
+logging.disable(logging.CRITICAL)
+
+WALLETS = [
+    "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf",
+    "0x2B5AD5c4795c026514f8317c7a215E218DcCD6cF",
+]
+
+
+class TestVerifyHashes(TestCase):
+    def setUp(self):
+        users = [User.objects.create_user_address(w) for w in WALLETS]
+        thread = Thread.objects.create(topic="audit", dt=datetime.datetime.now(pytz.UTC))
+        self.questions = []
+        for i in range(5):
+            text = f"question {i} ✓"
+            question = Question.objects.create(
+                post=Post.objects.create(
+                    thread=thread,
+                    text=text,
+                    dt=datetime.datetime.now(pytz.UTC),
+                    poster=users[0],
+                ),
+                asker=users[0],
+                status="OP",
+                questionHash=Web3.solidity_keccak(
+                    ["address", "string"], [WALLETS[0], text]
+                ),
+            )
+            self.questions.append(question)
+        self.answer = Answer.objects.create(
+            question=self.questions[0],
+            post=Post.objects.create(
+                thread=thread,
+                text="answer",
+                dt=datetime.datetime.now(pytz.UTC),
+                poster=users[1],
+            ),
+            answerer=users[1],
+            status="OP",
+            answerHash=Web3.solidity_keccak(["address", "string"], [WALLETS[1], "answer"]),
+        )
+        # a question without a contract has no hash and is skipped
+        Question.objects.create(
+            post=Post.objects.create(
+                thread=thread,
+                text="offchain",
+                dt=datetime.datetime.now(pytz.UTC),
+                poster=users[0],
+            ),
+            asker=users[0],
+            status="OP",
+        )
+
+    def test_expected_hash_matches_solidity_keccak(self):
+        for text in ["", "plain", "ünïcödé ✓", "x" * 1000]:
+            self.assertEqual(
+                expected_hash(WALLETS[0], text),
+                bytes(Web3.solidity_keccak(["address", "string"], [WALLETS[0], text])),
+            )
+
+    def test_all_match(self):
+        self.assertEqual(verify_question_hashes(workers=1), [])
+        self.assertEqual(verify_answer_hashes(workers=1), [])
+
+    def test_mismatches_flagged(self):
+        bad = self.questions[1:4:2]
+        for question in bad:
+            question.post.text = "edited"
+            question.post.save()
+        Answer.objects.filter(pk=self.answer.pk).update(answerHash=b"\x00" * 32)
+        expected = [q.pk for q in bad]
+        self.assertEqual(verify_question_hashes(chunk_size=2, workers=1), expected)
+        self.assertEqual(verify_question_hashes(chunk_size=2, workers=2), expected)
+        self.assertEqual(verify_answer_hashes(workers=1), [self.answer.pk])
+
+    def test_memoryview_hashes_sent_to_workers(self):
+        # PostgreSQL returns BinaryField values as memoryviews
+        rows = [
+            (1, WALLETS[0], "text", memoryview(expected_hash(WALLETS[0], "text"))),
+            (2, WALLETS[0], "text", memoryview(b"\x00" * 32)),
+        ]
+        self.assertEqual(_verify(rows, chunk_size=1, workers=2), [2])
@@ -0,0 +1,139 @@
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.request import Request
+
+import json, datetime, pytz, logging
+
+from siweauth.models import User
+from siweauth.users import is_admin_user
+
+from questions import views
+from questions.models import Thread, Post, Question, Tag
+
+logging.disable(logging.CRITICAL)
+
+
+class TestViewSets(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.users = [
+            User.objects.create_user_address(wallet)
+            for wallet in [
+                "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf",
+                "0x2B5AD5c4795c026514f8317c7a215E218DcCD6cF",
+            ]
+        ]
+        now = datetime.datetime.now(pytz.UTC)
+        self.threads = []
+        for i in range(5):
+            thread = Thread.objects.create(
+                topic=f"topic {i}", dt=now - datetime.timedelta(minutes=i)
+            )
+            post = Post.objects.create(
+                thread=thread, text=f"question {i}", dt=thread.dt, poster=self.users[i % 2]
+            )
+            Question.objects.create(
+                post=post,
+                asker=self.users[i % 2],
+                status="OP" if i < 3 else "RS",
+            )
+            self.threads.append(thread)
+        Tag.objects.create(name="eth").thread.add(*self.threads[:2])
+
+    def list(self, viewset, **params):
+        request = self.factory.get("/api/", params)
+        response = viewset.as_view({"get": "list"})(request)
+        return response.status_code, json.loads(response.render().content)
+
+    def test_cursor_pagination(self):
+        status, page = self.list(views.ThreadViewSet, limit=2)
+        self.assertEqual(status, 200)
+        seen = [t["id"] for t in page["results"]]
+        while page["next"]:
+            response = views.ThreadViewSet.as_view({"get": "list"})(
+                self.factory.get(page["next"])
+            )
+            page = json.loads(response.render().content)
+            seen.extend(t["id"] for t in page["results"])
+        # newest first
+        self.assertEqual(seen, [t.pk for t in self.threads])
+
+    def test_sparse_fields(self):
+        with self.assertNumQueries(1):
+            status, page = self.list(views.QuestionViewSet, fields="status")
+        self.assertEqual(set(page["results"][0]), {"id", "status"})
+        status, page = self.list(views.TagViewSet, fields="name")
+        self.assertEqual(page["results"], [{"id": page["results"][0]["id"], "name": "eth"}])
+        status, page = self.list(views.QuestionViewSet, fields="nope")
+        self.assertEqual(status, 400)
+
+    def test_only_requested_columns_loaded(self):
+        view = views.QuestionViewSet()
+        view.request = Request(self.factory.get("/api/questions/", {"fields": "status"}))
+        deferred = view.get_queryset().first().get_deferred_fields()
+        self.assertNotIn("status", deferred)
+        self.assertIn("bounty", deferred)
+
+    def test_filters(self):
+        status, page = self.list(views.QuestionViewSet, status="RS")
+        self.assertEqual(len(page["results"]), 2)
+        status, page = self.list(
+            views.QuestionViewSet, asker=self.users[0].pk, status="OP"
+        )
+        self.assertEqual(len(page["results"]), 2)
+        status, page = self.list(views.PostViewSet, thread=self.threads[0].pk)
+        self.assertEqual(len(page["results"]), 1)
+        status, page = self.list(views.ThreadViewSet, tag="eth")
+        self.assertEqual(len(page["results"]), 2)
+        status, page = self.list(views.QuestionViewSet, thread="abc")
+        self.assertEqual(status, 400)
+
+    def test_tag_filter_duplicate_names(self):
+        Tag.objects.create(name="eth").thread.add(*self.threads[:2])
+        status, page = self.list(views.ThreadViewSet, tag="eth", limit=1)
+        self.assertEqual([t["id"] for t in page["results"]], [self.threads[0].pk])
+        request = self.factory.get(page["next"])
+        response = views.ThreadViewSet.as_view({"get": "list"})(request)
+        page = json.loads(response.render().content)
+        self.assertEqual([t["id"] for t in page["results"]], [self.threads[1].pk])
+        self.assertIsNone(page["next"])
+
+    def test_only_admins_write(self):
+        tag = Tag.objects.get(name="eth")
+        update = views.TagViewSet.as_view({"patch": "partial_update"})
+        create = views.TagViewSet.as_view({"post": "create"})
+
+        def patch(user, name):
+            request = self.factory.patch(f"/api/tags/{tag.pk}/", {"name": name})
+            force_authenticate(request, user)
+            return update(request, pk=tag.pk).status_code
+
+        request = self.factory.post("/api/tags/", {"name": "x", "thread": []})
+        self.assertIn(create(request).status_code, (401, 403))
+        self.assertEqual(patch(self.users[0], "nope"), 403)
+        admin = self.users[1]
+        admin.is_admin = True
+        admin.save()
+        self.assertEqual(patch(admin, "ether"), 200)
+        # the admin set is cached in-process
+        with self.assertNumQueries(0):
+            self.assertTrue(is_admin_user(admin))
+        self.assertEqual(Tag.objects.get(pk=tag.pk).name, "ether")
+
+    def test_writes_ignore_sparse_fields(self):
+        admin = self.users[1]
+        admin.is_admin = True
+        admin.save()
+        create = views.ThreadViewSet.as_view({"post": "create"})
+
+        def post(data):
+            request = self.factory.post("/api/threads/?fields=id", data, format="json")
+            force_authenticate(request, admin)
+            return create(request)
+
+        # dropped fields are still validated
+        self.assertEqual(post({"topic": "new"}).status_code, 400)
+        response = post({"topic": "new", "dt": "2024-01-01T00:00:00Z"})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["topic"], "new")
+        self.assertEqual(Thread.objects.get(pk=response.data["id"]).topic, "new")
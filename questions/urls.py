@@ -19,8 +19,14 @@ urlpatterns = [
     path("answer/", views.answer, name="answer"),
     path("selection/", views.selection, name="selection"),
     path("confirm/", views.confirm, name="confirm"),
+    path("aconfirm/", views.aconfirm, name="aconfirm"),
     path("search/", views.search, name="search"),
     path("thread/", views.threadPosts, name="threadposts"),
     path("threadlist/", views.threadList, name="threadlist"),
     path('userhistory/', views.userHistory, name='userhistory'),
+    path("market/", views.market, name="market"),
+    path("openbounties/", views.openBounties, name="openbounties"),
+    path("tagdirectory/", views.tagDirectory, name="tagdirectory"),
+    path("threadsbytag/", views.threadsByTag, name="threadsbytag"),
+    path("autocomplete/", views.autocomplete, name="autocomplete"),
 ]
@@ -0,0 +1,146 @@
+"""
+Bulk verification of stored question and answer hashes.
+
+``confirm_question`` and ``confirm_answer`` check one row's hash against
+``solidity_keccak(["address", "string"], [wallet, text])`` while confirming it.
+The functions here do the same check for whole tables when reconciling or
+auditing: rows are streamed from the database in chunks and the keccak work is
+spread over a process pool, keeping only a bounded number of chunks in flight.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import os
+
+from eth_hash.auto import keccak
+
+from questions.models import Question, Answer
+
+# Rows per chunk handed to a worker
+VERIFY_CHUNK_SIZE = 2000
+
+
+def expected_hash(wallet, text):
+    """
+    Compute ``solidity_keccak(["address", "string"], [wallet, text])``.
+
+    The packed encoding of an address and a string is just the 20 address
+    bytes followed by the UTF-8 text, so this skips Web3's per-call ABI type
+    validation.
+
+    Args:
+        wallet: The poster's checksummed wallet address
+        text: The post text
+
+    Returns:
+        bytes: The 32 byte hash
+    """
+    return keccak(bytes.fromhex(wallet[2:]) + text.encode("utf-8"))
+
+
+def _check_chunk(rows):
+    """
+    Return the primary keys of rows whose stored hash doesn't match.
+
+    Runs in a worker process, so it only takes and returns plain values.
+
+    Args:
+        rows: List of (pk, wallet, text, stored hash) tuples
+
+    Returns:
+        list: Primary keys of mismatched rows
+    """
+    return [
+        pk
+        for pk, wallet, text, stored in rows
+        if wallet is None or expected_hash(wallet, text) != bytes(stored)
+    ]
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _verify(rows, chunk_size, workers):
+    """
+    Check streamed rows chunk by chunk, in a process pool if workers > 1.
+
+    Args:
+        rows: Iterable of (pk, wallet, text, stored hash) tuples
+        chunk_size: Rows per chunk
+        workers: Worker processes. 0 or 1 checks rows in this process
+
+    Returns:
+        list: Primary keys of mismatched rows, in streaming order
+    """
+    # BinaryField values are memoryviews on PostgreSQL, which can't be pickled
+    # to the workers
+    rows = ((pk, wallet, text, bytes(stored)) for pk, wallet, text, stored in rows)
+    chunks = _chunks(rows, chunk_size)
+    mismatched = []
+    if workers <= 1:
+        for chunk in chunks:
+            mismatched.extend(_check_chunk(chunk))
+        return mismatched
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # keep a couple of chunks queued per worker so the database cursor
+        # isn't drained into memory ahead of the pool
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_check_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                mismatched.extend(pending.popleft().result())
+        while pending:
+            mismatched.extend(pending.popleft().result())
+    return mismatched
+
+
+def verify_question_hashes(queryset=None, chunk_size=VERIFY_CHUNK_SIZE, workers=None):
+    """
+    Find questions whose questionHash doesn't match their asker and text.
+
+    Args:
+        queryset: Questions to check. Defaults to all questions with a hash
+        chunk_size: Rows per chunk
+        workers: Worker processes. Defaults to the CPU count
+
+    Returns:
+        list: Primary keys of mismatched questions
+    """
+    if queryset is None:
+        queryset = Question.objects.all()
+    rows = (
+        queryset.filter(questionHash__isnull=False)
+        .values_list("pk", "asker__wallet", "post__text", "questionHash")
+        .iterator(chunk_size=chunk_size)
+    )
+    return _verify(rows, chunk_size, os.cpu_count() if workers is None else workers)
+
+
+def verify_answer_hashes(queryset=None, chunk_size=VERIFY_CHUNK_SIZE, workers=None):
+    """
+    Find answers whose answerHash doesn't match their answerer and text.
+
+    Args:
+        queryset: Answers to check. Defaults to all answers with a hash
+        chunk_size: Rows per chunk
+        workers: Worker processes. Defaults to the CPU count
+
+    Returns:
+        list: Primary keys of mismatched answers
+    """
+    if queryset is None:
+        queryset = Answer.objects.all()
+    rows = (
+        queryset.filter(answerHash__isnull=False)
+        .values_list("pk", "answerer__wallet", "post__text", "answerHash")
+        .iterator(chunk_size=chunk_size)
+    )
+    return _verify(rows, chunk_size, os.cpu_count() if workers is None else workers)
@@ -12,27 +12,32 @@ from django.db.models import (
     When,
     Q,
     F,
-    Sum,
     Subquery,
     OuterRef,
 )
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework import viewsets
+from asgiref.sync import sync_to_async
 
 import datetime
 import pytz
-import os
-from web3 import Web3
 import json
 import hexbytes
+import base64
 import operator
 from functools import reduce
 import numpy as np
 import logging
 
+from facthound.renderers import FastJsonResponse
 from siweauth.models import User, Nonce
+from siweauth.users import db_user
 from siweauth.auth import IsAdminOrReadOnly
+from siweauth.authentication import CachedJWTAuthentication
 from questions.models import Thread, Post, Question, Answer, Tag
 from questions.serializers import (
     ThreadSerializer,
@@ -45,7 +50,22 @@ from questions.confirm_onchain import (
     confirm_question,
     confirm_answer,
     confirm_selection,
+    aconfirm_question,
+    aconfirm_answer,
+    aconfirm_selection,
 )
+from questions.market import market_stats
+from questions.settings import (
+    OPEN_BOUNTIES_PAGE_SIZE,
+    OPEN_BOUNTIES_MAX_PAGE_SIZE,
+    THREADS_BY_TAG_PAGE_SIZE,
+    THREADS_BY_TAG_MAX_PAGE_SIZE,
+    AUTOCOMPLETE_LIMIT,
+    AUTOCOMPLETE_MAX_LIMIT,
+)
+from questions.tags import TagThread
+from questions.autocomplete import get_autocomplete
+from questions.mixins import FilterFieldsMixin, SparseFieldsMixin, ValuesListMixin
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
@@ -56,16 +76,6 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-w3 = Web3(
-    Web3.HTTPProvider(
-        f"{os.getenv('ALCHEMY_API_ENDPOINT')}/{os.getenv('ALCHEMY_API_KEY')}"
-    )
-)
-with open("contracts/FactHound.json", "rb") as f:
-    facthound_contract = json.load(f)
-facthound_abi = facthound_contract["abi"]
-facthound_bytecode = facthound_contract["bytecode"]["object"]
-
 
 # endpoints for making posts, threads, q + a
 def _make_post(user, text, thread=None, topic=None, tags=None):
@@ -159,7 +169,7 @@ def post(request):
             status=400,
         )
     # make post
-    post = _make_post(request.user, text, thread, topic, tags)
+    post = _make_post(db_user(request.user), text, thread, topic, tags)
 
     return JsonResponse(
         {"message": "success", "thread": post.thread.pk, "post": post.pk}
@@ -184,6 +194,7 @@ def question(request):
         tags: Optional list of tags for the thread
         contractAddress: Optional blockchain contract address
         questionHash: Optional hash of the question for blockchain verification
+        chainId: Optional id of the chain the contract is deployed on
         
     Returns:
         JsonResponse: Success message with thread, post, and question IDs
@@ -202,6 +213,7 @@ def question(request):
     )
     contractAddress = request.data.get("contractAddress")
     questionHash = request.data.get("questionHash")
+    chainId = request.data.get("chainId")
 
     logger.info(
         json.dumps(
@@ -214,12 +226,13 @@ def question(request):
                 "tags": tags,
                 "contractAddress": contractAddress,
                 "questionHash": questionHash,
+                "chainId": chainId,
             }
         )
     )
 
     questionHash = hexbytes.HexBytes(questionHash) if questionHash else None
-    asker = request.user
+    asker = db_user(request.user)
     # check if params make sense
     if text is None:
         return JsonResponse({"message": "Your post needs text."}, status=400)
@@ -230,19 +243,26 @@ def question(request):
             },
             status=400,
         )
+    if chainId is not None:
+        try:
+            chainId = int(chainId)
+        except (TypeError, ValueError):
+            return JsonResponse({"message": "chainId must be an integer."}, status=400)
     if contractAddress:
         confirmed_onchain = False
         status = "OP"
         bounty = None
     else:
         questionHash, bounty, confirmed_onchain, status = None, None, None, "OP"
+        chainId = None
     # make post
-    post = _make_post(request.user, text, thread, topic, tags)
+    post = _make_post(asker, text, thread, topic, tags)
     # make question
     question = Question.objects.create(
         post=post,
         questionHash=questionHash,
         contractAddress=contractAddress,
+        chainId=chainId,
         asker=asker,
         bounty=bounty,
         status=status,
@@ -309,7 +329,7 @@ def answer(request):
 
     questionHash = hexbytes.HexBytes(questionHash) if questionHash else None
     answerHash = hexbytes.HexBytes(answerHash) if answerHash else None
-    answerer = request.user
+    answerer = db_user(request.user)
 
     # Validate basic parameters first
     if text is None:
@@ -360,7 +380,7 @@ def answer(request):
         status = "OP"
         confirmed_onchain = None
     # make post
-    post = _make_post(request.user, text, thread, None, None)
+    post = _make_post(answerer, text, thread, None, None)
     # make answer
     answer = Answer.objects.create(
         post=post,
@@ -434,7 +454,7 @@ def selection(request):
     if question.contractAddress and answer.answerHash:
         answer.selection_confirmed_onchain = False
     else:
-        if question.asker != request.user:
+        if question.asker != db_user(request.user):
             return JsonResponse(
                 {"message": "Only the question's asker can do this."},
                 status=400,
@@ -444,6 +464,8 @@ def selection(request):
     # Set selected answer and question status
     answer.status = "SE"
     question.status = "AS"
+    if question.selected_dt is None:
+        question.selected_dt = datetime.datetime.now(pytz.UTC)
 
     answer.save()
     question.save()
@@ -505,18 +527,92 @@ def confirm(request):
     return JsonResponse(resp, status=200 if success else 400)
 
 
+@csrf_exempt
+@require_POST
+async def aconfirm(request):
+    """
+    Confirm on-chain status of a question, answer, or selection without blocking a worker.
+
+    Endpoint: POST /api/aconfirm/
+
+    Async variant of ``confirm``. Under the ASGI application in facthound/asgi.py the
+    RPC round trips run on the event loop, so one worker can hold many confirmations
+    in flight. Authentication uses the same JWT bearer tokens as the sync endpoints.
+
+    Args:
+        request: HTTP request containing confirmation data
+
+    Request Data:
+        questionHash: Hash of the question
+        answerHash: Optional hash of the answer
+        confirmType: Type of confirmation ('question', 'answer', or 'selection')
+
+    Returns:
+        JsonResponse: Success message or error details
+
+    Status Codes:
+        200: Success
+        400: Failed confirmation
+        401: Missing or invalid credentials
+    """
+    try:
+        # the same authentication class the DRF views use by default
+        auth = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    except AuthenticationFailed as e:
+        return JsonResponse({"detail": str(e.detail)}, status=401)
+    if auth is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+    if request.content_type == "application/json":
+        # a 400 like DRF's JSONParser gives the sync confirm endpoint
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"detail": "JSON parse error."}, status=400)
+        if not isinstance(data, dict):
+            return JsonResponse({"detail": "Expected a JSON object."}, status=400)
+    else:
+        data = request.POST
+    questionHash = (
+        hexbytes.HexBytes(data.get("questionHash"))
+        if data.get("questionHash")
+        else None
+    )
+    answerHash = (
+        hexbytes.HexBytes(data.get("answerHash")) if data.get("answerHash") else None
+    )
+    type = data.get("confirmType")
+    match type:
+        case "question":
+            success, resp = await aconfirm_question(questionHash)
+        case "answer":
+            success, resp = await aconfirm_answer(questionHash, answerHash)
+        case "selection":
+            success, resp = await aconfirm_selection(questionHash, answerHash)
+        case _:
+            success, resp = False, "Unknown confirmType."
+
+    if not isinstance(resp, dict):
+        resp = {"message": resp}
+
+    return JsonResponse(resp, status=200 if success else 400)
+
+
 def annotate_threads(queryset):
     """
     Annotate thread queryset with additional information.
     
     This helper function adds first poster details, bounty totals, and tag information 
-    to thread objects.
+    to thread objects. Bounty totals are read from the precomputed Thread fields
+    (see questions.bounties).
     
     Args:
         queryset: A queryset of Thread objects
         
     Returns:
-        list: List of dictionaries representing the annotated threads
+        list: List of dictionaries representing the annotated threads, built
+            from ``values()`` rows
     """
     queryset = queryset.annotate(
         first_poster_wallet=Subquery(
@@ -529,40 +625,30 @@ def annotate_threads(queryset):
             .order_by("dt")
             .values("poster__username")[:1]
         ),
-        total_bounty_available=Sum(
-            Subquery(
-                Question.objects.filter(
-                    post__thread=OuterRef("pk"), bounty__isnull=False, status="OP"
-                ).values("bounty")
-            )
-        ),
-        total_bounty_claimed=Sum(
-            Subquery(
-                Question.objects.filter(
-                    post__thread=OuterRef("pk"),
-                    bounty__isnull=False,
-                    status__in=["AS", "RS"],
-                ).values("bounty")
-            )
-        ),
     )
 
-    # Manually add tags for each thread
-    threads_with_annotations = []
-    for thread in queryset:
-        thread_dict = {
-            "id": thread.id,
-            "topic": thread.topic,
-            "dt": thread.dt,
-            "first_poster_wallet": thread.first_poster_wallet,
-            "first_poster_name": thread.first_poster_name,
-            "total_bounty_available": thread.total_bounty_available,
-            "total_bounty_claimed": thread.total_bounty_claimed,
-            "tags": list(thread.tag_set.values_list("name", flat=True)),
-        }
-        threads_with_annotations.append(thread_dict)
+    threads = list(
+        queryset.values(
+            "id",
+            "topic",
+            "dt",
+            "first_poster_wallet",
+            "first_poster_name",
+            "total_bounty_available",
+            "total_bounty_claimed",
+        )
+    )
+
+    # tags for every thread in one query
+    tags = {}
+    for thread_id, name in TagThread.objects.filter(
+        thread_id__in=[t["id"] for t in threads]
+    ).values_list("thread_id", "tag__name"):
+        tags.setdefault(thread_id, []).append(name)
+    for thread in threads:
+        thread["tags"] = tags.get(thread["id"], [])
 
-    return threads_with_annotations
+    return threads
 
 
 @api_view(["GET"])
@@ -594,7 +680,7 @@ def threadList(request):
 
     queryset = Thread.objects.all().order_by("-dt")
     threads = annotate_threads(queryset)
-    return JsonResponse({"threads": threads})
+    return FastJsonResponse({"threads": threads})
 
 
 @api_view(["GET"])
@@ -644,55 +730,14 @@ def search(request):
     queryset = queryset.order_by("-dt")
 
     threads = annotate_threads(queryset)
-    return JsonResponse({"search_string": search_string, "threads": threads})
-
+    return FastJsonResponse({"search_string": search_string, "threads": threads})
 
-@api_view(["GET"])
-def threadPosts(request):
-    """
-    Get all posts for a specific thread with additional details.
-    
-    Endpoint: GET /api/thread-posts/
-    
-    Args:
-        request: HTTP request containing thread ID
-        
-    Request Parameters:
-        threadId: ID of the thread to retrieve posts for
-        
-    Returns:
-        JsonResponse: Thread topic and list of posts with additional details
-        
-    Status Codes:
-        200: Success
-        404: Thread not found
-    """
-    threadId = request.query_params.get("threadId")
-
-    logger.info(
-        json.dumps(
-            {
-                "view": "threadPosts",
-                "wallet": (
-                    request.user.wallet if request.user.is_authenticated else None
-                ),
-                "username": (
-                    request.user.username if request.user.is_authenticated else None
-                ),
-                "threadId": threadId,
-            }
-        )
-    )
 
-    response_dict = {}
+def _thread_posts_queryset(threadId):
+    # posts in a thread, annotated with their poster and question details
     queryset = Post.objects.all()
-    threadId = request.query_params.get("threadId")
     if threadId is not None:
         queryset = queryset.filter(thread__pk=threadId)
-        response_dict["threadId"] = threadId
-    if queryset.count() == 0:
-        return JsonResponse({"message": "Thread does not exist"}, status=404)
-    response_dict["threadTopic"] = queryset.first().thread.topic
     queryset = queryset.order_by("dt")
     queryset = queryset.annotate(poster_name=F("poster__username"))
     queryset = queryset.annotate(poster_wallet=F("poster__wallet"))
@@ -741,31 +786,85 @@ def threadPosts(request):
     queryset = queryset.annotate(answer_id=F("answer"))
     queryset = queryset.annotate(answer_hash=F("answer__answerHash"))
 
-    # Convert queryset to list of dicts and handle bytes serialization
-    posts = []
-    for post in queryset:
-        post_dict = {
-            "id": post.id,
-            "text": post.text,
-            "dt": post.dt,
-            "thread_id": post.thread_id,
-            "poster_name": post.poster_name,
-            "poster_id": post.poster.pk,
-            "poster_wallet": post.poster_wallet,
-            "asker_address": post.asker_address,
-            "asker_username": post.asker_username,
-            "answer_status": post.answer_status,
-            "question_status" : post.question_status,
-            "question_id": post.question_id,
-            "question_hash": post.question_hash.hex() if post.question_hash else None,
-            "contract_address": post.contract_address,
-            "bounty": post.bounty,
-            "answer_id": post.answer_id,
-            "answer_hash": post.answer_hash.hex() if post.answer_hash else None,
-        }
-        posts.append(post_dict)
+    return queryset
+
+
+@api_view(["GET"])
+def threadPosts(request):
+    """
+    Get all posts for a specific thread with additional details.
+    
+    Endpoint: GET /api/thread-posts/
+    
+    Args:
+        request: HTTP request containing thread ID
+        
+    Request Parameters:
+        threadId: ID of the thread to retrieve posts for
+        
+    Returns:
+        JsonResponse: Thread topic and list of posts with additional details
+        
+    Status Codes:
+        200: Success
+        404: Thread not found
+    """
+    threadId = request.query_params.get("threadId")
+
+    logger.info(
+        json.dumps(
+            {
+                "view": "threadPosts",
+                "wallet": (
+                    request.user.wallet if request.user.is_authenticated else None
+                ),
+                "username": (
+                    request.user.username if request.user.is_authenticated else None
+                ),
+                "threadId": threadId,
+            }
+        )
+    )
+
+    response_dict = {}
+    if threadId is not None:
+        response_dict["threadId"] = threadId
+    queryset = _thread_posts_queryset(threadId)
+
+    # build rows straight from values() and hex the hashes
+    posts = list(
+        queryset.values(
+            "id",
+            "text",
+            "dt",
+            "thread_id",
+            "poster_name",
+            "poster_id",
+            "poster_wallet",
+            "asker_address",
+            "asker_username",
+            "answer_status",
+            "question_status",
+            "question_id",
+            "question_hash",
+            "contract_address",
+            "bounty",
+            "answer_id",
+            "answer_hash",
+        )
+    )
+    if not posts:
+        return JsonResponse({"message": "Thread does not exist"}, status=404)
+    for post in posts:
+        if post["question_hash"]:
+            post["question_hash"] = bytes(post["question_hash"]).hex()
+        if post["answer_hash"]:
+            post["answer_hash"] = bytes(post["answer_hash"]).hex()
+    response_dict["threadTopic"] = Thread.objects.values_list(
+        "topic", flat=True
+    ).get(pk=posts[0]["thread_id"])
     response_dict["posts"] = posts
-    return JsonResponse(response_dict)
+    return FastJsonResponse(response_dict)
 
 
 @api_view(["GET"])
@@ -811,58 +910,67 @@ def userHistory(request):
     except User.DoesNotExist:
         return JsonResponse({"message": "User not found"}, status=404)
 
-    # Get all questions and answers
-    questions = Question.objects.filter(asker=user).order_by("-post__dt")
-    answers = Answer.objects.filter(answerer=user).order_by("-post__dt")
-
+    # Get all questions and answers as values() rows, renamed to the
+    # response keys
+    question_columns = {
+        "id": "post_id",
+        "text": "post__text",
+        "dt": "post__dt",
+        "thread_id": "post__thread_id",
+        "poster_id": "post__poster_id",
+        "poster_name": "post__poster__username",
+        "poster_wallet": "post__poster__wallet",
+        "asker_address": "asker__wallet",
+        "asker_username": "asker__username",
+        "question_status": "status",
+        "question_id": "pk",
+        "question_hash": "questionHash",
+        "contract_address": "contractAddress",
+        "bounty": "bounty",
+    }
     questions_data = [
-        {
-            "id": q.post.id,
-            "text": q.post.text,
-            "dt": q.post.dt,
-            "thread_id": q.post.thread.id,
-            "poster_id": q.post.poster.pk,
-            "poster_name": q.post.poster.username,
-            "poster_wallet": q.post.poster.wallet,
-            "asker_address": q.asker.wallet,
-            "asker_username": q.asker.username,
-            "answer_status": None,
-            "question_status" : q.status,
-            "question_id": q.id,
-            "question_hash": q.questionHash.hex() if q.questionHash else None,
-            "contract_address": q.contractAddress,
-            "bounty": q.bounty,
-            "answer_id": None,
-            "answer_hash": None,
-        }
-        for q in questions
+        {key: row[column] for key, column in question_columns.items()}
+        for row in Question.objects.filter(asker=user)
+        .order_by("-post__dt")
+        .values(*question_columns.values())
     ]
-
+    for q in questions_data:
+        q["question_hash"] = bytes(q["question_hash"]).hex() if q["question_hash"] else None
+        q["answer_status"] = None
+        q["answer_id"] = None
+        q["answer_hash"] = None
+
+    answer_columns = {
+        "id": "post_id",
+        "text": "post__text",
+        "dt": "post__dt",
+        "thread_id": "post__thread_id",
+        "poster_name": "post__poster__username",
+        "poster_id": "post__poster_id",
+        "poster_wallet": "post__poster__wallet",
+        "asker_address": "question__asker__wallet",
+        "asker_username": "question__asker__username",
+        "answer_status": "status",
+        "question_status": "question__status",
+        "question_id": "question_id",
+        "question_hash": "question__questionHash",
+        "contract_address": "question__contractAddress",
+        "bounty": "question__bounty",
+        "answer_id": "pk",
+        "answer_hash": "answerHash",
+        "thread_topic": "post__thread__topic",
+    }
     answers_data = [
-        {
-            "id": a.post.id,
-            "text": a.post.text,
-            "dt": a.post.dt,
-            "thread_id": a.post.thread.id,
-            "poster_name": a.post.poster.username,
-            "poster_id": a.post.poster.pk,
-            "poster_wallet": a.post.poster.wallet,
-            "asker_address": a.question.asker.wallet,
-            "asker_username": a.question.asker.username,
-            "answer_status": a.status,
-            "question_status" : a.question.status,
-            "question_id": a.question.id,
-            "question_hash": a.question.questionHash.hex() if a.question.questionHash else None,
-            "contract_address": a.question.contractAddress,
-            "bounty": a.question.bounty,
-            "answer_id": a.id,
-            "answer_hash": a.answerHash.hex() if a.answerHash else None,
-            "thread_topic": a.post.thread.topic,
-        }
-        for a in answers
+        {key: row[column] for key, column in answer_columns.items()}
+        for row in Answer.objects.filter(answerer=user)
+        .order_by("-post__dt")
+        .values(*answer_columns.values())
     ]
+    for a in answers_data:
+        a["question_hash"] = bytes(a["question_hash"]).hex() if a["question_hash"] else None
+        a["answer_hash"] = bytes(a["answer_hash"]).hex() if a["answer_hash"] else None
 
-    return JsonResponse(
+    return FastJsonResponse(
         {
             "userid": user.pk,
             "username": user.username,
@@ -873,10 +981,321 @@ def userHistory(request):
     )
 
 
-# viewsets for simple crud.
+@api_view(["GET"])
+def market(request):
+    """
+    Get bounty market statistics.
 
+    Endpoint: GET /api/market/
 
-class ThreadViewSet(viewsets.ModelViewSet):
+    Open and claimed bounty totals are current; the other figures and the
+    time-bucketed series come from the last ``refresh_market_stats`` run.
+
+    Args:
+        request: HTTP request
+
+    Returns:
+        JsonResponse: Market totals, answers per question, median time to
+            selection in seconds, and a per-period series
+    """
+    logger.info(
+        json.dumps(
+            {
+                "view": "market",
+                "wallet": (
+                    request.user.wallet if request.user.is_authenticated else None
+                ),
+                "username": (
+                    request.user.username if request.user.is_authenticated else None
+                ),
+            }
+        )
+    )
+
+    return JsonResponse(market_stats())
+
+
+def _encode_bounty_cursor(bounty, pk):
+    return base64.urlsafe_b64encode(f"{bounty}:{pk}".encode()).decode()
+
+
+def _decode_bounty_cursor(cursor):
+    bounty, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+    return int(bounty), int(pk)
+
+
+@api_view(["GET"])
+def openBounties(request):
+    """
+    List open questions with a bounty, largest bounty first.
+
+    Endpoint: GET /api/openbounties/
+
+    Pages are keyset paginated on (bounty, id) and served from the partial
+    ``open_bounty_idx`` index, so the cost of a page doesn't depend on how
+    deep it is or how many questions have been resolved.
+
+    Args:
+        request: HTTP request
+
+    Request Parameters:
+        tag: Optional tag name to filter threads by
+        cursor: The ``next`` value from the previous page
+        limit: Page size, up to OPEN_BOUNTIES_MAX_PAGE_SIZE
+
+    Returns:
+        JsonResponse: A page of questions and the cursor of the next page
+
+    Status Codes:
+        200: Success
+        400: Invalid cursor or limit
+    """
+    tag = request.query_params.get("tag")
+    cursor = request.query_params.get("cursor")
+
+    logger.info(
+        json.dumps(
+            {
+                "view": "openBounties",
+                "wallet": (
+                    request.user.wallet if request.user.is_authenticated else None
+                ),
+                "username": (
+                    request.user.username if request.user.is_authenticated else None
+                ),
+                "tag": tag,
+                "cursor": cursor,
+            }
+        )
+    )
+
+    try:
+        limit = int(request.query_params.get("limit", OPEN_BOUNTIES_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"message": "limit must be an integer."}, status=400)
+    limit = max(1, min(limit, OPEN_BOUNTIES_MAX_PAGE_SIZE))
+
+    queryset = Question.objects.filter(status="OP", bounty__isnull=False)
+    if tag:
+        queryset = queryset.filter(
+            # tags are stored lowercased, as in threadsByTag
+            post__thread__in=Tag.objects.filter(name=tag.lower()).values("thread")
+        )
+    if cursor:
+        try:
+            bounty, pk = _decode_bounty_cursor(cursor)
+        except ValueError:
+            return JsonResponse({"message": "Invalid cursor."}, status=400)
+        queryset = queryset.filter(Q(bounty__lt=bounty) | Q(bounty=bounty, pk__lt=pk))
+    rows = list(
+        queryset.order_by("-bounty", "-pk").values(
+            "pk",
+            "bounty",
+            "questionHash",
+            "contractAddress",
+            "post__thread",
+            "post__thread__topic",
+            "post__text",
+            "post__dt",
+            "asker__wallet",
+            "asker__username",
+        )[: limit + 1]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_bounty_cursor(rows[-1]["bounty"], rows[-1]["pk"])
+
+    questions = [
+        {
+            "question_id": row["pk"],
+            "bounty": row["bounty"],
+            "question_hash": row["questionHash"].hex() if row["questionHash"] else None,
+            "contract_address": row["contractAddress"],
+            "thread_id": row["post__thread"],
+            "thread_topic": row["post__thread__topic"],
+            "text": row["post__text"],
+            "dt": row["post__dt"],
+            "asker_address": row["asker__wallet"],
+            "asker_username": row["asker__username"],
+        }
+        for row in rows
+    ]
+    return FastJsonResponse({"questions": questions, "next": next_cursor})
+
+
+@api_view(["GET"])
+def tagDirectory(request):
+    """
+    List tags with their thread counts and open bounty totals.
+
+    Endpoint: GET /api/tagdirectory/
+
+    The counts and totals are precomputed on the tags (see questions.tags), so
+    this reads only the tag table.
+
+    Args:
+        request: HTTP request
+
+    Returns:
+        JsonResponse: Tags ordered by thread count, most used first
+    """
+    logger.info(
+        json.dumps(
+            {
+                "view": "tagDirectory",
+                "wallet": (
+                    request.user.wallet if request.user.is_authenticated else None
+                ),
+                "username": (
+                    request.user.username if request.user.is_authenticated else None
+                ),
+            }
+        )
+    )
+
+    tags = list(
+        Tag.objects.order_by("-thread_count", "name").values(
+            "name", "thread_count", "open_bounty"
+        )
+    )
+    return JsonResponse({"tags": tags})
+
+
+@api_view(["GET"])
+def threadsByTag(request):
+    """
+    List the threads with a tag, newest first.
+
+    Endpoint: GET /api/threadsbytag/
+
+    Pages are keyset paginated on thread id and read from the unique
+    (tag, thread) index of the tag-thread table.
+
+    Args:
+        request: HTTP request
+
+    Request Parameters:
+        tag: The tag name
+        cursor: The ``next`` value from the previous page
+        limit: Page size, up to THREADS_BY_TAG_MAX_PAGE_SIZE
+
+    Returns:
+        JsonResponse: A page of annotated threads and the cursor of the next page
+
+    Status Codes:
+        200: Success
+        400: Missing tag, or invalid cursor or limit
+    """
+    tag = request.query_params.get("tag")
+    cursor = request.query_params.get("cursor")
+
+    logger.info(
+        json.dumps(
+            {
+                "view": "threadsByTag",
+                "wallet": (
+                    request.user.wallet if request.user.is_authenticated else None
+                ),
+                "username": (
+                    request.user.username if request.user.is_authenticated else None
+                ),
+                "tag": tag,
+                "cursor": cursor,
+            }
+        )
+    )
+
+    if not tag:
+        return JsonResponse({"message": "tag is required."}, status=400)
+    try:
+        limit = int(request.query_params.get("limit", THREADS_BY_TAG_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({"message": "limit must be an integer."}, status=400)
+    limit = max(1, min(limit, THREADS_BY_TAG_MAX_PAGE_SIZE))
+
+    links = TagThread.objects.filter(
+        tag_id__in=list(Tag.objects.filter(name=tag.lower()).values_list("pk", flat=True))
+    )
+    if cursor:
+        try:
+            links = links.filter(thread_id__lt=int(cursor))
+        except ValueError:
+            return JsonResponse({"message": "Invalid cursor."}, status=400)
+    thread_ids = list(
+        links.order_by("-thread_id")
+        .values_list("thread_id", flat=True)
+        .distinct()[: limit + 1]
+    )
+    next_cursor = None
+    if len(thread_ids) > limit:
+        thread_ids = thread_ids[:limit]
+        next_cursor = str(thread_ids[-1])
+
+    threads = annotate_threads(Thread.objects.filter(pk__in=thread_ids).order_by("-pk"))
+    return FastJsonResponse({"tag": tag, "threads": threads, "next": next_cursor})
+
+
+@api_view(["GET"])
+def autocomplete(request):
+    """
+    Suggest tags and thread topics for search-as-you-type.
+
+    Endpoint: GET /api/autocomplete/
+
+    Served from an in-memory prefix index (see questions.autocomplete), so no
+    query runs per keystroke. Tags match on a prefix of their name and rank by
+    thread count; topics match on a prefix of any word and rank newest first.
+
+    Args:
+        request: HTTP request
+
+    Request Parameters:
+        q: The typed text
+        limit: Suggestions of each kind, up to AUTOCOMPLETE_MAX_LIMIT
+
+    Returns:
+        JsonResponse: The query and lists of tag and topic suggestions
+
+    Status Codes:
+        200: Success
+        400: Invalid limit
+    """
+    q = request.query_params.get("q", "").strip()
+
+    logger.info(
+        json.dumps(
+            {
+                "view": "autocomplete",
+                "wallet": (
+                    request.user.wallet if request.user.is_authenticated else None
+                ),
+                "username": (
+                    request.user.username if request.user.is_authenticated else None
+                ),
+                "q": q,
+            }
+        )
+    )
+
+    try:
+        limit = int(request.query_params.get("limit", AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        return JsonResponse({"message": "limit must be an integer."}, status=400)
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+    if not q:
+        return JsonResponse({"q": q, "tags": [], "topics": []})
+    return JsonResponse({"q": q, **get_autocomplete().suggest(q, limit)})
+
+
+# viewsets for simple crud. list responses are cursor paginated (see
+# questions.pagination), accept fields=a,b,c to select columns, and filter on
+# the keys in filter_fields.
+
+
+class ThreadViewSet(
+    ValuesListMixin, SparseFieldsMixin, FilterFieldsMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows Thread objects to be viewed or edited.
     
@@ -884,12 +1303,16 @@ class ThreadViewSet(viewsets.ModelViewSet):
     Only admin users can modify threads; others have read-only access.
     """
 
-    queryset = Thread.objects.all().order_by("-dt")
+    queryset = Thread.objects.all()
     serializer_class = ThreadSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "-dt"
+    filter_fields = {"tag": "tag__name"}
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(
+    ValuesListMixin, SparseFieldsMixin, FilterFieldsMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows Post objects to be viewed or edited.
     
@@ -897,12 +1320,16 @@ class PostViewSet(viewsets.ModelViewSet):
     Only admin users can modify posts; others have read-only access.
     """
 
-    queryset = Post.objects.all().order_by("-dt")
+    queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "-dt"
+    filter_fields = {"thread": "thread", "poster": "poster"}
 
 
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(
+    ValuesListMixin, SparseFieldsMixin, FilterFieldsMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows Question objects to be viewed or edited.
     
@@ -910,12 +1337,20 @@ class QuestionViewSet(viewsets.ModelViewSet):
     Only admin users can modify questions; others have read-only access.
     """
 
-    queryset = Question.objects.all().order_by("-post__dt")
+    queryset = Question.objects.all()
     serializer_class = QuestionSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "-pk"
+    filter_fields = {
+        "thread": "post__thread",
+        "asker": "asker",
+        "status": "status",
+    }
 
 
-class AnswerViewSet(viewsets.ModelViewSet):
+class AnswerViewSet(
+    ValuesListMixin, SparseFieldsMixin, FilterFieldsMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows Answer objects to be viewed or edited.
     
@@ -923,12 +1358,21 @@ class AnswerViewSet(viewsets.ModelViewSet):
     Only admin users can modify answers; others have read-only access.
     """
 
-    queryset = Answer.objects.all().order_by("-post__dt")
+    queryset = Answer.objects.all()
     serializer_class = AnswerSerializer
     permission_classes = [IsAdminOrReadOnly]
-
-
-class TagViewSet(viewsets.ModelViewSet):
+    cursor_ordering = "-pk"
+    filter_fields = {
+        "thread": "post__thread",
+        "question": "question",
+        "answerer": "answerer",
+        "status": "status",
+    }
+
+
+class TagViewSet(
+    ValuesListMixin, SparseFieldsMixin, FilterFieldsMixin, viewsets.ModelViewSet
+):
     """
     API endpoint that allows Tag objects to be viewed or edited.
     
@@ -936,6 +1380,8 @@ class TagViewSet(viewsets.ModelViewSet):
     Only admin users can modify tags; others have read-only access.
     """
 
-    queryset = Tag.objects.all().order_by("name")
+    queryset = Tag.objects.prefetch_related("thread")
     serializer_class = TagSerializer
     permission_classes = [IsAdminOrReadOnly]
+    cursor_ordering = "name"
+    filter_fields = {"name": "name"}
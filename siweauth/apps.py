@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SiweauthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'siweauth'
+
+    def ready(self):
+        # connect the user cache's signal receivers and register the checks
+        from siweauth import checks, users  # noqa: F401
@@ -2,22 +2,13 @@ from django.http import JsonResponse
 from rest_framework import permissions
 
 from functools import wraps
-import datetime, pytz
 from web3 import Web3
-from hexbytes import HexBytes
-from eth_account.messages import SignableMessage
-from eth_account.messages import encode_defunct
-from eth_account.datastructures import SignedMessage
-from datetime import datetime
 
 
-from siweauth.settings import (
-    SIWE_MESSAGE_VALIDITY,
-    SIWE_CHAIN_ID,
-    SIWE_DOMAIN,
-    SIWE_URI,
-)
-from siweauth.models import Nonce, User
+from siweauth.message import parse_siwe_message, siwe_message_is_acceptable
+from siweauth.users import is_admin_user
+from siweauth.nonces import get_nonce_store
+from siweauth.verify import get_verifier
 
 
 w3 = Web3()
@@ -25,17 +16,11 @@ w3 = Web3()
 
 def _nonce_is_valid(nonce: str) -> bool:
     """
-    Check if given nonce exists and has not yet expired.
+    Check if given nonce exists and has not yet expired, using it up.
     :param nonce: The nonce string to validate.
     :return: True if valid else False.
     """
-    n = Nonce.objects.filter(value=nonce).first()
-    is_valid = False
-    if n is not None:
-        if n.expiration > datetime.now(tz=pytz.UTC):
-            is_valid = True
-        n.delete()
-    return is_valid
+    return get_nonce_store().consume(nonce)
 
 
 def request_passes_test(test_func, fail_message):
@@ -57,68 +42,38 @@ def request_passes_test(test_func, fail_message):
     return decorator
 
 
-def parse_siwe_message(message_body: str) -> dict:
-    """Parse SIWE message into components"""
-    lines = message_body.split("\n")
-    try:
-        domain = lines[0].split(" ")[0]
-        address = lines[1].strip()
-        uri = lines[5].split(": ")[1].strip()
-        chain_id = int(lines[7].split(": ")[1])
-        nonce = lines[8].split(": ")[1].strip()
-        issued_at = datetime.fromisoformat(lines[9].split(": ")[1].strip())
-
-        return {
-            "domain": domain,
-            "address": address,
-            "uri": uri,
-            "chain_id": chain_id,
-            "nonce": nonce,
-            "issued_at": issued_at,
-        }
-    except (IndexError, ValueError):
-        return None
+def check_for_siwe(message, signed_message):
+    """
+    Verify a SIWE message and its signature, consuming its nonce.
 
+    Checks run cheapest first: the message is parsed and its domain, URI,
+    chain id and timestamps checked before the nonce is looked up, and the
+    signature is only recovered for a message with a live nonce.
 
-def check_for_siwe(message, signed_message):
-    # check for format
-    if type(message) != str:
-        body = str(message.decode())
+    Args:
+        message: The EIP-4361 message, as text or UTF-8 bytes
+        signed_message: The signature
+
+    Returns:
+        str: The signer's address, or None if any check fails
+    """
+    if isinstance(message, (bytes, bytearray)):
+        try:
+            body = bytes(message).decode()
+        except UnicodeDecodeError:
+            return None
     else:
         body = message
-    len(body.split("\n")) >= 7
-    # Parse message components
     parsed = parse_siwe_message(body)
-    if not parsed:
-        return None
-    # Validate message components
-    # Validate timestamp
-    now = datetime.now(parsed["issued_at"].tzinfo)
-    if abs((now - parsed["issued_at"]).total_seconds()) > SIWE_MESSAGE_VALIDITY * 60:
-        return None
-
-    # Validate chain ID
-    # TODO multi-chain support
-    if parsed["chain_id"] != SIWE_CHAIN_ID:
-        return None
-
-    # Validate domain and URI
-    if parsed["domain"] != SIWE_DOMAIN or parsed["uri"] != SIWE_URI:
+    if parsed is None or not siwe_message_is_acceptable(parsed):
         return None
-
     # check for nonce in db
     if not _nonce_is_valid(parsed["nonce"]):
         return None
     # recover address from nonce / signed message
-    address = parsed["address"]
-    try:
-        recovered_address = w3.eth.account.recover_message(
-            signable_message=encode_defunct(text=body), signature=HexBytes(signed_message)
-        )
-    except:
-        return None
+    recovered_address = get_verifier().recover(body, signed_message)
     # make sure recovered address is correct
-    if address != recovered_address:
+    if recovered_address is None or parsed["address"] != recovered_address:
         return None
     return recovered_address
 
@@ -136,23 +91,23 @@ def siwe_required(function=None):
 
 class IsAdminOrReadOnly(permissions.BasePermission):
     """
-    Object-level permission to only allow admins to edit objects.
+    Allow anyone to read, and only admins to write.
+
+    Admin status is checked against the authenticated user's id in the
+    cached admin set (see siweauth.users.admin_ids), so a write costs no
+    query while the set is fresh.
     """
 
-    def has_object_permission(self, request, view, obj):
+    def has_permission(self, request, view):
         # Read permissions are allowed to any request,
         # so we'll always allow GET, HEAD or OPTIONS requests.
         if request.method in permissions.SAFE_METHODS:
             return True
+        # Otherwise see if this user is an admin
+        return is_admin_user(request.user)
 
-        # Otherwise see if this wallet is an admin
-        check_for_siwe(request)
-        address = request.GET.get("address") or request.POST.get("address")
-        if address:
-            return len(User.filter(wallet=address, is_admin=True)) > 0
-        username = request.GET.get("username") or request.POST.get("username")
-        if address:
-            return len(User.filter(username=username, is_admin=True)) > 0
+    def has_object_permission(self, request, view, obj):
+        return self.has_permission(request, view)
 
 
 # TODO for posting question/answers, verify chain state
@@ -0,0 +1,116 @@
+"""
+JWT authentication for the API.
+
+``CachedJWTAuthentication`` is simplejwt's ``JWTAuthentication`` with the
+user looked up through the user cache (siweauth.users) instead of a query per
+request.
+
+``TokenUserAuthentication`` is stateless: ``request.user`` is a ``WalletTokenUser``
+built from the token's claims (see siweauth.serializers.add_user_claims), and
+the user row is only loaded when something other than the claims is needed.
+Claims are fixed at login, so a deleted user or a changed wallet or username
+is only seen once the refresh token expires. Enable it with::
+
+    REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = (
+        "siweauth.authentication.TokenUserAuthentication",
+    )
+"""
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import (
+    JWTAuthentication,
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from siweauth.users import get_user_by_id
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication resolving users from the user cache.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = get_user_by_id(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class WalletTokenUser(TokenUser):
+    """
+    A user backed by a token's claims.
+
+    ``wallet``, ``username`` and ``is_admin`` come from the token. Any other
+    attribute, and these three for tokens issued without the claims, are read
+    from the user row, loaded once through the user cache.
+    """
+
+    @property
+    def wallet(self):
+        return self._claim("wallet")
+
+    @property
+    def username(self):
+        return self._claim("username")
+
+    @property
+    def is_admin(self):
+        return bool(self._claim("is_admin"))
+
+    def _claim(self, name):
+        if name in self.token:
+            return self.token[name]
+        return getattr(self.get_user(), name, None)
+
+    def get_user(self):
+        """
+        Return the user row for this token, loading it on first use.
+
+        Returns:
+            User: The user, or None if it no longer exists
+        """
+        if not hasattr(self, "_user"):
+            self._user = get_user_by_id(self.pk)
+        return self._user
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.get_user(), attr, None)
+
+
+class TokenUserAuthentication(JWTStatelessUserAuthentication):
+    """
+    Stateless JWT authentication serving ``WalletTokenUser`` users.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        return WalletTokenUser(validated_token)
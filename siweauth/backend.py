@@ -2,17 +2,20 @@
 Custom authentication backend for Sign-In with Ethereum (SIWE).
 
 This module provides an authentication backend that validates SIWE messages
-and signatures to authenticate users by their Ethereum wallet addresses.
+and signatures to authenticate users by their Ethereum wallet addresses, and a
+username/password backend that hashes off the request thread.
 """
 
-from django.contrib.auth.backends import BaseBackend
+from django.contrib.auth.backends import BaseBackend, ModelBackend
 
 from web3 import Web3
 from eth_account.messages import SignableMessage
 import logging
 
-from siweauth.models import User
 from siweauth.auth import check_for_siwe
+from siweauth.models import User
+from siweauth.passwords import check_user_password
+from siweauth.users import get_or_create_wallet_user, get_user_by_id
 
 
 logger = logging.getLogger(__name__)
@@ -59,12 +62,8 @@ class SiweBackend(BaseBackend):
         recovered_address = check_for_siwe(message, signed_message)
         if recovered_address is None:
             return None
-        # if user exists, return user
-        user = User.objects.filter(wallet=recovered_address).first()
-        # if user doesn't exist, make a user for this wallet
-        if user is None:
-            user = User.objects.create_user_address(recovered_address)
-        return user
+        # return the wallet's user, making one if this is its first login
+        return get_or_create_wallet_user(recovered_address)
 
     def get_user(self, user_id):
         """
@@ -76,7 +75,34 @@ class SiweBackend(BaseBackend):
         Returns:
             User: The user with the given ID, or None if not found
         """
-        try:
-            return User.objects.get(pk=user_id)
-        except User.DoesNotExist:
+        return get_user_by_id(user_id)
+
+
+class PasswordBackend(ModelBackend):
+    """
+    Username/password authentication with hashing done by siweauth.passwords.
+
+    Behaves like Django's ModelBackend, but the password check runs wherever
+    ``PASSWORD_HASH_POOL`` puts it instead of always on the request thread.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        """
+        Authenticate a user by username and password.
+
+        Args:
+            request: The HTTP request
+            username: The username
+            password: The raw password
+
+        Returns:
+            User: The authenticated user, or None if authentication fails
+        """
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
             return None
+        user = User.objects.filter(**{User.USERNAME_FIELD: username}).first()
+        if check_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
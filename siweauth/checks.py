@@ -0,0 +1,34 @@
+"""
+System checks for siweauth settings.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+from siweauth.settings import RATE_LIMIT_ENABLED, RATE_LIMIT_CACHE
+
+# caches that live in one process, so each worker would keep its own buckets
+_PROCESS_LOCAL = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register()
+def check_rate_limit_cache(app_configs, **kwargs):
+    """
+    Refuse rate limiting with buckets that aren't shared between processes.
+    """
+    if not RATE_LIMIT_ENABLED:
+        return []
+    backend = settings.CACHES.get(RATE_LIMIT_CACHE, {}).get("BACKEND")
+    if backend in _PROCESS_LOCAL:
+        return [
+            Error(
+                f"RATE_LIMIT_CACHE {RATE_LIMIT_CACHE!r} uses {backend}, so every "
+                "worker process would keep its own rate limit buckets.",
+                hint="Point RATE_LIMIT_CACHE at a Redis or database cache.",
+                id="siweauth.E001",
+            )
+        ]
+    return []
@@ -0,0 +1,19 @@
+"""
+Password hashers for the "fast" hasher profile.
+"""
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class FastPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 with a small work factor, for development and test runs only.
+
+    It has its own algorithm name, so its hashes are never taken for full
+    strength PBKDF2 ones or the other way round. Being the preferred hasher of
+    its profile, it still rehashes other passwords at login, which is why that
+    profile needs DEBUG.
+    """
+
+    algorithm = "pbkdf2_sha256_fast"
+    iterations = 1000
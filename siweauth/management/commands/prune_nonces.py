@@ -0,0 +1,17 @@
+"""
+Delete expired SIWE nonces from the configured nonce store.
+
+Meant to run periodically (e.g. from cron) when the database nonce store is
+in use; the cache store expires nonces on its own.
+"""
+
+from django.core.management.base import BaseCommand
+
+from siweauth.nonces import get_nonce_store
+
+
+class Command(BaseCommand):
+    help = "Delete expired SIWE nonces."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{get_nonce_store().prune()} expired nonces deleted")
@@ -0,0 +1,17 @@
+"""
+Delete revocations of refresh tokens that have expired.
+
+Meant to run periodically (e.g. from cron) when the database revocation store
+is in use; the cache store expires entries on its own.
+"""
+
+from django.core.management.base import BaseCommand
+
+from siweauth.revocation import get_revocation_store
+
+
+class Command(BaseCommand):
+    help = "Delete revocations of expired refresh tokens."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{get_revocation_store().prune()} expired revocations deleted")
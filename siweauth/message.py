@@ -0,0 +1,167 @@
+"""
+Parsing and cheap validation of Sign-In with Ethereum (EIP-4361) messages.
+
+``parse_siwe_message`` reads the message by its field tags rather than by line
+position, so the optional statement, expiration time, not before, request id
+and resources are all accepted. ``siwe_message_is_acceptable`` then checks
+everything that can be checked from the message alone (domain, URI, chain id,
+timestamps), so malformed or misdirected logins are rejected before any
+database access or signature recovery.
+"""
+
+from datetime import datetime
+import re
+
+from siweauth.settings import (
+    SIWE_MESSAGE_VALIDITY,
+    SIWE_CHAIN_IDS,
+    SIWE_DOMAIN,
+    SIWE_URI,
+    SIWE_MAX_MESSAGE_LENGTH,
+)
+
+_HEADER = re.compile(
+    r"^(?:(?P<scheme>[A-Za-z][A-Za-z0-9+.-]*)://)?(?P<domain>[^\s/?#]+)"
+    r" wants you to sign in with your Ethereum account:$"
+)
+_ADDRESS = re.compile(r"^0x[0-9a-fA-F]{40}$")
+_NONCE = re.compile(r"^[A-Za-z0-9]{8,}$")
+_CHAIN_ID = re.compile(r"^[0-9]{1,20}$")
+
+# tagged fields in the order EIP-4361 lists them: (tag, key, required)
+_FIELDS = [
+    ("URI", "uri", True),
+    ("Version", "version", True),
+    ("Chain ID", "chain_id", True),
+    ("Nonce", "nonce", True),
+    ("Issued At", "issued_at", True),
+    ("Expiration Time", "expiration_time", False),
+    ("Not Before", "not_before", False),
+    ("Request ID", "request_id", False),
+]
+_TIMESTAMPS = ("issued_at", "expiration_time", "not_before")
+
+
+def _timestamp(value):
+    # RFC 3339, plus Python's str(datetime) form; a trailing Z is UTC
+    if not value or len(value) > 40:
+        raise ValueError(value)
+    return datetime.fromisoformat(value)
+
+
+def parse_siwe_message(message_body: str) -> dict:
+    """
+    Parse an EIP-4361 message into its fields.
+
+    Args:
+        message_body: The message text
+
+    Returns:
+        dict: domain, scheme, address, statement, uri, version, chain_id,
+            nonce, issued_at, expiration_time, not_before, request_id and
+            resources, with missing optional fields as None (resources as an
+            empty list). None if the message is malformed
+    """
+    if not isinstance(message_body, str) or len(message_body) > SIWE_MAX_MESSAGE_LENGTH:
+        return None
+    lines = message_body.replace("\r\n", "\n").split("\n")
+    # ignore trailing blank lines
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if len(lines) < 7:
+        return None
+
+    header = _HEADER.match(lines[0])
+    address = lines[1].strip()
+    if header is None or not _ADDRESS.match(address):
+        return None
+    parsed = {
+        "domain": header["domain"],
+        "scheme": header["scheme"],
+        "address": address,
+        "statement": None,
+        "resources": [],
+    }
+
+    # the statement, if any, sits between blank lines before the URI
+    i = 2
+    statement = []
+    while i < len(lines) and not lines[i].startswith("URI: "):
+        statement.append(lines[i])
+        i += 1
+    statement = "\n".join(statement).strip()
+    if "\n" in statement:
+        return None
+    parsed["statement"] = statement or None
+
+    for tag, key, required in _FIELDS:
+        prefix = f"{tag}: "
+        if i < len(lines) and lines[i].startswith(prefix):
+            parsed[key] = lines[i][len(prefix):].strip()
+            i += 1
+        elif required:
+            return None
+        else:
+            parsed[key] = None
+
+    if i < len(lines):
+        if lines[i] != "Resources:":
+            return None
+        for line in lines[i + 1:]:
+            if not line.startswith("- ") or not line[2:].strip():
+                return None
+            parsed["resources"].append(line[2:].strip())
+
+    if (
+        parsed["version"] != "1"
+        or not _CHAIN_ID.match(parsed["chain_id"])
+        or not _NONCE.match(parsed["nonce"])
+        or not parsed["uri"]
+    ):
+        return None
+    parsed["chain_id"] = int(parsed["chain_id"])
+    try:
+        for key in _TIMESTAMPS:
+            if parsed[key] is not None:
+                parsed[key] = _timestamp(parsed[key])
+    except ValueError:
+        return None
+    return parsed
+
+
+def _now_like(value):
+    # compare naive timestamps in local time, as datetime.now() writes them
+    return datetime.now(value.tzinfo)
+
+
+def siwe_message_is_acceptable(parsed: dict) -> bool:
+    """
+    Check the parts of a parsed message that don't need the database or the
+    signature: domain, URI, chain id and timestamps.
+
+    Args:
+        parsed: Output of ``parse_siwe_message``
+
+    Returns:
+        bool: True if the message may be checked further
+    """
+    if parsed["domain"] != SIWE_DOMAIN or parsed["uri"] != SIWE_URI:
+        return False
+    if parsed["chain_id"] not in SIWE_CHAIN_IDS:
+        return False
+    issued_at = parsed["issued_at"]
+    try:
+        if (
+            abs((_now_like(issued_at) - issued_at).total_seconds())
+            > SIWE_MESSAGE_VALIDITY * 60
+        ):
+            return False
+        expiration_time = parsed["expiration_time"]
+        if expiration_time is not None and _now_like(expiration_time) >= expiration_time:
+            return False
+        not_before = parsed["not_before"]
+        if not_before is not None and _now_like(not_before) < not_before:
+            return False
+    except (OverflowError, ValueError):
+        return False
+    return True
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('siweauth', '0004_user_is_staff'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='nonce',
+            name='expiration',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
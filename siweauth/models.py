@@ -2,16 +2,18 @@
 Database models for the Sign-In with Ethereum (SIWE) authentication system.
 
 This module defines the User model with both traditional and Ethereum wallet authentication,
-as well as the Nonce model for securing SIWE authentication requests.
+as well as the Nonce model for securing SIWE authentication requests and the
+RevokedToken model for refresh token revocation.
 """
 
 from django.db import models
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser
-from django.contrib.auth.hashers import make_password
 from web3 import Web3
 
+from siweauth.passwords import hash_password
+
 
 def validate_ethereum_address(value):
     """
@@ -35,12 +37,26 @@ class Nonce(models.Model):
     authentication and have expiration times.
     """
     value = models.CharField(max_length=24, primary_key=True)
-    expiration = models.DateTimeField()
+    expiration = models.DateTimeField(db_index=True)
 
     def __str__(self):
         return self.value
 
 
+class RevokedToken(models.Model):
+    """
+    A revoked refresh token, kept until the token would have expired.
+
+    Only revoked tokens are stored, keyed by their ``jti`` claim, and rows
+    are deleted in bulk once past their expiration (see siweauth.revocation).
+    """
+    jti = models.CharField(max_length=64, primary_key=True)
+    expiration = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return self.jti
+
+
 class UserManager(BaseUserManager):
     """
     Manager for the custom User model.
@@ -92,7 +108,8 @@ class UserManager(BaseUserManager):
 
         email = self.normalize_email(email)
         user = self.model(email=email, username=username)
-        user.password = make_password(password)
+        # hashed where PASSWORD_HASH_POOL says, see siweauth.passwords
+        user.password = hash_password(password)
         user.save()
         return user
 
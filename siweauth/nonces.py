@@ -0,0 +1,159 @@
+"""
+Nonce storage for SIWE sign-in.
+
+A nonce store issues single-use nonces and consumes them at sign-in. Pick the
+implementation with the ``SIWE_NONCE_STORE`` setting:
+
+- ``DatabaseNonceStore`` keeps nonces in the Nonce table. Expired rows are
+  removed by one bulk delete on the indexed expiration column, at most every
+  ``SIWE_NONCE_PRUNE_INTERVAL`` seconds from the request path, or by
+  ``python manage.py prune_nonces`` run periodically.
+- ``CacheNonceStore`` keeps nonces in a Django cache with a TTL, so they
+  expire on their own. Use a shared cache (e.g. Redis or Memcached) when
+  running more than one process.
+"""
+
+import datetime
+import secrets
+import threading
+import time
+
+import pytz
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+from siweauth.models import Nonce
+from siweauth.settings import (
+    SIWE_NONCE_STORE,
+    SIWE_NONCE_TTL,
+    SIWE_NONCE_PRUNE_INTERVAL,
+    SIWE_NONCE_CACHE,
+)
+
+
+def _new_nonce():
+    return secrets.token_hex(12)
+
+
+class NonceStore:
+    """
+    Interface for issuing and consuming nonces.
+    """
+
+    def issue(self):
+        """
+        Create and store a new nonce.
+
+        Returns:
+            str: The nonce
+        """
+        raise NotImplementedError
+
+    def consume(self, nonce):
+        """
+        Use up a nonce.
+
+        Args:
+            nonce: The nonce from a SIWE message
+
+        Returns:
+            bool: True if the nonce was issued and had not expired or been used
+        """
+        raise NotImplementedError
+
+    def prune(self):
+        """
+        Remove expired nonces.
+
+        Returns:
+            int: Number of nonces removed
+        """
+        return 0
+
+
+class DatabaseNonceStore(NonceStore):
+    """
+    Nonces stored as Nonce rows.
+    """
+
+    def __init__(self, ttl=None, prune_interval=None):
+        self.ttl = SIWE_NONCE_TTL if ttl is None else ttl
+        self.prune_interval = (
+            SIWE_NONCE_PRUNE_INTERVAL if prune_interval is None else prune_interval
+        )
+        self._lock = threading.Lock()
+        self._pruned = None
+
+    def issue(self):
+        self._maybe_prune()
+        now = datetime.datetime.now(tz=pytz.UTC)
+        nonce = Nonce.objects.create(
+            value=_new_nonce(), expiration=now + datetime.timedelta(seconds=self.ttl)
+        )
+        return nonce.value
+
+    def consume(self, nonce):
+        # a single conditional DELETE: only one of several concurrent
+        # sign-ins with the same nonce sees a deleted row. Expired rows are
+        # left for prune().
+        deleted, _ = Nonce.objects.filter(
+            value=nonce, expiration__gt=datetime.datetime.now(tz=pytz.UTC)
+        ).delete()
+        return deleted > 0
+
+    def prune(self):
+        # one DELETE ... WHERE expiration <= now, served by the index
+        deleted, _ = Nonce.objects.filter(
+            expiration__lte=datetime.datetime.now(tz=pytz.UTC)
+        ).delete()
+        return deleted
+
+    def _maybe_prune(self):
+        # sweep at most once per interval per process
+        now = time.monotonic()
+        with self._lock:
+            if self._pruned is not None and now - self._pruned < self.prune_interval:
+                return
+            self._pruned = now
+        self.prune()
+
+
+class CacheNonceStore(NonceStore):
+    """
+    Nonces stored as cache keys that expire after the TTL.
+    """
+
+    key_prefix = "siwe-nonce:"
+
+    def __init__(self, ttl=None, alias=None):
+        self.ttl = SIWE_NONCE_TTL if ttl is None else ttl
+        self.cache = caches[alias or SIWE_NONCE_CACHE]
+
+    def issue(self):
+        nonce = _new_nonce()
+        self.cache.set(self.key_prefix + nonce, time.time() + self.ttl, timeout=self.ttl)
+        return nonce
+
+    def consume(self, nonce):
+        key = f"{self.key_prefix}{nonce}"
+        # some backends keep expired keys until they are read, so check the
+        # stored expiry too; delete reports whether this call removed the key,
+        # so only one consumer can accept a nonce
+        expires = self.cache.get(key)
+        return bool(self.cache.delete(key)) and expires is not None and expires > time.time()
+
+
+_store = None
+
+
+def get_nonce_store():
+    """
+    Return the configured nonce store, shared by this process.
+
+    Returns:
+        NonceStore: An instance of the ``SIWE_NONCE_STORE`` class
+    """
+    global _store
+    if _store is None:
+        _store = import_string(SIWE_NONCE_STORE)()
+    return _store
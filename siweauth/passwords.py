@@ -0,0 +1,87 @@
+"""
+Password hashing off the request thread.
+
+Hashing and checking a password costs tens to hundreds of milliseconds of CPU
+with the default hasher. ``hash_password`` and ``check_user_password`` run
+that work where ``PASSWORD_HASH_POOL`` says: inline, in a thread pool (the
+stdlib PBKDF2 and scrypt implementations release the GIL while hashing), or
+in a process pool. Either pool has ``PASSWORD_HASH_WORKERS`` workers, so at
+most that many hashes compete with other requests for CPU at once and the
+rest queue. The calling thread still waits for its hash, so a pool bounds
+hashing concurrency (and, with processes, takes it off this interpreter's
+GIL) but doesn't free the request worker meanwhile. Process workers set up
+Django themselves, so they work under any multiprocessing start method.
+Which hasher is used is set by the project's ``PASSWORD_HASHER_PROFILE`` (see
+facthound.settings).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+
+import django
+from django.contrib.auth.hashers import make_password, verify_password
+
+from siweauth.settings import PASSWORD_HASH_POOL, PASSWORD_HASH_WORKERS
+
+_lock = threading.Lock()
+_pool = None
+
+
+def _get_pool():
+    # started on first use
+    global _pool
+    with _lock:
+        if _pool is None:
+            if PASSWORD_HASH_POOL == "process":
+                # spawned workers start without configured settings
+                _pool = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS, initializer=django.setup
+                )
+            else:
+                _pool = ThreadPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+                )
+        return _pool
+
+
+def _run(func, *args):
+    # blocks until the hash is done, wherever it runs
+    if PASSWORD_HASH_POOL is None:
+        return func(*args)
+    return _get_pool().submit(func, *args).result()
+
+
+def hash_password(password):
+    """
+    Hash a password with the preferred hasher.
+
+    Args:
+        password: The raw password
+
+    Returns:
+        str: The encoded hash, as ``make_password`` returns it
+    """
+    return _run(make_password, password)
+
+
+def check_user_password(user, password):
+    """
+    Check a password against a user's hash, upgrading the hash if the
+    preferred hasher or its work factor changed.
+
+    Args:
+        user: The User, or None to spend the same time on an unknown user
+        password: The raw password
+
+    Returns:
+        bool: True if the password is correct
+    """
+    if user is None:
+        # keep unknown usernames from answering faster (Django #20760)
+        hash_password(password)
+        return False
+    is_correct, must_update = _run(verify_password, password, user.password)
+    if is_correct and must_update:
+        user.password = hash_password(password)
+        user.save(update_fields=["password"])
+    return is_correct
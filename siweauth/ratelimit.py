@@ -0,0 +1,244 @@
+"""
+Token bucket rate limiting for the authentication endpoints.
+
+Each endpoint in ``RATE_LIMITS`` gets a bucket per client IP and, for logins,
+a bucket per wallet or username and client IP. A bucket holds up to one
+period's worth of requests and refills continuously; a request takes one token
+or is rejected with 429 and a Retry-After header.
+
+Every request is charged to the IP bucket. The identity bucket is only checked
+up front and charged once a login has failed verification, and it is keyed on
+the client IP too, so nobody can lock a wallet or username out by sending
+logins for it from elsewhere.
+
+Buckets live in the ``RATE_LIMIT_CACHE`` cache, which must be shared by all
+worker processes (Redis or the database cache, see facthound.settings) for the
+limits to hold; a system check refuses a per-process cache. Updates are
+read-modify-write, so concurrent requests can overshoot a limit slightly.
+
+Checks run before the request body is validated, so rejected requests cost
+one or two cache reads and no password, nonce or signature work.
+"""
+
+from functools import wraps
+import math
+import re
+import time
+
+from django.core.cache import caches
+from django.http import JsonResponse
+
+from siweauth.settings import RATE_LIMIT_ENABLED, RATE_LIMIT_CACHE, RATE_LIMITS
+
+_PERIODS = {
+    "s": 1,
+    "sec": 1,
+    "m": 60,
+    "min": 60,
+    "h": 3600,
+    "hour": 3600,
+    "d": 86400,
+    "day": 86400,
+}
+_WALLET = re.compile(r"^0x[0-9a-fA-F]{40}$")
+# responses counted as failed logins
+_FAILED = (400, 401)
+
+
+def parse_rate(rate):
+    """
+    Parse a "requests/period" rate.
+
+    Args:
+        rate: e.g. "30/min"
+
+    Returns:
+        tuple: (bucket capacity, tokens refilled per second)
+    """
+    count, period = rate.split("/")
+    count = int(count)
+    return count, count / _PERIODS[period]
+
+
+def take(key, rate, now=None, peek=False):
+    """
+    Take a token from a bucket.
+
+    Args:
+        key: The bucket's cache key
+        rate: The bucket's "requests/period" rate
+        now: Current unix time, for tests
+        peek: Only check for a token, without taking it
+
+    Returns:
+        float: 0 if a token was (or could be) taken, otherwise seconds until
+            one is available
+    """
+    capacity, refill = parse_rate(rate)
+    now = time.time() if now is None else now
+    cache = caches[RATE_LIMIT_CACHE]
+    tokens, stamp = cache.get(key) or (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - stamp) * refill)
+    if tokens < 1:
+        return (1 - tokens) / refill
+    if peek:
+        return 0.0
+    # a bucket left alone for a full period is full again, so let it expire
+    cache.set(key, (tokens - 1, now), timeout=math.ceil(capacity / refill) + 1)
+    return 0.0
+
+
+def client_ip(request):
+    """
+    Return the client address of a request.
+
+    Uses REMOTE_ADDR; behind a proxy, have the proxy set it (or use a
+    middleware that does) from the forwarded header.
+    """
+    return request.META.get("REMOTE_ADDR") or "unknown"
+
+
+def siwe_wallet(request):
+    """
+    Return the wallet a SIWE login is for, read from the message's second
+    line without parsing the rest.
+    """
+    message = request.data.get("message") if hasattr(request, "data") else None
+    if not isinstance(message, str):
+        return None
+    lines = message.split("\n", 2)
+    if len(lines) < 2:
+        return None
+    wallet = lines[1].strip()
+    return wallet.lower() if _WALLET.match(wallet) else None
+
+
+def login_username(request):
+    """
+    Return the username a password login is for.
+    """
+    name = request.data.get("username") if hasattr(request, "data") else None
+    return name[:150] if isinstance(name, str) and name else None
+
+
+def _identity_key(request, endpoint, identity):
+    value = identity(request)
+    if value is None:
+        return None
+    return f"ratelimit:{endpoint}:id:{value}:{client_ip(request)}"
+
+
+def _too_many(wait):
+    response = JsonResponse({"message": "Too many requests."}, status=429)
+    response["Retry-After"] = str(math.ceil(wait))
+    return response
+
+
+def check_rate_limit(request, endpoint, identity=None):
+    """
+    Charge a request to its endpoint's IP bucket and check its identity
+    bucket.
+
+    Args:
+        request: The request
+        endpoint: Key in ``RATE_LIMITS``
+        identity: Optional callable returning the wallet or username the
+            request is for, or None
+
+    Returns:
+        JsonResponse: A 429 response if the request is over a limit, else None
+    """
+    limits = RATE_LIMITS.get(endpoint)
+    if not RATE_LIMIT_ENABLED or not limits:
+        return None
+    if "ip" in limits:
+        wait = take(f"ratelimit:{endpoint}:ip:{client_ip(request)}", limits["ip"])
+        if wait:
+            return _too_many(wait)
+    # only read the body once the IP bucket has room
+    if "identity" in limits and identity is not None:
+        key = _identity_key(request, endpoint, identity)
+        if key is not None:
+            wait = take(key, limits["identity"], peek=True)
+            if wait:
+                return _too_many(wait)
+    return None
+
+
+def record_failed_login(request, endpoint, identity):
+    """
+    Charge a failed login to its identity bucket.
+
+    Args:
+        request: The request
+        endpoint: Key in ``RATE_LIMITS``
+        identity: Callable returning the wallet or username the request is for
+    """
+    limits = RATE_LIMITS.get(endpoint)
+    if not RATE_LIMIT_ENABLED or not limits or "identity" not in limits:
+        return
+    key = _identity_key(request, endpoint, identity)
+    if key is not None:
+        take(key, limits["identity"])
+
+
+def _limited_call(request, endpoint, identity, view):
+    response = check_rate_limit(request, endpoint, identity)
+    if response is not None:
+        return response
+    try:
+        response = view()
+    except Exception as exc:
+        # DRF views raise AuthenticationFailed and ValidationError to dispatch
+        if identity is not None and getattr(exc, "status_code", None) in _FAILED:
+            record_failed_login(request, endpoint, identity)
+        raise
+    if identity is not None and response.status_code in _FAILED:
+        record_failed_login(request, endpoint, identity)
+    return response
+
+
+def rate_limited(endpoint, identity=None):
+    """
+    Decorator rate limiting a function view.
+
+    Args:
+        endpoint: Key in ``RATE_LIMITS``
+        identity: Optional callable returning the request's wallet or
+            username; 400 and 401 responses are charged to it
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapper_view(request, *args, **kwargs):
+            return _limited_call(
+                request,
+                endpoint,
+                identity,
+                lambda: view_func(request, *args, **kwargs),
+            )
+
+        return _wrapper_view
+
+    return decorator
+
+
+class RateLimitMixin:
+    """
+    Rate limit a class-based view's POST requests.
+
+    Set ``rate_limit_endpoint`` to a key in ``RATE_LIMITS`` and optionally
+    ``rate_limit_identity`` to a ``staticmethod`` taking the request; 400 and
+    401 responses are charged to the identity it returns.
+    """
+
+    rate_limit_endpoint = None
+    rate_limit_identity = None
+
+    def post(self, request, *args, **kwargs):
+        return _limited_call(
+            request,
+            self.rate_limit_endpoint,
+            self.rate_limit_identity,
+            lambda: super(RateLimitMixin, self).post(request, *args, **kwargs),
+        )
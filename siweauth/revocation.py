@@ -0,0 +1,177 @@
+"""
+Refresh token revocation.
+
+Refresh tokens are revoked by their ``jti`` claim, and an entry only needs to
+live until the token it revokes would have expired anyway. Pick the storage
+with the ``REFRESH_REVOCATION_STORE`` setting:
+
+- ``DatabaseRevocationStore`` keeps RevokedToken rows keyed by jti. Expired
+  rows are removed by one bulk delete on the indexed expiration column, at
+  most every ``REFRESH_REVOCATION_PRUNE_INTERVAL`` seconds from the request
+  path, or by ``python manage.py prune_revoked_tokens`` run periodically.
+- ``CacheRevocationStore`` keeps one cache key per revoked jti that expires
+  with the token. Use a shared cache when running more than one process.
+
+Either way a check is a single primary key or cache lookup, and the store
+only ever holds unexpired revoked tokens.
+
+With ``ROTATE_REFRESH_TOKENS`` on, ``RevokingTokenRefreshSerializer`` revokes
+each refresh token as it is exchanged, so a refresh token works once and a
+replayed one is refused.
+"""
+
+import datetime
+import threading
+import time
+
+import pytz
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils.module_loading import import_string
+
+from siweauth.models import RevokedToken
+from siweauth.settings import (
+    REFRESH_REVOCATION_STORE,
+    REFRESH_REVOCATION_PRUNE_INTERVAL,
+    REFRESH_REVOCATION_CACHE,
+)
+
+
+class RevocationStore:
+    """
+    Interface for revoking refresh tokens.
+    """
+
+    def revoke(self, jti, expiration):
+        """
+        Revoke a token.
+
+        Args:
+            jti: The token's jti claim
+            expiration: When the token expires, as an aware datetime
+
+        Returns:
+            bool: True if this call revoked it, False if it already was
+        """
+        raise NotImplementedError
+
+    def is_revoked(self, jti):
+        """
+        Check whether a token is revoked.
+
+        Args:
+            jti: The token's jti claim
+
+        Returns:
+            bool: True if revoked
+        """
+        raise NotImplementedError
+
+    def prune(self):
+        """
+        Drop revocations of tokens that have expired.
+
+        Returns:
+            int: Number of entries removed
+        """
+        return 0
+
+
+class DatabaseRevocationStore(RevocationStore):
+    """
+    Revocations stored as RevokedToken rows.
+    """
+
+    def __init__(self, prune_interval=None):
+        self.prune_interval = (
+            REFRESH_REVOCATION_PRUNE_INTERVAL
+            if prune_interval is None
+            else prune_interval
+        )
+        self._lock = threading.Lock()
+        self._pruned = None
+
+    def revoke(self, jti, expiration):
+        self._maybe_prune()
+        # the primary key makes this an atomic test-and-set
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expiration=expiration)
+        except IntegrityError:
+            return False
+        return True
+
+    def is_revoked(self, jti):
+        return RevokedToken.objects.filter(pk=jti).exists()
+
+    def prune(self):
+        # one DELETE ... WHERE expiration <= now, served by the index
+        deleted, _ = RevokedToken.objects.filter(
+            expiration__lte=datetime.datetime.now(tz=pytz.UTC)
+        ).delete()
+        return deleted
+
+    def _maybe_prune(self):
+        # sweep at most once per interval per process
+        now = time.monotonic()
+        with self._lock:
+            if self._pruned is not None and now - self._pruned < self.prune_interval:
+                return
+            self._pruned = now
+        self.prune()
+
+
+class CacheRevocationStore(RevocationStore):
+    """
+    Revocations stored as cache keys that expire with their token.
+    """
+
+    key_prefix = "siwe-revoked:"
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or REFRESH_REVOCATION_CACHE]
+
+    def revoke(self, jti, expiration):
+        remaining = (expiration - datetime.datetime.now(tz=pytz.UTC)).total_seconds()
+        if remaining <= 0:
+            # already unusable, nothing to remember
+            return True
+        # add only sets a missing key, so this is an atomic test-and-set
+        return self.cache.add(
+            f"{self.key_prefix}{jti}", 1, timeout=int(remaining) + 1
+        )
+
+    def is_revoked(self, jti):
+        return self.cache.get(f"{self.key_prefix}{jti}") is not None
+
+
+_store = None
+
+
+def get_revocation_store():
+    """
+    Return the configured revocation store, shared by this process.
+
+    Returns:
+        RevocationStore: An instance of the ``REFRESH_REVOCATION_STORE`` class
+    """
+    global _store
+    if _store is None:
+        _store = import_string(REFRESH_REVOCATION_STORE)()
+    return _store
+
+
+def revoke_refresh_token(token):
+    """
+    Revoke a validated refresh token.
+
+    Args:
+        token: A simplejwt RefreshToken
+
+    Returns:
+        bool: True if this call revoked it, False if it already was
+    """
+    return get_revocation_store().revoke(
+        token["jti"],
+        datetime.datetime.fromtimestamp(token["exp"], tz=pytz.UTC),
+    )
@@ -1,13 +1,22 @@
 """
 Serializers for the Sign-In with Ethereum (SIWE) authentication system.
 
-This module provides serializers for JWT token generation using SIWE authentication
-and user registration with traditional credentials.
+This module provides serializers for JWT token generation using SIWE authentication,
+refresh token rotation and revocation, and user registration with traditional
+credentials.
 """
 
 from django.contrib.auth import authenticate
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from typing import Any, Dict
 from eth_account.messages import SignableMessage
@@ -15,6 +24,40 @@ from eth_account.datastructures import SignedMessage
 
 from siweauth.auth import parse_siwe_message
 from siweauth.models import User
+from siweauth.revocation import get_revocation_store, revoke_refresh_token
+from siweauth.users import get_user_by_id
+
+
+def add_user_claims(token, user):
+    """
+    Add the user's wallet, username and admin flag to a token.
+
+    TokenUserAuthentication serves these claims as ``request.user`` without
+    loading the user. They are copied into access tokens and rotated refresh
+    tokens, so they reflect the user at login.
+
+    Args:
+        token: The refresh token being issued
+        user: The authenticated user
+
+    Returns:
+        Token: The token
+    """
+    token["wallet"] = user.wallet
+    token["username"] = user.username
+    token["is_admin"] = user.is_admin
+    return token
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Username/password token serializer whose tokens carry the user claims.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
 
 class SIWETokenObtainPairSerializer(TokenObtainPairSerializer):
     """
@@ -43,7 +86,8 @@ class SIWETokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     def get_token(cls, user):
         """
-        Generate a JWT token for the authenticated user.
+        Generate a JWT token for the authenticated user, carrying its wallet,
+        username and admin flag as claims.
         
         Args:
             user: The authenticated user
@@ -52,7 +96,7 @@ class SIWETokenObtainPairSerializer(TokenObtainPairSerializer):
             Token: JWT token for the user, or None if user is None
         """
         if user:
-            token = super().get_token(user)
+            token = add_user_claims(super().get_token(user), user)
         else:
             token=None
         return token
@@ -69,8 +113,8 @@ class SIWETokenObtainPairSerializer(TokenObtainPairSerializer):
         Returns:
             dict: Dictionary containing refresh and access tokens if successful
             
-        Note:
-            Returns None if authentication fails
+        Raises:
+            AuthenticationFailed: If the message or signature doesn't check out
         """
         authenticate_kwargs = {
             "message": self.context["request"].data["message"],
@@ -83,7 +127,9 @@ class SIWETokenObtainPairSerializer(TokenObtainPairSerializer):
 
         self.user = authenticate(**authenticate_kwargs)
         if self.user is None:
-            return None
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
         refresh = self.get_token(self.user)
         data = {}
 
@@ -93,6 +139,55 @@ class SIWETokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class RevokingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that honors the revocation store.
+
+    With ``ROTATE_REFRESH_TOKENS`` the presented refresh token is revoked as
+    it is exchanged, and that one operation is also the revocation check.
+    Otherwise the token is looked up in the store.
+    """
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, str]:
+        refresh = self.token_class(attrs["refresh"])
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if not revoke_refresh_token(refresh):
+                raise TokenError(_("Token is revoked"))
+        elif get_revocation_store().is_revoked(refresh["jti"]):
+            raise TokenError(_("Token is revoked"))
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM, None)
+        if user_id:
+            user = get_user_by_id(user_id)
+            if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+                raise AuthenticationFailed(
+                    self.error_messages["no_active_account"],
+                    "no_active_account",
+                )
+
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data["refresh"] = str(refresh)
+
+        return data
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """
+    Serializer revoking a refresh token, e.g. on logout.
+    """
+    refresh = serializers.CharField()
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        revoke_refresh_token(RefreshToken(attrs["refresh"]))
+        return {}
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration with traditional credentials.
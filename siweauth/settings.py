@@ -6,8 +6,79 @@ SIWE_MESSAGE_VALIDITY = getattr(settings, 'SIWE_MESSAGE_VALIDITY', 60*24)
 # Expected chain ID for SIWE messages
 SIWE_CHAIN_ID = getattr(settings, 'SIWE_CHAIN_ID', 8453)
 
+# All chain IDs accepted in SIWE messages, for multi-chain deployments
+SIWE_CHAIN_IDS = getattr(settings, 'SIWE_CHAIN_IDS', [SIWE_CHAIN_ID])
+
 # Expected domain for SIWE messages
 SIWE_DOMAIN = getattr(settings, 'SIWE_DOMAIN', 'localhost:3000')
 
 # Expected URI for SIWE messages
 SIWE_URI = getattr(settings, 'SIWE_URI', 'http://localhost:3000')
+
+# Nonce store class, see siweauth.nonces
+SIWE_NONCE_STORE = getattr(settings, 'SIWE_NONCE_STORE', 'siweauth.nonces.DatabaseNonceStore')
+
+# Seconds a nonce stays valid after it is issued
+SIWE_NONCE_TTL = getattr(settings, 'SIWE_NONCE_TTL', 60*60*3)
+
+# Minimum seconds between expired nonce sweeps by the database store
+SIWE_NONCE_PRUNE_INTERVAL = getattr(settings, 'SIWE_NONCE_PRUNE_INTERVAL', 60*5)
+
+# Cache alias used by the cache nonce store
+SIWE_NONCE_CACHE = getattr(settings, 'SIWE_NONCE_CACHE', 'default')
+
+# Signature verifier class, see siweauth.verify
+SIWE_VERIFIER = getattr(settings, 'SIWE_VERIFIER', 'siweauth.verify.InlineVerifier')
+
+# Worker processes for the pooled verifier (None for the CPU count)
+SIWE_VERIFY_WORKERS = getattr(settings, 'SIWE_VERIFY_WORKERS', None)
+
+# Verifications the pooled verifier accepts at once before rejecting logins
+SIWE_VERIFY_MAX_PENDING = getattr(settings, 'SIWE_VERIFY_MAX_PENDING', 64)
+
+# Seconds a login waits for a pooled verification before failing
+SIWE_VERIFY_TIMEOUT = getattr(settings, 'SIWE_VERIFY_TIMEOUT', 5)
+
+# Longest SIWE message accepted, in characters; longer ones are rejected unparsed
+SIWE_MAX_MESSAGE_LENGTH = getattr(settings, 'SIWE_MAX_MESSAGE_LENGTH', 4096)
+
+# Seconds a user row stays in the user cache (0 disables caching)
+USER_CACHE_TTL = getattr(settings, 'USER_CACHE_TTL', 60)
+
+# Cache alias for the user cache; share it between processes
+USER_CACHE_ALIAS = getattr(settings, 'USER_CACHE_ALIAS', 'default')
+
+# Seconds the in-process set of admin user ids is reused before reloading
+ADMIN_CACHE_TTL = getattr(settings, 'ADMIN_CACHE_TTL', 30)
+
+# Refresh token revocation store class, see siweauth.revocation
+REFRESH_REVOCATION_STORE = getattr(settings, 'REFRESH_REVOCATION_STORE', 'siweauth.revocation.DatabaseRevocationStore')
+
+# Minimum seconds between expired revocation sweeps by the database store
+REFRESH_REVOCATION_PRUNE_INTERVAL = getattr(settings, 'REFRESH_REVOCATION_PRUNE_INTERVAL', 60*5)
+
+# Cache alias used by the cache revocation store
+REFRESH_REVOCATION_CACHE = getattr(settings, 'REFRESH_REVOCATION_CACHE', 'default')
+
+# Whether the auth endpoints are rate limited
+RATE_LIMIT_ENABLED = getattr(settings, 'RATE_LIMIT_ENABLED', True)
+
+# Cache alias holding the rate limit buckets; must be shared between processes
+RATE_LIMIT_CACHE = getattr(settings, 'RATE_LIMIT_CACHE', 'default')
+
+# Token buckets per endpoint, as "requests/period" (s, min, hour or day) for the
+# client IP and for failed logins to one wallet or username from one IP; a
+# bucket holds one period's worth of requests and refills continuously
+RATE_LIMITS = getattr(settings, 'RATE_LIMITS', {
+    'get_nonce': {'ip': '60/min'},
+    'siwetoken': {'ip': '30/min', 'identity': '10/min'},
+    'token': {'ip': '30/min', 'identity': '10/min'},
+    'register': {'ip': '10/hour'},
+})
+
+# Where password hashes are computed: None on the request thread, "thread" or
+# "process" in a pool of PASSWORD_HASH_WORKERS workers
+PASSWORD_HASH_POOL = getattr(settings, 'PASSWORD_HASH_POOL', None)
+
+# Workers hashing passwords at once when a pool is used
+PASSWORD_HASH_WORKERS = getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
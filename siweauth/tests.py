@@ -1,16 +1,57 @@
 from django.test import TestCase
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
 from django.contrib.auth import authenticate
+from django.core.cache import cache, caches
+from django.contrib.auth.hashers import (
+    make_password,
+    verify_password,
+    identify_hasher,
+    PBKDF2PasswordHasher,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
 
 from web3 import Web3
 from eth_account.messages import encode_defunct
 import json
 import datetime
-
-from siweauth.models import Nonce, User
-from siweauth.views import get_nonce, TokenObtainPairView, SIWETokenObtainPairView, who_am_i
+import time
+import random
+from unittest import mock
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import multiprocessing
+
+from siweauth.models import Nonce, User, RevokedToken
+from siweauth.revocation import DatabaseRevocationStore, CacheRevocationStore
+from siweauth.ratelimit import take
+from siweauth.checks import check_rate_limit_cache
+from siweauth import passwords
+from siweauth.passwords import hash_password, check_user_password
+from siweauth.hashers import FastPBKDF2PasswordHasher
+from siweauth.views import (
+    get_nonce,
+    TokenObtainPairView,
+    SIWETokenObtainPairView,
+    RevokingTokenRefreshView,
+    TokenRevokeView,
+    who_am_i,
+)
 from siweauth.auth import check_for_siwe, _nonce_is_valid
-from siweauth.settings import SIWE_CHAIN_ID
+from siweauth.message import parse_siwe_message, siwe_message_is_acceptable
+from siweauth.nonces import DatabaseNonceStore, CacheNonceStore, get_nonce_store
+from siweauth.verify import InlineVerifier, PoolVerifier
+from siweauth.users import (
+    get_user_by_id,
+    get_user_by_wallet,
+    get_or_create_wallet_user,
+    db_user,
+)
+from siweauth.authentication import CachedJWTAuthentication, TokenUserAuthentication
+from siweauth.serializers import SIWETokenObtainPairSerializer, UserTokenObtainPairSerializer
+from siweauth.settings import SIWE_CHAIN_ID, RATE_LIMIT_CACHE, USER_CACHE_ALIAS
 
 
 def make_message(address, nonce):
@@ -78,6 +119,454 @@ class TestNonceIsValid(TestCase):
         # test again
         self.assertFalse(_nonce_is_valid(nonce))
 
+class TestNonceStores(TestCase):
+
+    def test_database_store_prunes_in_bulk(self):
+        past = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=1)
+        Nonce.objects.bulk_create(
+            Nonce(value=f"expired{i}", expiration=past) for i in range(20)
+        )
+        store = DatabaseNonceStore(prune_interval=60)
+        with self.assertNumQueries(2):
+            nonce = store.issue()
+        self.assertEqual(list(Nonce.objects.values_list("value", flat=True)), [nonce])
+        # no sweep until the interval has passed
+        with self.assertNumQueries(1):
+            store.issue()
+        self.assertTrue(store.consume(nonce))
+        self.assertFalse(store.consume(nonce))
+
+    def test_database_consume_is_one_statement(self):
+        store = DatabaseNonceStore()
+        nonce = store.issue()
+        with self.assertNumQueries(1):
+            self.assertTrue(store.consume(nonce))
+        with self.assertNumQueries(1):
+            self.assertFalse(store.consume(nonce))
+
+    def test_cache_store(self):
+        store = CacheNonceStore(ttl=60)
+        nonce = store.issue()
+        self.assertFalse(Nonce.objects.exists())
+        self.assertTrue(store.consume(nonce))
+        self.assertFalse(store.consume(nonce))
+        self.assertFalse(store.consume("notarealnonce"))
+        # stored expiry is honored even if the backend still holds the key
+        store.cache.set(store.key_prefix + "stale", time.time() - 1)
+        self.assertFalse(store.consume("stale"))
+
+
+class TestVerifiers(TestCase):
+
+    def setUp(self):
+        self.w3 = Web3()
+        self.acc = self.w3.eth.account.create()
+        self.body = make_message(self.acc.address, "abc")
+        self.signature = self.acc.sign_message(encode_defunct(text=self.body)).signature
+
+    def test_inline_verifier(self):
+        verifier = InlineVerifier()
+        self.assertEqual(verifier.recover(self.body, self.signature), self.acc.address)
+        self.assertEqual(
+            verifier.recover(self.body, self.signature.hex()), self.acc.address
+        )
+        self.assertIsNone(verifier.recover(self.body, "0x1234"))
+        self.assertIsNone(verifier.recover(self.body, "not hex"))
+        metrics = verifier.metrics()
+        self.assertEqual((metrics["verified"], metrics["invalid"]), (2, 2))
+
+    def test_pool_verifier(self):
+        verifier = PoolVerifier(workers=1, max_pending=1)
+        try:
+            self.assertEqual(
+                verifier.recover(self.body, self.signature), self.acc.address
+            )
+            # a full queue rejects without waiting
+            verifier._slots.acquire()
+            self.assertIsNone(verifier.recover(self.body, self.signature))
+            verifier._slots.release()
+            metrics = verifier.metrics()
+            self.assertEqual(metrics["verified"], 1)
+            self.assertEqual(metrics["rejected"], 1)
+            self.assertEqual(metrics["invalid"], 0)
+            self.assertEqual(metrics["pending"], 0)
+        finally:
+            verifier.shutdown()
+
+
+class TestParseSiweMessage(TestCase):
+
+    def setUp(self):
+        self.acc = Web3().eth.account.create()
+        self.nonce = get_nonce_store().issue()
+
+    def full_message(self, **fields):
+        values = {
+            "domain": "localhost:3000",
+            "statement": "\nTo make posts.\n",
+            "uri": "http://localhost:3000",
+            "chain_id": SIWE_CHAIN_ID,
+            "issued_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        values.update(fields)
+        return (
+            f"{values['domain']} wants you to sign in with your Ethereum account:\n"
+            f"{self.acc.address}\n{values['statement']}\n"
+            f"URI: {values['uri']}\nVersion: 1\nChain ID: {values['chain_id']}\n"
+            f"Nonce: {self.nonce}\nIssued At: {values['issued_at']}\n"
+            "Expiration Time: 2100-01-01T00:00:00Z\n"
+            "Request ID: abc\nResources:\n- ipfs://x\n- https://example.com/y"
+        )
+
+    def test_parse_optional_fields(self):
+        parsed = parse_siwe_message(self.full_message())
+        self.assertEqual(parsed["address"], self.acc.address)
+        self.assertEqual(parsed["statement"], "To make posts.")
+        self.assertEqual(parsed["nonce"], self.nonce)
+        self.assertEqual(parsed["chain_id"], SIWE_CHAIN_ID)
+        self.assertEqual(parsed["request_id"], "abc")
+        self.assertEqual(parsed["resources"], ["ipfs://x", "https://example.com/y"])
+        self.assertEqual(parsed["expiration_time"].year, 2100)
+        self.assertIsNone(parsed["not_before"])
+        # no statement
+        parsed = parse_siwe_message(self.full_message(statement=""))
+        self.assertIsNone(parsed["statement"])
+        # the test helper's format
+        parsed = parse_siwe_message(make_message(self.acc.address, self.nonce))
+        self.assertEqual(parsed["nonce"], self.nonce)
+
+    def test_rejects_malformed(self):
+        message = self.full_message()
+        for bad in [
+            "",
+            message.replace("Version: 1", "Version: 2"),
+            message.replace("Chain ID: ", "Chain ID: x"),
+            message.replace(f"Nonce: {self.nonce}", "Nonce: short"),
+            message.replace("Issued At: ", "Issued At: yesterday"),
+            message.replace("Resources:", "Extra: field"),
+            message.replace("To make posts.", "two\nlines"),
+            message.replace(self.acc.address, "0x1234"),
+            message + "\n" + " " * 5000,
+        ]:
+            self.assertIsNone(parse_siwe_message(bad))
+
+    def test_cheap_checks_skip_database(self):
+        for message in [
+            self.full_message(domain="evil.com"),
+            self.full_message(uri="http://evil.com"),
+            self.full_message(chain_id=1),
+            self.full_message(issued_at="2000-01-01T00:00:00Z"),
+            self.full_message().replace("2100-01-01", "2001-01-01"),
+            "not a siwe message",
+        ]:
+            with self.assertNumQueries(0):
+                self.assertIsNone(check_for_siwe(message, "0x00"))
+        # the nonce wasn't used up
+        self.assertTrue(_nonce_is_valid(self.nonce))
+
+    def test_fuzz(self):
+        # random edits of a valid message never raise, and an edited message
+        # only parses to a dict
+        rng = random.Random(4361)
+        message = self.full_message()
+        alphabet = "\n :-/0123456789abcdefxyzTZ."
+        for _ in range(2000):
+            chars = list(message)
+            for _ in range(rng.randint(1, 5)):
+                i = rng.randrange(len(chars))
+                op = rng.random()
+                if op < 0.4:
+                    del chars[i]
+                elif op < 0.8:
+                    chars.insert(i, rng.choice(alphabet))
+                else:
+                    chars[i] = rng.choice(alphabet)
+            parsed = parse_siwe_message("".join(chars))
+            if parsed is not None:
+                self.assertIsInstance(parsed["chain_id"], int)
+                siwe_message_is_acceptable(parsed)
+
+
+class TestUserCache(TestCase):
+
+    def setUp(self):
+        caches[USER_CACHE_ALIAS].clear()
+        self.factory = RequestFactory()
+        self.acc = Web3().eth.account.create()
+        self.user = User.objects.create_user_address(self.acc.address)
+
+    @contextmanager
+    def assertNoUserQueries(self):
+        # the shared cache may itself be a database table
+        with CaptureQueriesContext(connection) as queries:
+            yield
+        self.assertFalse([q["sql"] for q in queries if "siweauth_user" in q["sql"]])
+
+    def test_lookups_are_cached(self):
+        self.assertEqual(get_user_by_id(self.user.pk), self.user)
+        with self.assertNoUserQueries():
+            self.assertEqual(get_user_by_id(self.user.pk), self.user)
+            self.assertEqual(get_user_by_wallet(self.acc.address), self.user)
+
+    def test_updates_invalidate(self):
+        get_user_by_id(self.user.pk)
+        self.user.username = "renamed"
+        self.user.save()
+        self.assertEqual(get_user_by_id(self.user.pk).username, "renamed")
+        # a changed wallet isn't found under the old one
+        other = Web3().eth.account.create().address
+        self.user.wallet = other
+        self.user.save()
+        self.assertIsNone(get_user_by_wallet(self.acc.address))
+        self.assertEqual(get_user_by_wallet(other), self.user)
+        self.user.delete()
+        self.assertIsNone(get_user_by_id(self.user.pk))
+
+    def test_get_or_create_wallet_user(self):
+        wallet = Web3().eth.account.create().address
+        created = get_or_create_wallet_user(wallet)
+        self.assertEqual(get_or_create_wallet_user(wallet), created)
+        # another request created the user after this one's cache miss
+        caches[USER_CACHE_ALIAS].clear()
+        with mock.patch("siweauth.users.get_user_by_wallet", return_value=None):
+            self.assertEqual(get_or_create_wallet_user(wallet), created)
+        self.assertEqual(User.objects.filter(wallet=wallet).count(), 1)
+
+    def test_jwt_authentication(self):
+        token = RefreshToken.for_user(self.user).access_token
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        auth = CachedJWTAuthentication()
+        self.assertEqual(auth.authenticate(request)[0], self.user)
+        with self.assertNoUserQueries():
+            self.assertEqual(auth.authenticate(request)[0], self.user)
+
+    def test_password_hash_not_cached(self):
+        self.user.set_password("secret")
+        self.user.save()
+        get_user_by_id(self.user.pk)
+        self.assertNotIn(
+            self.user.password, caches[USER_CACHE_ALIAS].get(f"siwe-user:{self.user.pk}")
+        )
+        cached = get_user_by_id(self.user.pk)
+        self.assertEqual(cached.get_deferred_fields(), {"password"})
+        # saving a cached user leaves the hash alone
+        cached.username = "renamed"
+        cached.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.username, "renamed")
+        self.assertTrue(self.user.check_password("secret"))
+
+
+class TestTokenUserAuthentication(TestCase):
+
+    def setUp(self):
+        caches[USER_CACHE_ALIAS].clear()
+        self.factory = RequestFactory()
+        self.acc = Web3().eth.account.create()
+        self.user = User.objects.create_user_address(self.acc.address)
+
+    def authenticate(self, token):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return TokenUserAuthentication().authenticate(request)[0]
+
+    def test_claims_without_queries(self):
+        token = SIWETokenObtainPairSerializer.get_token(self.user).access_token
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+            self.assertEqual(user.wallet, self.acc.address)
+            self.assertIsNone(user.username)
+            self.assertFalse(user.is_admin)
+            self.assertTrue(user.is_authenticated)
+        # anything else comes from the user row
+        self.assertEqual(db_user(user), self.user)
+        self.assertEqual(user.email, self.user.email)
+
+    def test_token_without_claims(self):
+        user = self.authenticate(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(user.wallet, self.acc.address)
+
+    def test_username_login_claims(self):
+        User.objects.create_user_username_email_password("claims", "c@c.com", "pw")
+        serializer = UserTokenObtainPairSerializer(
+            data={"username": "claims", "password": "pw"}
+        )
+        self.assertTrue(serializer.is_valid())
+        user = self.authenticate(serializer.validated_data["access"])
+        self.assertEqual(user.username, "claims")
+        self.assertIsNone(user.wallet)
+
+
+class TestRefreshRevocation(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user_address(Web3().eth.account.create().address)
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def post(self, view, token):
+        request = self.factory.post("/api/token/refresh/", {"refresh": token})
+        response = view.as_view()(request)
+        return response.status_code, response.data
+
+    def test_refresh_tokens_are_single_use(self):
+        status, data = self.post(RevokingTokenRefreshView, self.refresh)
+        self.assertEqual(status, 200)
+        self.assertIn("access", data)
+        # the rotated token works, the old one is revoked
+        self.assertEqual(self.post(RevokingTokenRefreshView, self.refresh)[0], 401)
+        self.assertEqual(self.post(RevokingTokenRefreshView, data["refresh"])[0], 200)
+
+    def test_revoke(self):
+        self.assertEqual(self.post(TokenRevokeView, self.refresh)[0], 200)
+        self.assertEqual(self.post(RevokingTokenRefreshView, self.refresh)[0], 401)
+        self.assertEqual(self.post(TokenRevokeView, "garbage")[0], 401)
+
+    def test_database_store_prunes_in_bulk(self):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        RevokedToken.objects.bulk_create(
+            RevokedToken(jti=f"old{i}", expiration=now - datetime.timedelta(hours=1))
+            for i in range(20)
+        )
+        store = DatabaseRevocationStore(prune_interval=60)
+        self.assertTrue(store.revoke("new", now + datetime.timedelta(hours=1)))
+        self.assertEqual(list(RevokedToken.objects.values_list("jti", flat=True)), ["new"])
+        self.assertFalse(store.revoke("new", now + datetime.timedelta(hours=1)))
+        with self.assertNumQueries(1):
+            self.assertTrue(store.is_revoked("new"))
+
+    def test_cache_store(self):
+        store = CacheRevocationStore()
+        later = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        self.assertFalse(store.is_revoked("a"))
+        self.assertTrue(store.revoke("a", later))
+        self.assertFalse(store.revoke("a", later))
+        self.assertTrue(store.is_revoked("a"))
+
+
+@mock.patch("siweauth.ratelimit.RATE_LIMIT_ENABLED", True)
+class TestRateLimits(TestCase):
+
+    def setUp(self):
+        caches[RATE_LIMIT_CACHE].clear()
+        self.factory = RequestFactory()
+
+    def test_process_local_cache_refused(self):
+        self.assertEqual(check_rate_limit_cache(None), [])
+        with mock.patch("siweauth.checks.RATE_LIMIT_CACHE", "default"):
+            self.assertEqual(
+                [e.id for e in check_rate_limit_cache(None)], ["siweauth.E001"]
+            )
+
+    def test_token_bucket_refills(self):
+        self.assertEqual(take("bucket", "2/min", now=0), 0)
+        self.assertEqual(take("bucket", "2/min", now=0), 0)
+        self.assertAlmostEqual(take("bucket", "2/min", now=0), 30)
+        self.assertEqual(take("bucket", "2/min", now=30), 0)
+
+    @mock.patch("siweauth.ratelimit.RATE_LIMITS", {"get_nonce": {"ip": "2/min"}})
+    def test_nonce_ip_limit(self):
+        for _ in range(2):
+            self.assertEqual(get_nonce(self.factory.get("/api/get_nonce/")).status_code, 200)
+        response = get_nonce(self.factory.get("/api/get_nonce/"))
+        self.assertEqual(response.status_code, 429)
+        # rejected before a nonce is issued
+        self.assertEqual(Nonce.objects.count(), 2)
+        self.assertEqual(response["Retry-After"], "30")
+        # other clients have their own bucket
+        request = self.factory.get("/api/get_nonce/", REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(get_nonce(request).status_code, 200)
+
+    @mock.patch(
+        "siweauth.ratelimit.RATE_LIMITS",
+        {"token": {"ip": "100/min", "identity": "1/min"}},
+    )
+    def test_username_limit(self):
+        def login(name, password="x", ip="127.0.0.1"):
+            request = self.factory.post(
+                "/api/token/", {"username": name, "password": password}, REMOTE_ADDR=ip
+            )
+            return TokenObtainPairView.as_view()(request).status_code
+
+        self.assertEqual(login("alice"), 401)
+        self.assertEqual(login("alice"), 429)
+        self.assertEqual(login("bob"), 401)
+        # failures from one client don't lock alice out elsewhere
+        self.assertEqual(login("alice", ip="10.0.0.2"), 401)
+        # successful logins aren't charged
+        User.objects.create_user_username_email_password("carol", "carol@test.com", "pw")
+        for _ in range(2):
+            self.assertEqual(login("carol", "pw"), 200)
+
+    @mock.patch(
+        "siweauth.ratelimit.RATE_LIMITS",
+        {"siwetoken": {"ip": "100/min", "identity": "1/min"}},
+    )
+    def test_wallet_limit(self):
+        acc = Web3().eth.account.create()
+        message = make_message(acc.address, "0" * 24)
+        for status in [401, 429]:
+            request = self.factory.post(
+                "/api/siwetoken/", {"message": message, "signed_message": "0x00"}
+            )
+            response = SIWETokenObtainPairView.as_view()(request)
+            self.assertEqual(response.status_code, status)
+
+
+class TestPasswordHashing(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user_username_email_password(
+            "hasher", "hasher@test.com", "testpass"
+        )
+
+    def test_check_inline(self):
+        self.assertTrue(check_user_password(self.user, "testpass"))
+        self.assertFalse(check_user_password(self.user, "wrong"))
+        self.assertFalse(check_user_password(None, "testpass"))
+
+    @mock.patch("siweauth.passwords.PASSWORD_HASH_POOL", "thread")
+    def test_check_in_pool(self):
+        self.assertTrue(hash_password("x").startswith("pbkdf2_sha256_fast$"))
+        self.assertTrue(check_user_password(self.user, "testpass"))
+        self.assertFalse(check_user_password(self.user, "wrong"))
+
+    @mock.patch("siweauth.passwords.PASSWORD_HASH_POOL", "process")
+    @mock.patch("siweauth.passwords._pool", None)
+    @mock.patch(
+        "siweauth.passwords.ProcessPoolExecutor",
+        partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn")),
+    )
+    def test_spawned_process_pool(self):
+        # spawned workers don't inherit settings, so they must set up Django
+        encoded = PBKDF2PasswordHasher().encode("testpass", "salt", iterations=1000)
+        try:
+            self.assertEqual(
+                passwords._run(verify_password, "testpass", encoded), (True, True)
+            )
+        finally:
+            passwords._pool.shutdown()
+
+    def test_hash_upgraded_on_login(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password("testpass", hasher="pbkdf2_sha1")
+        )
+        self.assertEqual(authenticate(username="hasher", password="testpass"), self.user)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256_fast$"))
+        # a wrong password leaves the hash alone
+        before = self.user.password
+        self.assertIsNone(authenticate(username="hasher", password="wrong"))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, before)
+
+    def test_fast_hasher_has_own_algorithm(self):
+        # a full strength hash isn't read as a fast one
+        encoded = make_password("testpass", hasher="pbkdf2_sha256")
+        self.assertIsInstance(identify_hasher(encoded), PBKDF2PasswordHasher)
+        self.assertNotIsInstance(identify_hasher(encoded), FastPBKDF2PasswordHasher)
+
+
 class TestNormalAuth(TestCase):
 
     def setUp(self):
@@ -1,11 +1,19 @@
 from django.urls import path
-from .views import TokenObtainPairView, SIWETokenObtainPairView, CreateUserView, get_nonce, who_am_i
-from rest_framework_simplejwt.views import TokenRefreshView
+from .views import (
+    TokenObtainPairView,
+    SIWETokenObtainPairView,
+    RevokingTokenRefreshView,
+    TokenRevokeView,
+    CreateUserView,
+    get_nonce,
+    who_am_i,
+)
 
 urlpatterns = [
     path('siwetoken/', SIWETokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', RevokingTokenRefreshView.as_view(), name='token_refresh'),
+    path('token/revoke/', TokenRevokeView.as_view(), name='token_revoke'),
     path('get_nonce/', get_nonce, name='get_nonce'),
     path('who_am_i/', who_am_i, name='who_am_i'),
     path('register/', CreateUserView.as_view(), name='register'),
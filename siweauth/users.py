@@ -0,0 +1,215 @@
+"""
+Short-lived cache of User rows for per-request authentication.
+
+Users are cached by primary key for ``USER_CACHE_TTL`` seconds in the
+``USER_CACHE_ALIAS`` cache, which should be shared by all worker processes
+(the project points it at the "shared" cache). Only the columns
+authentication reads are cached, never the password hash; a cached user
+comes back with the password deferred, so reading it loads it from the
+database and saving the user only writes the cached columns. A wallet maps to
+a user id in the same cache, and a wallet hit is checked against the cached
+user's wallet, so a changed wallet is never served stale.
+
+Saving or deleting a User drops its entry from the shared cache, so every
+process sees the change on its next lookup. Bulk ``QuerySet.update`` calls
+bypass the signals and are picked up once the TTL runs out, so a user is at
+most ``USER_CACHE_TTL`` seconds stale.
+
+Each process also keeps the set of admin user ids for permission checks,
+reloaded every ``ADMIN_CACHE_TTL`` seconds and whenever a user is saved or
+deleted in the process. Other processes see an admin change within
+``ADMIN_CACHE_TTL`` seconds.
+"""
+
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import router
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from siweauth.models import User
+from siweauth.settings import USER_CACHE_TTL, USER_CACHE_ALIAS, ADMIN_CACHE_TTL
+
+# every concrete column but the password hash, in model order
+_CACHED_FIELDS = [f.attname for f in User._meta.concrete_fields if f.attname != "password"]
+
+_admin_lock = threading.Lock()
+_admins = None
+_admins_loaded = None
+
+
+def _id_key(pk):
+    return f"siwe-user:{pk}"
+
+
+def _wallet_key(wallet):
+    return f"siwe-user-wallet:{wallet}"
+
+
+def _cache():
+    return caches[USER_CACHE_ALIAS]
+
+
+def _from_cache(values):
+    # a User with the cached columns loaded and the password deferred
+    return User.from_db(router.db_for_read(User), _CACHED_FIELDS, values)
+
+
+def cache_user(user):
+    """
+    Store a user's authentication columns under its id and wallet.
+
+    Args:
+        user: The User to cache
+    """
+    if not USER_CACHE_TTL:
+        return
+    values = tuple(getattr(user, name) for name in _CACHED_FIELDS)
+    entries = {_id_key(user.pk): values}
+    if user.wallet:
+        entries[_wallet_key(user.wallet)] = user.pk
+    _cache().set_many(entries, timeout=USER_CACHE_TTL)
+
+
+def get_user_by_id(pk):
+    """
+    Return the user with a primary key, from the cache if possible.
+
+    Args:
+        pk: The user's primary key
+
+    Returns:
+        User: The user, or None if there is none
+    """
+    if USER_CACHE_TTL:
+        values = _cache().get(_id_key(pk))
+        if values is not None:
+            return _from_cache(values)
+    user = User.objects.filter(pk=pk).first()
+    if user is not None:
+        cache_user(user)
+    return user
+
+
+def get_user_by_wallet(wallet):
+    """
+    Return the user with a wallet address, from the cache if possible.
+
+    Args:
+        wallet: The checksummed wallet address
+
+    Returns:
+        User: The user, or None if there is none
+    """
+    if USER_CACHE_TTL:
+        pk = _cache().get(_wallet_key(wallet))
+        if pk is not None:
+            user = get_user_by_id(pk)
+            if user is not None and user.wallet == wallet:
+                return user
+    user = User.objects.filter(wallet=wallet).first()
+    if user is not None:
+        cache_user(user)
+    return user
+
+
+def get_or_create_wallet_user(wallet):
+    """
+    Return the user for a wallet, creating it if it doesn't exist.
+
+    Concurrent first logins from the same wallet are safe: the wallet column
+    is unique, and ``get_or_create`` returns the row the other request
+    created if its insert loses the race.
+
+    Args:
+        wallet: The checksummed wallet address
+
+    Returns:
+        User: The wallet's user
+    """
+    user = get_user_by_wallet(wallet)
+    if user is None:
+        user, _ = User.objects.get_or_create(wallet=wallet)
+        cache_user(user)
+    return user
+
+
+def forget_user(pk):
+    """
+    Drop a user from the cache.
+
+    Args:
+        pk: The user's primary key
+    """
+    _cache().delete(_id_key(pk))
+
+
+def admin_ids():
+    """
+    Return the ids of admin users, from this process's copy if it is fresh.
+
+    Returns:
+        frozenset: Primary keys of users with is_admin set
+    """
+    global _admins, _admins_loaded
+    now = time.monotonic()
+    with _admin_lock:
+        if _admins is not None and now - _admins_loaded < ADMIN_CACHE_TTL:
+            return _admins
+    admins = frozenset(User.objects.filter(is_admin=True).values_list("pk", flat=True))
+    with _admin_lock:
+        _admins, _admins_loaded = admins, now
+    return admins
+
+
+def is_admin_user(user):
+    """
+    Check whether ``request.user`` is an admin.
+
+    Args:
+        user: ``request.user``
+
+    Returns:
+        bool: True for an authenticated admin
+    """
+    return bool(user and user.is_authenticated and user.pk in admin_ids())
+
+
+def _forget_admins():
+    global _admins
+    with _admin_lock:
+        _admins = None
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender, instance, **kwargs):
+    forget_user(instance.pk)
+    _forget_admins()
+
+
+@receiver(post_delete, sender=User)
+def _user_deleted(sender, instance, **kwargs):
+    forget_user(instance.pk)
+    _forget_admins()
+
+
+def db_user(user):
+    """
+    Return the User row behind ``request.user``.
+
+    Token users from ``TokenUserAuthentication`` only carry their token's
+    claims; views that store the user (e.g. as a post's poster) call this to
+    get the model instance. Other users are returned unchanged.
+
+    Args:
+        user: ``request.user``
+
+    Returns:
+        User: The user's row, or the user itself if it already is one or is
+            anonymous
+    """
+    if isinstance(user, User) or not user.is_authenticated:
+        return user
+    return get_user_by_id(user.pk)
@@ -0,0 +1,211 @@
+"""
+SIWE signature verification backends.
+
+Recovering the signer of a SIWE message is a secp256k1 public key recovery,
+the most CPU-heavy step of a wallet login. Pick where it runs with the
+``SIWE_VERIFIER`` setting:
+
+- ``InlineVerifier`` recovers on the request thread.
+- ``PoolVerifier`` hands recoveries to a process pool so login bursts don't
+  hold the request workers' CPU or the GIL. At most
+  ``SIWE_VERIFY_MAX_PENDING`` recoveries are queued or running at once;
+  logins beyond that fail immediately instead of piling up, and logins that
+  wait longer than ``SIWE_VERIFY_TIMEOUT`` seconds fail.
+
+Both keep counters, available from ``metrics()``.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import os
+import threading
+import time
+
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from hexbytes import HexBytes
+from django.utils.module_loading import import_string
+
+from siweauth.settings import (
+    SIWE_VERIFIER,
+    SIWE_VERIFY_WORKERS,
+    SIWE_VERIFY_MAX_PENDING,
+    SIWE_VERIFY_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Unavailable(Exception):
+    # the recovery wasn't run or didn't finish in time
+    pass
+
+
+def recover_address(body, signature):
+    """
+    Recover the address that signed a message.
+
+    Runs in worker processes, so it only takes and returns plain values.
+
+    Args:
+        body: The signed message text
+        signature: The signature bytes
+
+    Returns:
+        str: The checksummed signer address, or None if the signature is invalid
+    """
+    try:
+        return Account.recover_message(encode_defunct(text=body), signature=signature)
+    except Exception:
+        return None
+
+
+class SignatureVerifier:
+    """
+    Base verifier: recovers inline and keeps counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {
+            "verified": 0,
+            "invalid": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "seconds": 0.0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._counts[key] += amount
+
+    def metrics(self):
+        """
+        Return a snapshot of the verifier's counters.
+
+        Returns:
+            dict: Counts of verified, invalid, rejected (queue full) and
+                timed out recoveries, and total seconds spent recovering
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def _recover(self, body, signature):
+        return recover_address(body, signature)
+
+    def recover(self, body, signature):
+        """
+        Recover the signer of a SIWE message.
+
+        Args:
+            body: The signed message text
+            signature: The signature, as hex or bytes
+
+        Returns:
+            str: The signer address, or None if the signature is invalid or
+                the recovery couldn't be run
+        """
+        try:
+            signature = bytes(HexBytes(signature))
+        except Exception:
+            self._count("invalid")
+            return None
+        start = time.perf_counter()
+        try:
+            address = self._recover(body, signature)
+        except _Unavailable:
+            return None
+        self._count("seconds", time.perf_counter() - start)
+        self._count("invalid" if address is None else "verified")
+        return address
+
+
+class InlineVerifier(SignatureVerifier):
+    """
+    Recover signatures on the calling thread.
+    """
+
+
+class PoolVerifier(SignatureVerifier):
+    """
+    Recover signatures in a process pool with a bounded queue.
+
+    Args:
+        workers: Worker processes. Defaults to ``SIWE_VERIFY_WORKERS``, or the
+            CPU count
+        max_pending: Recoveries queued or running at once. Defaults to
+            ``SIWE_VERIFY_MAX_PENDING``
+        timeout: Seconds to wait for a recovery. Defaults to
+            ``SIWE_VERIFY_TIMEOUT``
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=None):
+        super().__init__()
+        self.workers = workers or SIWE_VERIFY_WORKERS or os.cpu_count()
+        self.max_pending = max_pending or SIWE_VERIFY_MAX_PENDING
+        self.timeout = SIWE_VERIFY_TIMEOUT if timeout is None else timeout
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool = None
+        self._counts["pending"] = 0
+
+    def _get_pool(self):
+        # started on first use, so importing this module forks nothing
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    def _release(self, future=None):
+        self._slots.release()
+        self._count("pending", -1)
+
+    def _recover(self, body, signature):
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            logger.warning("SIWE verification queue full, rejecting login")
+            raise _Unavailable
+        self._count("pending")
+        try:
+            future = self._get_pool().submit(recover_address, body, signature)
+            address = future.result(timeout=self.timeout)
+        except TimeoutError:
+            # the slot stays taken until the worker actually finishes
+            self._count("timed_out")
+            future.add_done_callback(self._release)
+            raise _Unavailable
+        except BrokenProcessPool:
+            self._release()
+            logger.exception("SIWE verification pool broke, restarting it")
+            self.shutdown()
+            raise _Unavailable
+        except BaseException:
+            self._release()
+            raise
+        self._release()
+        return address
+
+    def shutdown(self):
+        """
+        Stop the worker processes.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+
+_verifier = None
+
+
+def get_verifier():
+    """
+    Return the configured signature verifier, shared by this process.
+
+    Returns:
+        SignatureVerifier: An instance of the ``SIWE_VERIFIER`` class
+    """
+    global _verifier
+    if _verifier is None:
+        _verifier = import_string(SIWE_VERIFIER)()
+    return _verifier
@@ -7,22 +7,26 @@ including nonce generation, token obtaining, and user management.
 
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenViewBase
 from rest_framework import generics
 from rest_framework import status
 from rest_framework.response import Response
 
-import datetime
-import pytz
-import secrets
 import logging
 
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
 
-from siweauth.models import User, Nonce
-from siweauth.serializers import SIWETokenObtainPairSerializer, UserSerializer
+from siweauth.models import User
+from siweauth.nonces import get_nonce_store
+from siweauth.ratelimit import rate_limited, RateLimitMixin, siwe_wallet, login_username
+from siweauth.serializers import (
+    SIWETokenObtainPairSerializer,
+    UserTokenObtainPairSerializer,
+    RevokingTokenRefreshSerializer,
+    TokenRevokeSerializer,
+    UserSerializer,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -36,14 +40,16 @@ logging.basicConfig(
 
 
 @require_http_methods(["GET"])
+@rate_limited("get_nonce")
 def get_nonce(request):
     """
     Generate and return a new nonce for SIWE authentication.
     
     Endpoint: GET /api/auth/nonce/
     
-    This function creates a new nonce with a 3-hour expiration and returns it.
-    It also cleans up expired nonces from the database.
+    This function issues a new nonce from the configured nonce store (see
+    siweauth.nonces) and returns it. Nonces expire after ``SIWE_NONCE_TTL``
+    seconds.
     
     Args:
         request: HTTP request
@@ -51,33 +57,32 @@ def get_nonce(request):
     Returns:
         JsonResponse: A JSON response containing the generated nonce
     """
-    now = datetime.datetime.now(tz=pytz.UTC)
-
-    for n in Nonce.objects.filter(expiration__lte=datetime.datetime.now(tz=pytz.UTC)):
-        n.delete()
-    n = Nonce(value=secrets.token_hex(12), expiration=now + datetime.timedelta(hours=3))
-    n.save()
+    return JsonResponse({"nonce": get_nonce_store().issue()})
 
-    return JsonResponse({"nonce": n.value})
 
-
-class SIWETokenObtainPairView(TokenObtainPairView):
+class SIWETokenObtainPairView(RateLimitMixin, TokenObtainPairView):
     """
     API endpoint for obtaining JWT tokens using Sign-In with Ethereum.
     
     This view extends TokenObtainPairView to use SIWE authentication
-    instead of traditional username/password authentication.
+    instead of traditional username/password authentication. Requests are
+    rate limited per IP and per wallet.
     """
     serializer_class = SIWETokenObtainPairSerializer
+    rate_limit_endpoint = "siwetoken"
+    rate_limit_identity = staticmethod(siwe_wallet)
 
 
-class TokenObtainPairView(TokenObtainPairView):
+class TokenObtainPairView(RateLimitMixin, TokenObtainPairView):
     """
     API endpoint for obtaining JWT tokens using traditional authentication.
     
     This view provides standard JWT token authentication using username/password.
+    Requests are rate limited per IP and per username.
     """
-    serializer_class = TokenObtainPairSerializer
+    serializer_class = UserTokenObtainPairSerializer
+    rate_limit_endpoint = "token"
+    rate_limit_identity = staticmethod(login_username)
 
     def post(self, request, *args, **kwargs):
         """
@@ -94,6 +99,25 @@ class TokenObtainPairView(TokenObtainPairView):
         return response
 
 
+class RevokingTokenRefreshView(TokenRefreshView):
+    """
+    API endpoint for refreshing JWT tokens.
+
+    Refused for revoked refresh tokens; with token rotation each refresh
+    token can only be exchanged once.
+    """
+    serializer_class = RevokingTokenRefreshSerializer
+
+
+class TokenRevokeView(TokenViewBase):
+    """
+    API endpoint revoking a refresh token, e.g. on logout.
+
+    Access tokens already issued stay valid until they expire.
+    """
+    serializer_class = TokenRevokeSerializer
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def who_am_i(request):
@@ -114,12 +138,15 @@ def who_am_i(request):
     return JsonResponse({"message": request.user.wallet})
 
 
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(RateLimitMixin, generics.CreateAPIView):
     """
     API endpoint for creating new users.
     
     This view handles user registration with username, email, and password.
+    Requests are rate limited per IP.
     """
+    rate_limit_endpoint = "register"
+
     def has_permission(self, request, view):
         """
         Check if the request has permission to access this view.